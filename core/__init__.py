@@ -11,16 +11,32 @@ from .types import (
     PolicyIR,
     InvariantSpec,
     CounterExample,
+    InvariantStatus,
     ProofWitness,
     ProofBundle,
+    WitnessRef,
+    PackedBundle,
     compute_content_hash,
-    ProofType
+    ProofType,
+    FrozenExecutionTrace,
+    FrozenCapabilityManifest,
+    FrozenCostLedger,
+    FrozenPolicyIR,
+    freeze_artifact,
+    slotted_variant
 )
 
 from .dsl import InvariantDSL
 from .engine import ProofEngine
 from .verifier import Verifier
 from .artifacts import ArtifactManager
+from .storage import ArtifactBackend, MemoryBackend, FilesystemBackend
+from .verdicts import VerdictCache, MemoryVerdictCache, FilesystemVerdictCache
+from .stream import TraceStream
+from .aio import AsyncProofEngine, AsyncVerifier, AsyncArtifactManager
+from .bundle import BundleView, pack_bundle, unpack_bundle
+from .archive import BundleArchive, write_archive
+from .compact import StepRecord, StepInterner, compact_trace
 
 __all__ = [
     'ExecutionTrace',
@@ -29,12 +45,39 @@ __all__ = [
     'PolicyIR',
     'InvariantSpec',
     'CounterExample',
+    'InvariantStatus',
     'ProofWitness',
     'ProofBundle',
+    'WitnessRef',
+    'PackedBundle',
     'compute_content_hash',
     'ProofType',
+    'FrozenExecutionTrace',
+    'FrozenCapabilityManifest',
+    'FrozenCostLedger',
+    'FrozenPolicyIR',
+    'freeze_artifact',
+    'slotted_variant',
     'InvariantDSL',
     'ProofEngine',
     'Verifier',
-    'ArtifactManager'
+    'ArtifactManager',
+    'ArtifactBackend',
+    'MemoryBackend',
+    'FilesystemBackend',
+    'VerdictCache',
+    'MemoryVerdictCache',
+    'FilesystemVerdictCache',
+    'TraceStream',
+    'AsyncProofEngine',
+    'AsyncVerifier',
+    'AsyncArtifactManager',
+    'BundleView',
+    'pack_bundle',
+    'unpack_bundle',
+    'BundleArchive',
+    'write_archive',
+    'StepRecord',
+    'StepInterner',
+    'compact_trace'
 ]
\ No newline at end of file
@@ -0,0 +1,35 @@
+"""
+Command-line entry point: ``python -m fak.core serve``.
+"""
+
+import argparse
+import sys
+from typing import List, Optional
+
+from .server import VerificationServer, serve
+from .verdicts import FilesystemVerdictCache
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="fak")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="run the local verification daemon")
+    listen = serve_parser.add_mutually_exclusive_group(required=True)
+    listen.add_argument("--socket", help="Unix socket path to listen on")
+    listen.add_argument("--port", type=int, help="localhost TCP port to listen on")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="TCP host (default: 127.0.0.1)")
+    serve_parser.add_argument("--cache-dir", help="persist verdicts in this directory")
+    serve_parser.add_argument("--batch-window", type=float, default=0.002,
+                              help="seconds to wait for more bundles to batch (default: 0.002)")
+
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        cache = FilesystemVerdictCache(args.cache_dir) if args.cache_dir else None
+        server = VerificationServer(verdict_cache=cache, batch_window=args.batch_window)
+        serve(socket_path=args.socket, host=args.host, port=args.port, server=server)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""
+Asyncio API for FAK.
+
+The wrappers here run the blocking engine, verifier and artifact manager
+calls in an executor so an event loop is never stalled by a large check.
+Each wrapper caps the number of calls in flight with a semaphore.
+
+Cancelling an awaiting task cancels executor work that has not started;
+work already running completes in the background and its result is
+dropped. With the default (thread) executor the wrapped objects are shared
+with the worker threads. ``AsyncVerifier`` also accepts a
+``ProcessPoolExecutor``, in which case witnesses are checked by fresh
+verifiers in the worker processes.
+"""
+
+import asyncio
+import weakref
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from typing import Any, AsyncIterator, Callable, Dict, List, MutableMapping, Optional, Tuple
+
+from .artifacts import ArtifactManager, BundleItem
+from .engine import ProofEngine
+from .types import ProofBundle, ProofWitness, ExecutionTrace, CapabilityManifest, CostLedger, PolicyIR, InvariantSpec
+from .verdicts import VerdictCache
+from .verifier import Verifier, _verify_witness_chunk
+
+
+def _verify_one(witness: ProofWitness, verdict_cache: Optional[VerdictCache] = None) -> Dict[str, Any]:
+    """Process-pool entry point: verify one witness."""
+    return _verify_witness_chunk([witness], verdict_cache)[0]
+
+
+class _Offloader:
+    """Runs blocking calls in an executor, at most ``max_concurrency`` at a time."""
+
+    def __init__(self, executor: Optional[Executor], max_concurrency: int):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be positive")
+        self.executor = executor
+        self.max_concurrency = max_concurrency
+        # One semaphore per event loop, so a wrapper outlives ``asyncio.run``
+        self._limits: MutableMapping[asyncio.AbstractEventLoop, asyncio.Semaphore] = weakref.WeakKeyDictionary()
+
+    async def _run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        limit = self._limits.get(loop)
+        if limit is None:
+            limit = self._limits[loop] = asyncio.Semaphore(self.max_concurrency)
+        async with limit:
+            return await loop.run_in_executor(self.executor, partial(fn, *args, **kwargs))
+
+
+class AsyncProofEngine(_Offloader):
+    """Async counterpart of ``ProofEngine``."""
+
+    def __init__(
+        self,
+        engine: Optional[ProofEngine] = None,
+        executor: Optional[Executor] = None,
+        max_concurrency: int = 4
+    ):
+        super().__init__(executor, max_concurrency)
+        self.engine = engine if engine is not None else ProofEngine()
+
+    async def verify_invariants(
+        self,
+        trace: ExecutionTrace,
+        capabilities: CapabilityManifest,
+        cost_ledger: CostLedger,
+        policy_ir: PolicyIR,
+        invariants: List[InvariantSpec],
+        timeout_seconds: float = 30.0,
+        mode: str = "sequential"
+    ) -> ProofWitness:
+        """See ``ProofEngine.verify_invariants``."""
+        return await self._run(
+            self.engine.verify_invariants, trace, capabilities, cost_ledger, policy_ir, invariants,
+            timeout_seconds=timeout_seconds, mode=mode
+        )
+
+
+class AsyncVerifier(_Offloader):
+    """
+    Async counterpart of ``Verifier``.
+
+    Witnesses are checked as separate executor jobs, so results can be
+    streamed with ``iter_witness_results`` as soon as each one finishes.
+    """
+
+    def __init__(
+        self,
+        verifier: Optional[Verifier] = None,
+        executor: Optional[Executor] = None,
+        max_concurrency: int = 4
+    ):
+        super().__init__(executor, max_concurrency)
+        self.verifier = verifier if verifier is not None else Verifier()
+
+    async def _verify_indexed(self, index: int, witness: ProofWitness) -> Tuple[int, Dict[str, Any]]:
+        if isinstance(self.executor, ProcessPoolExecutor):
+            cache = self.verifier.verdict_cache
+            result = await self._run(_verify_one, witness, cache if cache is not None and cache.shared else None)
+        else:
+            result = await self._run(self.verifier._verify_witness, witness)
+        return index, result
+
+    async def iter_witness_results(self, bundle: ProofBundle) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Yield ``(witness index, result)`` pairs in completion order.
+
+        Raises ValueError if the bundle ID does not match its contents.
+        Closing the iterator early cancels witnesses not yet started.
+        """
+        if self.verifier._compute_bundle_id(bundle) != bundle.id:
+            raise ValueError("Bundle ID integrity check failed")
+        tasks = [
+            asyncio.ensure_future(self._verify_indexed(index, witness))
+            for index, witness in enumerate(bundle.witnesses)
+        ]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield await finished
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def verify_bundle(self, bundle: ProofBundle) -> Dict[str, Any]:
+        """See ``Verifier.verify_bundle``; results are in witness order."""
+        if self.verifier._compute_bundle_id(bundle) != bundle.id:
+            return {
+                'bundle_id': bundle.id,
+                'success': False,
+                'error': 'Bundle ID integrity check failed'
+            }
+        results: List[Optional[Dict[str, Any]]] = [None] * len(bundle.witnesses)
+        async for index, result in self.iter_witness_results(bundle):
+            results[index] = result
+        return {
+            'bundle_id': bundle.id,
+            'success': all(result.get('success', False) for result in results),
+            'results': results
+        }
+
+
+class AsyncArtifactManager(_Offloader):
+    """Async counterpart of ``ArtifactManager.create_bundle``."""
+
+    def __init__(
+        self,
+        manager: Optional[ArtifactManager] = None,
+        executor: Optional[Executor] = None,
+        max_concurrency: int = 4
+    ):
+        if isinstance(executor, ProcessPoolExecutor):
+            raise ValueError("AsyncArtifactManager needs a thread executor; the manager's store is in-process")
+        super().__init__(executor, max_concurrency)
+        self.manager = manager if manager is not None else ArtifactManager()
+
+    async def create_bundle(
+        self,
+        trace: ExecutionTrace,
+        capabilities: CapabilityManifest,
+        cost_ledger: CostLedger,
+        policy_ir: PolicyIR
+    ) -> ProofBundle:
+        """See ``ArtifactManager.create_bundle``."""
+        return await self._run(self.manager.create_bundle, trace, capabilities, cost_ledger, policy_ir)
+
+    async def create_bundles(self, items: List[BundleItem], mode: str = "sequential") -> List[ProofBundle]:
+        """See ``ArtifactManager.create_bundles``; the batch runs as one executor call."""
+        return await self._run(self.manager.create_bundles, items, mode=mode)
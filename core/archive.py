@@ -0,0 +1,172 @@
+"""
+Indexed bundle archives for FAK.
+
+An archive stores a packed bundle (see ``bundle``) with every artifact
+and witness in its own binary section, followed by an index of section
+offsets. ``BundleArchive`` memory-maps the file and decodes only the
+sections it is asked for, so one witness can be audited in a multi-GB
+archive without reading the rest.
+
+Layout:
+
+    b"FAKA" version
+    artifact sections   (one binary section per distinct artifact)
+    witness sections    (one binary section per WitnessRef)
+    index section       {"id", "metadata",
+                         "witnesses": [[proof_id, offset, length], ...],
+                         "artifacts": {content hash: [offset, length]}}
+    trailer             index offset and length (little-endian u64), b"FAKA"
+
+Section bodies use the ``binary`` value encoding.
+"""
+
+import mmap
+import os
+import struct
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from .binary import decode_section, encode_section
+from .bundle import ARTIFACT_TABLES, pack_bundle
+from .storage import atomic_writer
+from .types import PackedBundle, ProofBundle, ProofWitness, WitnessRef, base_type, compute_content_hash
+
+MAGIC = b"FAKA"
+VERSION = 1
+
+_TRAILER = struct.Struct('<QQ4s')
+_HEADER = MAGIC + bytes([VERSION])
+
+
+def write_archive(path: str, bundle: Union[ProofBundle, PackedBundle]) -> None:
+    """Atomically write a bundle archive; sections are streamed to disk."""
+    packed = bundle if issubclass(base_type(bundle), PackedBundle) else pack_bundle(bundle)
+    index: Dict[str, Any] = {"id": packed.id, "metadata": packed.metadata, "witnesses": [], "artifacts": {}}
+    with atomic_writer(path) as f:
+        f.write(_HEADER)
+        offset = len(_HEADER)
+        for table in ARTIFACT_TABLES.values():
+            for key, artifact in getattr(packed, table).items():
+                body = encode_section(artifact)
+                f.write(body)
+                index["artifacts"][key] = [offset, len(body)]
+                offset += len(body)
+        for ref in packed.witnesses:
+            body = encode_section(ref)
+            f.write(body)
+            index["witnesses"].append([ref.proof_id, offset, len(body)])
+            offset += len(body)
+        body = encode_section(index)
+        f.write(body)
+        f.write(_TRAILER.pack(offset, len(body), MAGIC))
+
+
+class BundleArchive:
+    """
+    Read-only, memory-mapped view of a bundle archive.
+
+    Only the index is decoded on open. Witnesses are decoded on access and
+    artifacts on first use, then shared between the witnesses that
+    reference them. With ``validate`` every decoded artifact is checked
+    against its content hash.
+    """
+
+    def __init__(self, path: str, validate: bool = False):
+        self.path = path
+        self.validate = validate
+        self._file = open(path, 'rb')
+        try:
+            size = os.fstat(self._file.fileno()).st_size
+            if size < len(_HEADER) + _TRAILER.size:
+                raise ValueError("Not a FAK bundle archive")
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except BaseException:
+            self._file.close()
+            raise
+        try:
+            self._load_index()
+        except BaseException:
+            self.close()
+            raise
+        self._artifacts: Dict[str, Any] = {}
+
+    def _load_index(self) -> None:
+        data = self._data
+        if data[:len(MAGIC)] != MAGIC:
+            raise ValueError("Not a FAK bundle archive")
+        if data[len(MAGIC)] != VERSION:
+            raise ValueError(f"Unsupported bundle archive version: {data[len(MAGIC)]}")
+        offset, length, magic = _TRAILER.unpack_from(data, len(data) - _TRAILER.size)
+        if magic != MAGIC:
+            raise ValueError("Bundle archive trailer is missing")
+        index, = decode_section(self._section(offset, length))
+        if not isinstance(index, dict):
+            raise ValueError("Bundle archive index is malformed")
+        self.id: str = index["id"]
+        self.metadata: Dict[str, Any] = index["metadata"]
+        self._witnesses: List[list] = index["witnesses"]
+        self._artifact_index: Dict[str, list] = index["artifacts"]
+
+    def _section(self, offset: int, length: int) -> memoryview:
+        if offset < len(_HEADER) or offset + length > len(self._data) - _TRAILER.size:
+            raise ValueError("Bundle archive section is out of range")
+        return memoryview(self._data)[offset:offset + length]
+
+    @property
+    def proof_ids(self) -> List[str]:
+        return [entry[0] for entry in self._witnesses]
+
+    def __len__(self) -> int:
+        return len(self._witnesses)
+
+    def __getitem__(self, index: int) -> ProofWitness:
+        proof_id, offset, length = self._witnesses[index]
+        ref, = decode_section(self._section(offset, length))
+        if not isinstance(ref, WitnessRef):
+            raise ValueError("Witness section does not hold a WitnessRef")
+        # The bundle ID covers the indexed proof IDs, so the section must match its entry
+        if ref.proof_id != proof_id:
+            raise ValueError(f"Witness section {index} does not match its index entry")
+        return ProofWitness(
+            proof_id=ref.proof_id,
+            invariants=ref.invariants,
+            counterexamples=ref.counterexamples,
+            statuses=ref.statuses,
+            **{name: self.artifact(getattr(ref, name)) for name in ARTIFACT_TABLES}
+        )
+
+    def __iter__(self) -> Iterator[ProofWitness]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def select(self, indices: Optional[List[int]] = None) -> List[ProofWitness]:
+        """Decode the witnesses at ``indices`` (all by default)."""
+        if indices is None:
+            return list(self)
+        return [self[index] for index in indices]
+
+    def artifact(self, key: str) -> Any:
+        """Decode an artifact by content hash; raises ValueError if absent."""
+        artifact = self._artifacts.get(key)
+        if artifact is None:
+            location = self._artifact_index.get(key)
+            if location is None:
+                raise ValueError(f"Artifact {key} not found")
+            artifact, = decode_section(self._section(*location))
+            if self.validate and compute_content_hash(artifact) != key:
+                raise ValueError(f"Artifact {key} integrity check failed")
+            self._artifacts[key] = artifact
+        return artifact
+
+    def close(self) -> None:
+        # Views handed out by ``_section`` are released once decoded
+        self._artifacts = {}
+        if getattr(self, '_data', None) is not None:
+            self._data.close()
+            self._data = None
+        self._file.close()
+
+    def __enter__(self) -> "BundleArchive":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -2,9 +2,38 @@
 Artifact management for FAK.
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+from dataclasses import replace
 import threading
-from .types import ExecutionTrace, CapabilityManifest, CostLedger, PolicyIR, ProofBundle, compute_content_hash
+from .types import (
+    ExecutionTrace, CapabilityManifest, CostLedger, PolicyIR, InvariantSpec, ProofBundle,
+    compute_content_hash, _FrozenArtifact,
+)
+from .cache import LRUCache
+from .engine import ProofEngine
+from .storage import ArtifactBackend, MemoryBackend
+
+# Witnesses per bundle; ProofBundle rejects more
+MAX_BUNDLE_WITNESSES = 100
+
+# Lock stripes per manager; an artifact's stripe is chosen by its hash prefix
+DEFAULT_STRIPES = 64
+
+# One create_bundles input: (trace, capabilities, cost_ledger, policy_ir, invariants)
+BundleItem = Tuple[ExecutionTrace, CapabilityManifest, CostLedger, PolicyIR, List[InvariantSpec]]
+
+
+def _is_frozen(artifact: Any) -> bool:
+    # Frozen artifacts and frozen slotted variants
+    return isinstance(artifact, _FrozenArtifact) or getattr(type(artifact), '_memoize_hash', False)
+
+
+def _with_id(artifact: Any, artifact_id: str) -> Any:
+    """Stamp an artifact with its content ID; frozen artifacts are copied."""
+    if _is_frozen(artifact):
+        return replace(artifact, id=artifact_id)
+    artifact.id = artifact_id
+    return artifact
 
 
 class ArtifactManager:
@@ -12,11 +41,45 @@ class ArtifactManager:
     Manages content-addressable artifacts.
     
     Ensures immutability and versioning.
+    
+    Storage is pluggable: by default artifacts live in an in-process dict
+    (``self.artifacts``); pass a persistent backend such as
+    ``FilesystemBackend`` to share a store between processes. Persistent
+    backends are fronted by a bounded LRU cache of decoded artifacts.
+
+    The manager is safe to share between threads. Artifacts are hashed
+    before any lock is taken, and writes lock only one of ``stripes`` locks,
+    picked by the ID's hash prefix, so stores of different artifacts run
+    concurrently. Reads never wait on a lock: cache hits do not refresh
+    recency (so the cache evicts artifacts in the order they were loaded),
+    and a miss fills the cache only if no other thread is updating it.
+    Built-in backends read without locking.
     """
 
-    def __init__(self):
-        self.artifacts: Dict[str, Any] = {}
-        self._lock = threading.RLock()  # Thread-safe access
+    def __init__(
+        self,
+        backend: Optional[ArtifactBackend] = None,
+        cache_size: int = 1024,
+        stripes: int = DEFAULT_STRIPES
+    ):
+        if stripes < 1:
+            raise ValueError("ArtifactManager stripes must be positive")
+        if backend is None:
+            self.artifacts: Dict[str, Any] = {}
+            backend = MemoryBackend(self.artifacts)
+            self._cache = None
+        else:
+            self._cache = LRUCache(cache_size)
+        self.backend = backend
+        self._locks = [threading.Lock() for _ in range(stripes)]
+
+    def _stripe(self, artifact_id: str) -> threading.Lock:
+        try:
+            number = int(artifact_id[:8], 16)
+        except ValueError:
+            # Not a hex content hash
+            number = hash(artifact_id)
+        return self._locks[number % len(self._locks)]
 
     def store_artifact(self, artifact: Any) -> str:
         """
@@ -24,32 +87,53 @@ class ArtifactManager:
         
         Artifacts must be immutable and serializable.
         """
-        # Compute hash of serialized artifact
+        # Compute hash of serialized artifact (outside any lock)
         artifact_id = compute_content_hash(artifact)
-        
-        with self._lock:
-            # Store artifact (in practice, this might go to a database or file system)
-            self.artifacts[artifact_id] = artifact
-            
+        self.put_if_absent(artifact_id, artifact)
         return artifact_id
 
+    def put_if_absent(self, artifact_id: str, artifact: Any) -> bool:
+        """
+        Store an artifact under an already computed ID unless it is present.
+
+        Returns True if this call stored it. Concurrent stores of one ID
+        serialize on its stripe lock, so only the first writes to the
+        backend; the rest find it present and return False.
+        """
+        if self.backend.contains(artifact_id):
+            return False
+        with self._stripe(artifact_id):
+            if self.backend.contains(artifact_id):
+                return False
+            self.backend.put(artifact_id, artifact)
+        # Mutable artifacts may change after storing; only cache frozen ones
+        if self._cache is not None and _is_frozen(artifact):
+            self._cache.put(artifact_id, artifact)
+        return True
+
     def retrieve_artifact(self, artifact_id: str) -> Any:
         """
         Retrieve an artifact by its ID.
+        
+        Persistent backends load the artifact lazily on a cache miss.
         """
-        with self._lock:
-            if artifact_id not in self.artifacts:
-                raise ValueError(f"Artifact {artifact_id} not found")
-                
-            return self.artifacts[artifact_id]
+        if self._cache is not None:
+            artifact = self._cache.peek(artifact_id)
+            if artifact is not None:
+                return artifact
+        try:
+            artifact = self.backend.get(artifact_id)
+        except KeyError:
+            raise ValueError(f"Artifact {artifact_id} not found")
+        if self._cache is not None:
+            self._cache.try_put(artifact_id, artifact)
+        return artifact
 
     def validate_artifact_integrity(self, artifact_id: str, artifact: Any) -> bool:
         """
         Validate that artifact matches its content-addressable ID.
         """
-        with self._lock:
-            computed_id = compute_content_hash(artifact)
-            return computed_id == artifact_id
+        return compute_content_hash(artifact) == artifact_id
 
     def create_bundle(
         self,
@@ -60,6 +144,10 @@ class ArtifactManager:
     ) -> ProofBundle:
         """
         Create a proof bundle from artifacts.
+        
+        Frozen artifacts hash only once (integrity validation reuses the
+        memoized digest) and are copied rather than mutated when stamped
+        with their IDs.
         """
         # Store all artifacts and get their IDs
         trace_id = self.store_artifact(trace)
@@ -81,10 +169,10 @@ class ArtifactManager:
             raise ValueError("Policy IR artifact integrity check failed")
         
         # Update artifact IDs in objects
-        trace.id = trace_id
-        capabilities.id = cap_id
-        cost_ledger.id = cost_id
-        policy_ir.id = policy_id
+        trace = _with_id(trace, trace_id)
+        capabilities = _with_id(capabilities, cap_id)
+        cost_ledger = _with_id(cost_ledger, cost_id)
+        policy_ir = _with_id(policy_ir, policy_id)
         
         # Create witness with proper proof ID computation
         from .types import ProofWitness, InvariantSpec, ProofType
@@ -98,7 +186,6 @@ class ArtifactManager:
         )
         
         # Create witness with actual proof ID computation
-        from .engine import ProofEngine
         engine = ProofEngine()
         witness = engine.verify_invariants(
             trace, capabilities, cost_ledger, policy_ir, [invariant]
@@ -107,4 +194,47 @@ class ArtifactManager:
         # Create bundle
         bundle = engine.generate_bundle([witness])
         
-        return bundle
\ No newline at end of file
+        return bundle
+
+    def create_bundles(
+        self,
+        items: Iterable[BundleItem],
+        engine: Optional[ProofEngine] = None,
+        mode: str = "sequential",
+        bundle_size: int = MAX_BUNDLE_WITNESSES
+    ) -> List[ProofBundle]:
+        """
+        Verify many input tuples and bundle the resulting witnesses.
+
+        Each item is ``(trace, capabilities, cost_ledger, policy_ir,
+        invariants)``. All items are checked by one engine (a new one unless
+        ``engine`` is given), so formulas are compiled once and shared
+        between items. Artifacts are stored and stamped with their IDs as in
+        ``create_bundle``, but each distinct artifact object is hashed only
+        once however many items share it.
+
+        Witnesses are bundled in item order, ``bundle_size`` per bundle.
+        """
+        if not 1 <= bundle_size <= MAX_BUNDLE_WITNESSES:
+            raise ValueError(f"bundle_size must be between 1 and {MAX_BUNDLE_WITNESSES}")
+        engine = engine if engine is not None else ProofEngine()
+        # id(artifact) -> (artifact, stamped copy); holding the original keeps its id valid
+        stamped: Dict[int, Tuple[Any, Any]] = {}
+
+        def stamp(artifact: Any) -> Any:
+            entry = stamped.get(id(artifact))
+            if entry is None:
+                artifact_id = compute_content_hash(artifact)
+                self.put_if_absent(artifact_id, artifact)
+                entry = stamped[id(artifact)] = (artifact, _with_id(artifact, artifact_id))
+            return entry[1]
+
+        witnesses = []
+        for trace, capabilities, cost_ledger, policy_ir, invariants in items:
+            witnesses.append(engine.verify_invariants(
+                stamp(trace), stamp(capabilities), stamp(cost_ledger), stamp(policy_ir), invariants, mode=mode
+            ))
+        return [
+            engine.generate_bundle(witnesses[start:start + bundle_size])
+            for start in range(0, len(witnesses), bundle_size)
+        ]
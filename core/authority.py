@@ -0,0 +1,194 @@
+"""
+Authority-graph reachability for FAK.
+
+``CapabilityManifest.authority_graph`` maps each authority to the
+authorities it confers. ``AuthorityIndex`` precomputes reachability once
+per graph: strongly connected components are collapsed (iterative Tarjan),
+and every component of the condensation gets a transitive-closure bitset
+(a Python int with one bit per component). A manifest's granted
+capabilities reduce to a single bitset, so checking whether a trace step
+uses an authority reachable from the grant is one dict lookup and one bit
+test.
+
+Indexes and grants are cached per manifest ID.
+"""
+
+from typing import Any, Dict, Iterable, List, Tuple
+
+from .cache import LRUCache
+from .temporal import AlwaysMonitor, CompiledFormula, resolve_field
+
+# Step field naming the authority (or list of authorities) a step uses
+AUTHORITY_FIELD = ("authority",)
+
+
+def strongly_connected_components(successors: List[List[int]]) -> Tuple[List[int], int]:
+    """
+    Tarjan's algorithm without recursion.
+
+    Returns the component of every node and the component count.
+    Components are numbered in reverse topological order: every edge
+    between components goes from a higher number to a lower one.
+    """
+    count = len(successors)
+    order = [-1] * count
+    low = [0] * count
+    on_stack = [False] * count
+    component = [-1] * count
+    stack: List[int] = []
+    counter = 0
+    components = 0
+    for root in range(count):
+        if order[root] != -1:
+            continue
+        order[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, 0)]
+        while work:
+            node, edge = work[-1]
+            edges = successors[node]
+            if edge < len(edges):
+                work[-1] = (node, edge + 1)
+                target = edges[edge]
+                if order[target] == -1:
+                    order[target] = low[target] = counter
+                    counter += 1
+                    stack.append(target)
+                    on_stack[target] = True
+                    work.append((target, 0))
+                elif on_stack[target] and order[target] < low[node]:
+                    low[node] = order[target]
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                if low[node] < low[parent]:
+                    low[parent] = low[node]
+            if low[node] == order[node]:
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = False
+                    component[member] = components
+                    if member == node:
+                        break
+                components += 1
+    return component, components
+
+
+class AuthorityGrant:
+    """The set of authorities reachable from some granted capabilities."""
+
+    __slots__ = ('index', 'mask', 'direct')
+
+    def __init__(self, index: "AuthorityIndex", mask: int, direct: frozenset):
+        self.index = index
+        self.mask = mask
+        self.direct = direct  # granted names, including ones absent from the graph
+
+    def allows(self, authority: Any) -> bool:
+        component = self.index.components.get(authority)
+        if component is None:
+            return authority in self.direct
+        return (self.mask >> component) & 1 == 1
+
+    def allows_step(self, used: Any) -> bool:
+        """Check a step's authority field: None, one authority or a list."""
+        if used is None:
+            return True
+        if isinstance(used, (list, tuple)):
+            return all(self.allows(authority) for authority in used)
+        return self.allows(used)
+
+
+class AuthorityIndex:
+    """Reachability index over an authority graph."""
+
+    def __init__(self, graph: Dict[str, List[str]]):
+        names: Dict[str, int] = {}
+        for source, targets in graph.items():
+            names.setdefault(source, len(names))
+            for target in targets:
+                names.setdefault(target, len(names))
+        successors: List[List[int]] = [[] for _ in names]
+        for source, targets in graph.items():
+            successors[names[source]].extend(names[target] for target in targets)
+
+        node_component, component_count = strongly_connected_components(successors)
+        self.components: Dict[str, int] = {name: node_component[node] for name, node in names.items()}
+
+        # Components are in reverse topological order, so successors'
+        # closures are complete before they are folded in
+        members: List[List[int]] = [[] for _ in range(component_count)]
+        for node, component in enumerate(node_component):
+            members[component].append(node)
+        closure = [0] * component_count
+        for component in range(component_count):
+            reach = 1 << component
+            for node in members[component]:
+                for target in successors[node]:
+                    target_component = node_component[target]
+                    if target_component != component:
+                        reach |= closure[target_component]
+            closure[component] = reach
+        self.closure = closure
+
+    def reachable_mask(self, sources: Iterable[str]) -> int:
+        """Bitset of components reachable from any of ``sources``."""
+        mask = 0
+        for source in sources:
+            component = self.components.get(source)
+            if component is not None:
+                mask |= self.closure[component]
+        return mask
+
+    def grant(self, capabilities: Iterable[str]) -> AuthorityGrant:
+        capabilities = frozenset(capabilities)
+        return AuthorityGrant(self, self.reachable_mask(capabilities), capabilities)
+
+    def reaches(self, source: str, target: str) -> bool:
+        """True if ``target`` is reachable from ``source`` (or is ``source``)."""
+        if source == target:
+            return True
+        source_component = self.components.get(source)
+        target_component = self.components.get(target)
+        if source_component is None or target_component is None:
+            return False
+        return (self.closure[source_component] >> target_component) & 1 == 1
+
+
+# Manifest ID -> grant for that manifest's capabilities
+_GRANTS = LRUCache(256)
+
+
+def manifest_grant(manifest: Any) -> AuthorityGrant:
+    """Grant for a ``CapabilityManifest``, cached by manifest ID."""
+    grant = _GRANTS.get(manifest.id)
+    if grant is None:
+        grant = AuthorityIndex(manifest.authority_graph).grant(manifest.capabilities)
+        _GRANTS.put(manifest.id, grant)
+    return grant
+
+
+class AuthorityCheck(CompiledFormula):
+    """
+    Non-escalation check usable wherever a compiled formula is.
+
+    Behaves like ``always (<step authority is granted>)``: the monitor
+    fails at the first step whose ``authority`` field names an authority
+    not reachable from the manifest's capabilities.
+    """
+
+    def __init__(self, manifest: Any):
+        self.grant = manifest_grant(manifest)
+        self.text = f"authority granted by manifest {manifest.id}"
+        self.ast = None
+        self.fields = [AUTHORITY_FIELD]
+        self._default_factory = self.factory(resolve_field)
+
+    def factory(self, resolve):
+        used = resolve(AUTHORITY_FIELD)
+        allows_step = self.grant.allows_step
+        pred = lambda row: allows_step(used(row))
+        return lambda: AlwaysMonitor(pred)
@@ -0,0 +1,360 @@
+"""
+Binary serialization for FAK proof bundles.
+
+A compact alternative to the canonical-JSON codec. Bytes are stored raw
+instead of as hex, integers as zigzag varints, floats as 8-byte IEEE
+doubles, dict keys are interned per section, and dataclass fields are
+written positionally. Decoding rebuilds objects equal to the originals,
+so content IDs recomputed from a decoded bundle match the canonical-JSON
+IDs.
+
+File layout (all counts and lengths are unsigned LEB128 varints):
+
+    b"FAKB" version
+    header section:    length, bundle id, metadata
+    witness count
+    witness sections:  length, ProofWitness
+
+Each section has its own key table, so a reader can skip or decode any
+witness without the others. Values are a one-byte tag followed by the
+payload; see the ``_T_*`` constants. Structs name a registered dataclass
+by its index in ``STRUCT_TYPES`` and store a field count followed by the
+fields in declaration order; missing trailing fields take their defaults.
+Slotted variants are stored as their base type and other mappings as
+dicts, which hash the same.
+"""
+
+import struct
+from collections.abc import Mapping
+from dataclasses import fields
+from enum import Enum
+from typing import Any, Dict, List, Tuple
+
+from .storage import write_atomic
+from .types import (
+    ExecutionTrace, CapabilityManifest, CostLedger, PolicyIR, InvariantSpec,
+    CounterExample, InvariantStatus, ProofWitness, ProofBundle, FrozenExecutionTrace,
+    FrozenCapabilityManifest, FrozenCostLedger, FrozenPolicyIR, ProofType, WitnessRef, PackedBundle,
+    SLOTTED_TYPES,
+)
+
+MAGIC = b"FAKB"
+VERSION = 1
+
+# Index in these tuples is the on-disk type number: append only
+STRUCT_TYPES = (
+    ExecutionTrace, CapabilityManifest, CostLedger, PolicyIR, InvariantSpec,
+    CounterExample, InvariantStatus, ProofWitness, ProofBundle, FrozenExecutionTrace,
+    FrozenCapabilityManifest, FrozenCostLedger, FrozenPolicyIR, WitnessRef, PackedBundle,
+)
+ENUM_TYPES = (ProofType,)
+
+_T_NONE = 0
+_T_FALSE = 1
+_T_TRUE = 2
+_T_INT = 3
+_T_FLOAT = 4
+_T_STR = 5
+_T_BYTES = 6
+_T_LIST = 7
+_T_DICT = 8
+_T_STRUCT = 9
+_T_ENUM = 10
+_T_KEY = 11       # string, added to the section's key table
+_T_KEY_REF = 12   # index into the section's key table
+
+_DOUBLE = struct.Struct('<d')
+
+_STRUCT_NUMBERS = {cls: i for i, cls in enumerate(STRUCT_TYPES)}
+# Slotted variants are written as (and decode to) their base type
+_STRUCT_NUMBERS.update({cls: _STRUCT_NUMBERS[cls.__fak_base__] for cls in SLOTTED_TYPES})
+_ENUM_NUMBERS = {cls: i for i, cls in enumerate(ENUM_TYPES)}
+_FIELD_NAMES = [tuple(f.name for f in fields(cls)) for cls in STRUCT_TYPES]
+
+
+def _write_varint(out: bytearray, n: int) -> None:
+    while n > 0x7F:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+class _Encoder:
+    """Writes one section."""
+
+    def __init__(self):
+        self.out = bytearray()
+        self.keys: Dict[str, int] = {}
+
+    def value(self, value: Any) -> None:
+        out = self.out
+        kind = type(value)
+        # Exact-type fast paths for the common step values
+        if kind is str:
+            data = value.encode('utf-8')
+            out.append(_T_STR)
+            _write_varint(out, len(data))
+            out += data
+        elif kind is int:
+            out.append(_T_INT)
+            _write_varint(out, value << 1 if value >= 0 else ((-value) << 1) - 1)
+        elif kind is float:
+            out.append(_T_FLOAT)
+            out += _DOUBLE.pack(value)
+        elif kind is dict:
+            out.append(_T_DICT)
+            _write_varint(out, len(value))
+            for key, item in value.items():
+                if type(key) is str:
+                    self.key(key)
+                else:
+                    self.value(key)
+                self.value(item)
+        elif value is None:
+            out.append(_T_NONE)
+        elif value is True:
+            out.append(_T_TRUE)
+        elif value is False:
+            out.append(_T_FALSE)
+        elif isinstance(value, str):
+            data = value.encode('utf-8')
+            out.append(_T_STR)
+            _write_varint(out, len(data))
+            out += data
+        elif isinstance(value, Enum):
+            number = _ENUM_NUMBERS.get(type(value))
+            if number is None:
+                raise TypeError(f"Cannot encode enum of type {type(value).__name__}")
+            out.append(_T_ENUM)
+            _write_varint(out, number)
+            self.value(value.value)
+        elif isinstance(value, int):
+            out.append(_T_INT)
+            _write_varint(out, value << 1 if value >= 0 else ((-value) << 1) - 1)
+        elif isinstance(value, float):
+            out.append(_T_FLOAT)
+            out += _DOUBLE.pack(value)
+        elif isinstance(value, dict):
+            out.append(_T_DICT)
+            _write_varint(out, len(value))
+            for key, item in value.items():
+                if type(key) is str:
+                    self.key(key)
+                else:
+                    self.value(key)
+                self.value(item)
+        elif isinstance(value, (list, tuple)):
+            out.append(_T_LIST)
+            _write_varint(out, len(value))
+            for item in value:
+                self.value(item)
+        elif isinstance(value, (bytes, bytearray, memoryview)):
+            out.append(_T_BYTES)
+            _write_varint(out, len(value))
+            out += value
+        elif isinstance(value, Mapping) and not hasattr(value, '__dataclass_fields__'):
+            # e.g. compact.StepRecord; decodes to a dict
+            self.value(dict(value.items()))
+        else:
+            number = _STRUCT_NUMBERS.get(type(value))
+            if number is None:
+                raise TypeError(f"Cannot encode object of type {type(value).__name__}")
+            out.append(_T_STRUCT)
+            _write_varint(out, number)
+            names = _FIELD_NAMES[number]
+            _write_varint(out, len(names))
+            for name in names:
+                self.value(getattr(value, name))
+
+    def key(self, key: str) -> None:
+        out = self.out
+        index = self.keys.get(key)
+        if index is None:
+            self.keys[key] = len(self.keys)
+            data = key.encode('utf-8')
+            out.append(_T_KEY)
+            _write_varint(out, len(data))
+            out += data
+        else:
+            out.append(_T_KEY_REF)
+            _write_varint(out, index)
+
+
+def encode_section(*values: Any) -> bytes:
+    """Encode values as one section body (without its length prefix)."""
+    encoder = _Encoder()
+    for value in values:
+        encoder.value(value)
+    return bytes(encoder.out)
+
+
+def decode_section(data: Any, count: int = 1) -> List[Any]:
+    """
+    Decode ``count`` values from a section body.
+
+    Raises ValueError if the data is malformed or has trailing bytes.
+    """
+    data = memoryview(data).toreadonly()
+    end = len(data)
+    pos = 0
+    keys: List[str] = []
+    unpack_double = _DOUBLE.unpack_from
+
+    def varint() -> int:
+        nonlocal pos
+        byte = data[pos]
+        pos += 1
+        if byte < 0x80:
+            return byte
+        result = byte & 0x7F
+        shift = 7
+        while True:
+            byte = data[pos]
+            pos += 1
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return result
+            shift += 7
+
+    def raw(length: int) -> memoryview:
+        nonlocal pos
+        start = pos
+        pos += length
+        if pos > end:
+            raise ValueError("Truncated binary data")
+        return data[start:pos]
+
+    def value() -> Any:
+        nonlocal pos
+        tag = data[pos]
+        pos += 1
+        if tag == _T_KEY_REF:
+            return keys[varint()]
+        if tag == _T_STR:
+            return str(raw(varint()), 'utf-8')
+        if tag == _T_KEY:
+            key = str(raw(varint()), 'utf-8')
+            keys.append(key)
+            return key
+        if tag == _T_INT:
+            n = varint()
+            return -((n + 1) >> 1) if n & 1 else n >> 1
+        if tag == _T_DICT:
+            return {value(): value() for _ in range(varint())}
+        if tag == _T_LIST:
+            return [value() for _ in range(varint())]
+        if tag == _T_FLOAT:
+            result, = unpack_double(data, pos)
+            pos += 8
+            return result
+        if tag == _T_NONE:
+            return None
+        if tag == _T_TRUE:
+            return True
+        if tag == _T_FALSE:
+            return False
+        if tag == _T_BYTES:
+            return bytes(raw(varint()))
+        if tag == _T_STRUCT:
+            number = varint()
+            if number >= len(STRUCT_TYPES):
+                raise ValueError(f"Unknown struct type number: {number}")
+            names = _FIELD_NAMES[number]
+            count = varint()
+            if count > len(names):
+                raise ValueError(f"Too many fields for {STRUCT_TYPES[number].__name__}")
+            return STRUCT_TYPES[number](**{names[i]: value() for i in range(count)})
+        if tag == _T_ENUM:
+            number = varint()
+            if number >= len(ENUM_TYPES):
+                raise ValueError(f"Unknown enum type number: {number}")
+            return ENUM_TYPES[number](value())
+        raise ValueError(f"Unknown binary tag: {tag}")
+
+    try:
+        values = [value() for _ in range(count)]
+    except IndexError:
+        raise ValueError("Truncated binary data") from None
+    except (TypeError, UnicodeDecodeError) as e:
+        raise ValueError(f"Malformed binary data: {e}") from None
+    finally:
+        # The recursive closures form a cycle; release the buffer now so a
+        # memory-mapped source can be closed without waiting for the GC
+        data.release()
+    if pos != end:
+        raise ValueError("Trailing bytes after binary section")
+    return values
+
+
+def _read_varint(data: Any, pos: int) -> Tuple[int, int]:
+    result = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise ValueError("Truncated binary data")
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _read_section(data: Any, pos: int) -> Tuple[Any, int]:
+    length, pos = _read_varint(data, pos)
+    if pos + length > len(data):
+        raise ValueError("Truncated binary data")
+    return data[pos:pos + length], pos + length
+
+
+def _append_section(out: bytearray, body: bytes) -> None:
+    _write_varint(out, len(body))
+    out += body
+
+
+def encode_bundle(bundle: ProofBundle) -> bytes:
+    """Encode a bundle in the binary format."""
+    out = bytearray(MAGIC)
+    _write_varint(out, VERSION)
+    _append_section(out, encode_section(bundle.id, bundle.metadata))
+    _write_varint(out, len(bundle.witnesses))
+    for witness in bundle.witnesses:
+        _append_section(out, encode_section(witness))
+    return bytes(out)
+
+
+def decode_bundle(data: bytes) -> ProofBundle:
+    """
+    Decode bytes produced by ``encode_bundle``.
+
+    Raises ValueError for foreign, truncated or newer-version data.
+    """
+    view = memoryview(data)
+    if bytes(view[:len(MAGIC)]) != MAGIC:
+        raise ValueError("Not a FAK binary bundle")
+    version, pos = _read_varint(view, len(MAGIC))
+    if version != VERSION:
+        raise ValueError(f"Unsupported binary bundle version: {version}")
+    header, pos = _read_section(view, pos)
+    bundle_id, metadata = decode_section(header, 2)
+    count, pos = _read_varint(view, pos)
+    witnesses = []
+    for _ in range(count):
+        section, pos = _read_section(view, pos)
+        witness, = decode_section(section)
+        if not isinstance(witness, ProofWitness):
+            raise ValueError("Witness section does not hold a ProofWitness")
+        witnesses.append(witness)
+    if pos != len(view):
+        raise ValueError("Trailing bytes after binary bundle")
+    return ProofBundle(id=bundle_id, witnesses=witnesses, metadata=metadata)
+
+
+def write_bundle(path: str, bundle: ProofBundle) -> None:
+    """Atomically write a bundle file in the binary format."""
+    write_atomic(path, encode_bundle(bundle))
+
+
+def read_bundle(path: str) -> ProofBundle:
+    with open(path, 'rb') as f:
+        return decode_bundle(f.read())
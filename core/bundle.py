@@ -0,0 +1,137 @@
+"""
+Artifact deduplication for FAK proof bundles.
+
+A ``ProofBundle`` embeds full artifacts in every witness, so a bundle of
+many witnesses over one policy and manifest repeats them. ``pack_bundle``
+converts it to a ``PackedBundle``: one table per artifact kind, keyed by
+content hash, and ``WitnessRef`` witnesses naming their artifacts by key.
+Bundle and proof IDs are carried over unchanged.
+
+With an ``ArtifactManager`` the tables can be left empty and the artifacts
+stored in the manager instead. ``BundleView`` resolves witnesses lazily,
+from the tables first and the manager second, and witnesses resolved from
+one view share artifact objects.
+"""
+
+from typing import Any, Dict, Iterator, List, Optional
+
+from .artifacts import ArtifactManager
+from .types import PackedBundle, ProofBundle, ProofWitness, WitnessRef, compute_content_hash
+
+# WitnessRef / ProofWitness field -> PackedBundle table
+ARTIFACT_TABLES = {
+    "execution_trace": "traces",
+    "capability_manifest": "manifests",
+    "cost_ledger": "ledgers",
+    "policy_ir": "policies",
+}
+
+
+def pack_bundle(bundle: ProofBundle, manager: Optional[ArtifactManager] = None) -> PackedBundle:
+    """
+    Deduplicate a bundle's artifacts.
+
+    Each artifact object is hashed once, however many witnesses share it.
+    With a ``manager`` the artifacts are stored there and the returned
+    bundle's tables are empty.
+    """
+    tables: Dict[str, Dict[str, Any]] = {table: {} for table in ARTIFACT_TABLES.values()}
+    hashes: Dict[int, str] = {}  # id(artifact) -> content hash; the bundle keeps them alive
+    refs = []
+    for witness in bundle.witnesses:
+        keys = {}
+        for name, table in ARTIFACT_TABLES.items():
+            artifact = getattr(witness, name)
+            key = hashes.get(id(artifact))
+            if key is None:
+                key = hashes[id(artifact)] = compute_content_hash(artifact)
+                if manager is not None:
+                    manager.put_if_absent(key, artifact)
+                else:
+                    tables[table].setdefault(key, artifact)
+            keys[name] = key
+        refs.append(WitnessRef(
+            proof_id=witness.proof_id,
+            invariants=witness.invariants,
+            counterexamples=witness.counterexamples,
+            statuses=witness.statuses,
+            **keys
+        ))
+    return PackedBundle(id=bundle.id, witnesses=refs, metadata=bundle.metadata, **tables)
+
+
+class BundleView:
+    """Lazy, indexable view of a packed bundle's witnesses."""
+
+    def __init__(self, packed: PackedBundle, manager: Optional[ArtifactManager] = None, validate: bool = False):
+        self.packed = packed
+        self.manager = manager
+        self.validate = validate
+        self._resolved: Dict[str, Any] = {}
+
+    @property
+    def id(self) -> str:
+        return self.packed.id
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        return self.packed.metadata
+
+    @property
+    def proof_ids(self) -> List[str]:
+        return [ref.proof_id for ref in self.packed.witnesses]
+
+    def __len__(self) -> int:
+        return len(self.packed.witnesses)
+
+    def __getitem__(self, index: int) -> ProofWitness:
+        return self.resolve(self.packed.witnesses[index])
+
+    def __iter__(self) -> Iterator[ProofWitness]:
+        for ref in self.packed.witnesses:
+            yield self.resolve(ref)
+
+    def artifact(self, table: str, key: str) -> Any:
+        """
+        Look up an artifact by table name and content hash.
+
+        Raises ValueError if it is in neither the table nor the manager, or
+        (with ``validate``) if its content does not hash to ``key``.
+        """
+        artifact = self._resolved.get(key)
+        if artifact is not None:
+            return artifact
+        artifact = getattr(self.packed, table).get(key)
+        if artifact is None:
+            if self.manager is None:
+                raise ValueError(f"Artifact {key} not found")
+            artifact = self.manager.retrieve_artifact(key)
+        if self.validate and compute_content_hash(artifact) != key:
+            raise ValueError(f"Artifact {key} integrity check failed")
+        self._resolved[key] = artifact
+        return artifact
+
+    def resolve(self, ref: WitnessRef) -> ProofWitness:
+        return ProofWitness(
+            proof_id=ref.proof_id,
+            invariants=ref.invariants,
+            counterexamples=ref.counterexamples,
+            statuses=ref.statuses,
+            **{name: self.artifact(table, getattr(ref, name)) for name, table in ARTIFACT_TABLES.items()}
+        )
+
+    def select(self, indices: Optional[List[int]] = None) -> List[ProofWitness]:
+        """Resolve the witnesses at ``indices`` (all by default)."""
+        if indices is None:
+            return list(self)
+        return [self[index] for index in indices]
+
+
+def unpack_bundle(
+    packed: PackedBundle,
+    manager: Optional[ArtifactManager] = None,
+    validate: bool = False
+) -> ProofBundle:
+    """Rebuild the full ``ProofBundle``; see ``BundleView`` for the arguments."""
+    view = BundleView(packed, manager, validate)
+    return ProofBundle(id=packed.id, witnesses=list(view), metadata=packed.metadata)
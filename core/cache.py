@@ -0,0 +1,78 @@
+"""
+Bounded caches for FAK.
+"""
+
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+import threading
+
+
+class LRUCache:
+    """
+    Thread-safe least-recently-used cache with a fixed number of entries.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        if maxsize < 1:
+            raise ValueError("LRUCache maxsize must be positive")
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Return the cached value and mark it most recently used."""
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def peek(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """
+        Return the cached value without taking the lock or refreshing it.
+
+        Safe alongside concurrent writers: a single dict lookup is atomic.
+        """
+        return self._entries.get(key, default)
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Insert or refresh an entry, evicting the oldest beyond maxsize."""
+        with self._lock:
+            self._insert(key, value)
+
+    def try_put(self, key: Hashable, value: Any) -> bool:
+        """``put`` unless another thread holds the lock; never blocks."""
+        if not self._lock.acquire(blocking=False):
+            return False
+        try:
+            self._insert(key, value)
+        finally:
+            self._lock.release()
+        return True
+
+    def _insert(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        with self._lock:
+            return self._entries.pop(key, default)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
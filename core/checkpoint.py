@@ -0,0 +1,140 @@
+"""
+Checkpoints for incremental trace verification.
+
+Traces grow by appending steps. After a fused scan the engine saves every
+monitor's state, keyed by the invariant set and a digest of the scanned
+prefix; a later scan of an extended trace restores that state and only
+feeds the new steps to the monitors. The final verdict is the same as a
+full replay because monitors are deterministic and ``finish`` is applied
+to a restored copy, never to the saved state.
+
+Prefix digests are chained, ``d[k] = SHA-256(d[k-1] || canonical(step k))``,
+so one pass yields the digest of every prefix. The store keeps the digests
+of the last scans it saved; a new trace whose steps start with the same
+step objects is seeded from them and hashes only the steps after the
+shared prefix. As with appends to one trace, steps are assumed not to be
+mutated in place once scanned.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Dict, List, Optional, Sequence
+
+from .cache import LRUCache
+from .types import update_canonical_hash
+
+_EMPTY_PREFIX = hashlib.sha256(b'fak-prefix').digest()
+
+# Checkpoint lengths remembered per invariant set
+_MAX_LENGTHS = 64
+
+# Saved scans whose prefix digests can seed a later trace's
+_MAX_SCANS = 16
+
+
+def _shared_length(old: Sequence[Any], new: Sequence[Any], limit: int) -> int:
+    """Number of leading positions holding the same step objects."""
+    shared = 0
+    for a, b in zip(islice(old, limit), new):
+        if a is not b:
+            break
+        shared += 1
+    return shared
+
+
+class PrefixDigests:
+    """
+    Chained digests of every prefix of a step list.
+
+    With ``base`` the digests of the leading steps ``steps`` shares with
+    ``base.steps`` (by identity) are reused instead of rehashed.
+    """
+
+    def __init__(self, steps: Sequence[Any], base: Optional["PrefixDigests"] = None):
+        self.steps = steps
+        self.digests: List[bytes] = [_EMPTY_PREFIX]
+        if base is not None:
+            shared = _shared_length(base.steps, steps, base.length)
+            self.digests = base.digests[:shared + 1]
+        self.extend()
+
+    @property
+    def length(self) -> int:
+        return len(self.digests) - 1
+
+    def extend(self) -> None:
+        """Hash steps appended since the last call."""
+        digests = self.digests
+        previous = digests[-1]
+        for step in islice(self.steps, self.length, None):
+            digest = hashlib.sha256(previous)
+            update_canonical_hash(digest, step)
+            previous = digest.digest()
+            digests.append(previous)
+
+    def __getitem__(self, length: int) -> bytes:
+        """Digest of the first ``length`` steps."""
+        return self.digests[length]
+
+
+@dataclass(frozen=True)
+class Checkpoint:
+    """Monitor states after scanning the first ``length`` steps."""
+    length: int
+    states: Dict[str, tuple]  # formula text -> Monitor.snapshot()
+
+
+class CheckpointStore:
+    """
+    Bounded store of scan checkpoints.
+
+    Entries are keyed by (invariant set key, prefix digest) and evicted
+    least-recently-used. For each invariant set the lengths of recent
+    checkpoints are remembered, so finding the longest usable prefix of a
+    trace costs one lookup per candidate length.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self._entries = LRUCache(maxsize)
+        self._lengths: Dict[str, "OrderedDict[int, None]"] = {}
+        self._scans = LRUCache(_MAX_SCANS)  # set key -> PrefixDigests of the last saved scan
+        self._lock = threading.Lock()
+
+    @property
+    def hits(self) -> int:
+        return self._entries.hits
+
+    def base_digests(self, set_key: str) -> Optional[PrefixDigests]:
+        """Digests of the last scan saved for an invariant set, to seed a new trace's."""
+        return self._scans.get(set_key)
+
+    def find(self, set_key: str, digests: PrefixDigests) -> Optional[Checkpoint]:
+        """Longest saved checkpoint whose prefix matches ``digests``."""
+        with self._lock:
+            lengths = sorted(self._lengths.get(set_key, ()), reverse=True)
+        for length in lengths:
+            if length > digests.length:
+                continue
+            checkpoint = self._entries.get((set_key, digests[length]))
+            if checkpoint is not None:
+                return checkpoint
+        return None
+
+    def save(self, set_key: str, digests: PrefixDigests, checkpoint: Checkpoint) -> None:
+        self._entries.put((set_key, digests[checkpoint.length]), checkpoint)
+        self._scans.put(set_key, digests)
+        with self._lock:
+            lengths = self._lengths.setdefault(set_key, OrderedDict())
+            lengths[checkpoint.length] = None
+            lengths.move_to_end(checkpoint.length)
+            while len(lengths) > _MAX_LENGTHS:
+                lengths.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._scans.clear()
+        with self._lock:
+            self._lengths.clear()
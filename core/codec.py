@@ -0,0 +1,93 @@
+"""
+Plain-data codec for FAK types.
+
+Objects are encoded as their canonical JSON form (the same form that is
+hashed for content IDs) wrapped with a type tag, and decoded back using
+the dataclass field annotations. A decoded object therefore hashes to the
+same content ID as the original.
+"""
+
+import json
+import typing
+from dataclasses import fields, is_dataclass
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Dict, Union
+
+from .types import (
+    ExecutionTrace, CapabilityManifest, CostLedger, PolicyIR, InvariantSpec,
+    CounterExample, InvariantStatus, ProofWitness, ProofBundle, FrozenExecutionTrace,
+    FrozenCapabilityManifest, FrozenCostLedger, FrozenPolicyIR, WitnessRef, PackedBundle,
+    SLOTTED_TYPES, _CANONICAL_ENCODER,
+)
+
+_TYPES: Dict[str, type] = {}
+
+
+def register_type(cls: type) -> type:
+    """Make a dataclass decodable by name."""
+    _TYPES[cls.__name__] = cls
+    return cls
+
+
+for _cls in (
+    ExecutionTrace, CapabilityManifest, CostLedger, PolicyIR, InvariantSpec,
+    CounterExample, InvariantStatus, ProofWitness, ProofBundle, FrozenExecutionTrace,
+    FrozenCapabilityManifest, FrozenCostLedger, FrozenPolicyIR, WitnessRef, PackedBundle,
+) + SLOTTED_TYPES:
+    register_type(_cls)
+
+
+@lru_cache(maxsize=None)
+def _field_hints(cls: type) -> Dict[str, Any]:
+    return typing.get_type_hints(cls)
+
+
+def from_plain(tp: Any, value: Any) -> Any:
+    """Rebuild a value of annotated type ``tp`` from its canonical JSON form."""
+    if value is None:
+        return None
+    origin = typing.get_origin(tp)
+    if origin is Union:
+        options = [arg for arg in typing.get_args(tp) if arg is not type(None)]
+        return from_plain(options[0], value) if len(options) == 1 else value
+    if origin is list:
+        (item_type,) = typing.get_args(tp) or (Any,)
+        return [from_plain(item_type, item) for item in value]
+    if origin is dict:
+        _, value_type = typing.get_args(tp) or (Any, Any)
+        return {key: from_plain(value_type, item) for key, item in value.items()}
+    if tp is bytes:
+        return bytes.fromhex(value)
+    if isinstance(tp, type) and issubclass(tp, Enum):
+        return tp(value)
+    if isinstance(tp, type) and is_dataclass(tp):
+        hints = _field_hints(tp)
+        return tp(**{
+            f.name: from_plain(hints[f.name], value[f.name])
+            for f in fields(tp) if f.name in value
+        })
+    return value
+
+
+def encode_object(obj: Any) -> bytes:
+    """Encode a registered FAK dataclass as tagged canonical JSON bytes."""
+    type_name = type(obj).__name__
+    if type_name not in _TYPES:
+        raise TypeError(f"Cannot encode object of type {type_name}")
+    return _CANONICAL_ENCODER.encode({"type": type_name, "data": obj}).encode('ascii')
+
+
+def decode_object(data: bytes) -> Any:
+    """Decode bytes produced by ``encode_object``."""
+    return decode_payload(json.loads(data))
+
+
+def decode_payload(payload: Dict[str, Any]) -> Any:
+    """Decode the already-parsed JSON form of ``encode_object`` output."""
+    if not isinstance(payload, dict):
+        raise ValueError("Encoded object must be a JSON object")
+    cls = _TYPES.get(payload.get("type"))
+    if cls is None:
+        raise ValueError(f"Unknown encoded type: {payload.get('type')!r}")
+    return from_plain(cls, payload["data"])
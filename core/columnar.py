@@ -0,0 +1,299 @@
+"""
+Columnar view of execution traces for FAK.
+
+Steps are pivoted into one column per referenced field: numeric fields
+become typed arrays (NumPy arrays when NumPy is installed), string fields
+are dictionary-encoded. Atomic predicates are evaluated as whole-column
+masks and temporal operators reduce those masks, so a formula is checked
+without calling a Python predicate per step.
+
+Masks are ``bytes`` objects holding 0/1 per step. They combine with
+C-level integer operations and reduce with ``bytes.find``.
+"""
+
+import operator
+from array import array
+from itertools import repeat
+from typing import Any, Dict, List, Optional, Tuple
+
+from .temporal import (
+    Always, And, Compare, CompiledFormula, Const, Eventually, Field, Implies,
+    Not, Or, Verdict, Within, compile_state, resolve_field,
+)
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+
+_ORDERED = {
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    '==': operator.eq,
+}
+
+_FLIPPED = {'<': '>', '<=': '>=', '>': '<', '>=': '<=', '==': '==', '!=': '!='}
+
+_NOT_TABLE = bytes.maketrans(b'\x00\x01', b'\x01\x00')
+
+_MISSING_CODE = 255
+
+# Integers beyond this magnitude are not exactly representable as doubles
+_MAX_EXACT_FLOAT_INT = 2 ** 53
+_INT64_RANGE = (-2 ** 63, 2 ** 63 - 1)
+
+
+# ---------------------------------------------------------------------------
+# Mask helpers
+# ---------------------------------------------------------------------------
+
+def _mask_and(a: bytes, b: bytes) -> bytes:
+    return (int.from_bytes(a, 'little') & int.from_bytes(b, 'little')).to_bytes(len(a), 'little')
+
+
+def _mask_or(a: bytes, b: bytes) -> bytes:
+    return (int.from_bytes(a, 'little') | int.from_bytes(b, 'little')).to_bytes(len(a), 'little')
+
+
+def _mask_not(a: bytes) -> bytes:
+    return a.translate(_NOT_TABLE)
+
+
+def _mask_const(value: bool, length: int) -> bytes:
+    return (b'\x01' if value else b'\x00') * length
+
+
+# ---------------------------------------------------------------------------
+# Columns
+# ---------------------------------------------------------------------------
+
+class NumericColumn:
+    """Integer or float column; missing values are stored as 0."""
+
+    def __init__(self, values: List[Any], typecode: str, present: bytes):
+        filled = [0 if v is None else v for v in values]
+        if np is not None:
+            self.values = np.array(filled, dtype=np.int64 if typecode == 'q' else np.float64)
+        else:
+            self.values = array(typecode, filled)
+        self.present = present
+        self.length = len(values)
+
+    def compare(self, op: str, const: Any) -> bytes:
+        if const is None:
+            if op == '==':
+                return _mask_not(self.present)
+            if op == '!=':
+                return self.present
+            return _mask_const(False, self.length)
+        if isinstance(const, str):
+            return _mask_const(op == '!=', self.length)
+        if op == '!=':
+            return _mask_not(self.compare('==', const))
+        compare = _ORDERED[op]
+        values = self.values
+        if np is not None:
+            try:
+                return _mask_and(compare(values, const).tobytes(), self.present)
+            except (OverflowError, TypeError):
+                values = values.tolist()
+        mask = bytes(map(compare, values, repeat(const, self.length)))
+        return _mask_and(mask, self.present)
+
+    def truthy(self) -> bytes:
+        if np is not None:
+            return (self.values != 0).tobytes()
+        return bytes(map(bool, self.values))
+
+
+class StringColumn:
+    """Dictionary-encoded string column."""
+
+    def __init__(self, values: List[Optional[str]]):
+        dictionary: Dict[str, int] = {}
+        codes = []
+        for value in values:
+            if value is None:
+                codes.append(-1)
+            else:
+                code = dictionary.get(value)
+                if code is None:
+                    code = dictionary[value] = len(dictionary)
+                codes.append(code)
+        self.dictionary = list(dictionary)
+        self.length = len(values)
+        if len(self.dictionary) < _MISSING_CODE:
+            self.codes = bytes(_MISSING_CODE if c < 0 else c for c in codes)
+        else:
+            self.codes = array('i', codes)
+
+    def _select(self, accepted) -> bytes:
+        if isinstance(self.codes, bytes):
+            table = bytearray(256)
+            for code in accepted:
+                table[code] = 1
+            return self.codes.translate(table)
+        return bytes(map(set(accepted).__contains__, self.codes))
+
+    def _missing_code(self) -> int:
+        return _MISSING_CODE if isinstance(self.codes, bytes) else -1
+
+    def compare(self, op: str, const: Any) -> bytes:
+        if const is None:
+            mask = self._select([self._missing_code()])
+            return mask if op == '==' else (_mask_not(mask) if op == '!=' else _mask_const(False, self.length))
+        if not isinstance(const, str):
+            return _mask_const(op == '!=', self.length)
+        if op == '!=':
+            return _mask_not(self.compare('==', const))
+        compare = _ORDERED[op]
+        accepted = [code for code, value in enumerate(self.dictionary) if compare(value, const)]
+        return self._select(accepted)
+
+    def truthy(self) -> bytes:
+        return self._select([code for code, value in enumerate(self.dictionary) if value])
+
+
+class ObjectColumn:
+    """Fallback column for mixed or non-scalar values."""
+
+    def __init__(self, values: List[Any]):
+        self.values = values
+        self.length = len(values)
+
+    def compare(self, op: str, const: Any) -> bytes:
+        if op == '!=':
+            return _mask_not(self.compare('==', const))
+        compare = _ORDERED[op]
+
+        def check(value):
+            try:
+                return bool(compare(value, const))
+            except TypeError:
+                return False
+        return bytes(map(check, self.values))
+
+    def truthy(self) -> bytes:
+        return bytes(map(bool, self.values))
+
+
+def build_column(values: List[Any]):
+    """Pick the most compact column type for a list of step values."""
+    kinds = set(map(type, values))
+    kinds.discard(type(None))
+    present = bytes(map(operator.is_not, values, repeat(None, len(values))))
+    if kinds and kinds <= {int, bool}:
+        ints = [v for v in values if v is not None]
+        if _INT64_RANGE[0] <= min(ints) and max(ints) <= _INT64_RANGE[1]:
+            return NumericColumn(values, 'q', present)
+    elif kinds and kinds <= {int, bool, float}:
+        if all(abs(v) <= _MAX_EXACT_FLOAT_INT for v in values if type(v) in (int, bool)):
+            return NumericColumn(values, 'd', present)
+    elif kinds == {str}:
+        return StringColumn(values)
+    return ObjectColumn(values)
+
+
+# ---------------------------------------------------------------------------
+# Columnar trace
+# ---------------------------------------------------------------------------
+
+class ColumnarTrace:
+    """
+    Lazily-built columnar view over a list of step dicts.
+
+    Columns are materialized per field path on first use; the original
+    steps are left untouched so the dict API keeps working. A column that
+    cannot be built (e.g. a step is not a mapping) re-raises its error on
+    every use; callers fall back to scanning the steps.
+    """
+
+    def __init__(self, steps: List[Dict[str, Any]]):
+        self.steps = steps
+        self.length = len(steps)
+        self._columns: Dict[Tuple[str, ...], Any] = {}
+
+    def column(self, path: Tuple[str, ...]):
+        col = self._columns.get(path)
+        if col is None:
+            try:
+                col = build_column(list(map(resolve_field(path), self.steps)))
+            except Exception as e:
+                col = e
+            self._columns[path] = col
+        if isinstance(col, Exception):
+            raise col
+        return col
+
+    def mask(self, node) -> bytes:
+        """Evaluate a state formula over all steps at once."""
+        if isinstance(node, Compare):
+            left, right, op = node.left, node.right, node.op
+            if isinstance(left, Const) and isinstance(right, Field):
+                left, right, op = right, left, _FLIPPED[op]
+            if isinstance(left, Field) and isinstance(right, Const):
+                return self.column(left.path).compare(op, right.value)
+        elif isinstance(node, Field):
+            return self.column(node.path).truthy()
+        elif isinstance(node, Const):
+            return _mask_const(bool(node.value), self.length)
+        elif isinstance(node, Not):
+            return _mask_not(self.mask(node.operand))
+        elif isinstance(node, And):
+            masks = [self.mask(o) for o in node.operands]
+            result = masks[0]
+            for m in masks[1:]:
+                result = _mask_and(result, m)
+            return result
+        elif isinstance(node, Or):
+            masks = [self.mask(o) for o in node.operands]
+            result = masks[0]
+            for m in masks[1:]:
+                result = _mask_or(result, m)
+            return result
+        elif isinstance(node, Implies):
+            return _mask_or(_mask_not(self.mask(node.left)), self.mask(node.right))
+        # Field-to-field comparisons and the like: evaluate row by row
+        pred = compile_state(node)
+        return bytes(map(bool, map(pred, self.steps)))
+
+    def evaluate(self, formula: CompiledFormula) -> Verdict:
+        """Check a compiled formula by reducing column masks."""
+        node = formula.ast
+        length = self.length
+        last = length - 1 if length else None
+        if isinstance(node, Always):
+            index = self.mask(node.body).find(0)
+            return Verdict(True) if index < 0 else Verdict(False, index)
+        if isinstance(node, Eventually):
+            index = self.mask(node.body).find(1)
+            return Verdict(True) if index >= 0 else Verdict(False, last)
+        if isinstance(node, Within):
+            if isinstance(node.body, Implies):
+                return self._response(
+                    self.mask(node.body.left), self.mask(node.body.right), node.bound
+                )
+            index = self.mask(node.body).find(1, 0, node.bound)
+            if index >= 0:
+                return Verdict(True)
+            return Verdict(False, min(node.bound, length) - 1 if length else None)
+        if not length:
+            return Verdict(False, None)
+        return Verdict(True) if self.mask(node)[0] else Verdict(False, 0)
+
+    @staticmethod
+    def _response(triggers: bytes, responses: bytes, bound: int) -> Verdict:
+        # Same episodes as ResponseMonitor: the oldest open trigger is answered
+        # by the next response at or after it, which discharges all pending ones
+        start = 0
+        while True:
+            trigger = triggers.find(1, start)
+            if trigger < 0:
+                return Verdict(True)
+            answer = responses.find(1, trigger)
+            if answer < 0 or answer - trigger >= bound:
+                return Verdict(False, trigger)
+            start = answer + 1
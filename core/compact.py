@@ -0,0 +1,154 @@
+"""
+Compact in-memory trace steps for FAK.
+
+Steps decoded from JSON are independent dicts, each with its own hash
+table and its own copy of every string value. ``StepRecord`` is a
+read-only mapping that stores a step as a tuple of values plus a
+``StepSchema`` shared by every step with the same keys, and
+``StepInterner`` shares equal short strings between steps. A trace of
+similar steps takes a fraction of the memory.
+
+Records read like the dicts they replace (``get``, ``[]``, ``in``,
+iteration, equality with dicts) and hash to the same content IDs. Use
+``compact_trace`` to convert a whole trace, optionally into a (frozen)
+slotted ``ExecutionTrace`` variant.
+"""
+
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .cache import LRUCache
+from .types import ExecutionTrace, slotted_variant
+
+
+class StepSchema:
+    """Keys shared by every record built with this schema."""
+
+    __slots__ = ('keys', 'index')
+
+    def __init__(self, keys: Tuple[Any, ...]):
+        self.keys = keys
+        self.index: Dict[Any, int] = {key: i for i, key in enumerate(keys)}
+
+
+# Schemas for unpickled records, keyed by key tuple
+_SCHEMAS = LRUCache(4096)
+
+
+def _schema_for(keys: Tuple[Any, ...]) -> StepSchema:
+    schema = _SCHEMAS.get(keys)
+    if schema is None:
+        schema = StepSchema(keys)
+        _SCHEMAS.put(keys, schema)
+    return schema
+
+
+class StepRecord(Mapping):
+    """Read-only step mapping backed by a shared schema and a value tuple."""
+
+    __slots__ = ('_schema', '_values')
+
+    def __init__(self, schema: StepSchema, values: Tuple[Any, ...]):
+        if len(values) != len(schema.keys):
+            raise ValueError("StepRecord values do not match its schema")
+        self._schema = schema
+        self._values = values
+
+    def __getitem__(self, key: Any) -> Any:
+        index = self._schema.index.get(key)
+        if index is None:
+            raise KeyError(key)
+        return self._values[index]
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        index = self._schema.index.get(key)
+        return default if index is None else self._values[index]
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._schema.index
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._schema.keys)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def items(self):
+        return zip(self._schema.keys, self._values)
+
+    def __repr__(self) -> str:
+        return f"StepRecord({dict(self.items())!r})"
+
+    def __reduce__(self):
+        return (_restore_record, (self._schema.keys, self._values))
+
+
+def _restore_record(keys: Tuple[Any, ...], values: Tuple[Any, ...]) -> StepRecord:
+    return StepRecord(_schema_for(keys), values)
+
+
+class StepInterner:
+    """
+    Builds ``StepRecord`` steps that share schemas and string values.
+
+    Strings up to ``max_length`` characters are interned, at most
+    ``max_strings`` distinct ones; nested dicts become records too and
+    lists are copied with their items compacted.
+    """
+
+    def __init__(self, max_strings: int = 65536, max_length: int = 64):
+        self.max_strings = max_strings
+        self.max_length = max_length
+        self._schemas: Dict[Tuple[Any, ...], StepSchema] = {}
+        self._strings: Dict[str, str] = {}
+
+    def schema(self, keys: Tuple[Any, ...]) -> StepSchema:
+        schema = self._schemas.get(keys)
+        if schema is None:
+            schema = self._schemas[keys] = StepSchema(tuple(self.value(key) for key in keys))
+        return schema
+
+    def value(self, value: Any) -> Any:
+        kind = type(value)
+        if kind is str:
+            if len(value) > self.max_length:
+                return value
+            shared = self._strings.get(value)
+            if shared is not None:
+                return shared
+            if len(self._strings) < self.max_strings:
+                self._strings[value] = value
+            return value
+        if kind is dict or isinstance(value, Mapping):
+            return self.record(value)
+        if kind is list:
+            return [self.value(item) for item in value]
+        return value
+
+    def record(self, step: Mapping) -> StepRecord:
+        """Compact one step; records are returned unchanged."""
+        if type(step) is StepRecord:
+            return step
+        schema = self.schema(tuple(step.keys()))
+        return StepRecord(schema, tuple([self.value(item) for item in step.values()]))
+
+
+def compact_steps(steps: Iterable[Mapping], interner: Optional[StepInterner] = None) -> List[StepRecord]:
+    """Compact a sequence of steps, sharing schemas and strings between them."""
+    interner = interner if interner is not None else StepInterner()
+    record = interner.record
+    return [record(step) for step in steps]
+
+
+def compact_trace(
+    trace: ExecutionTrace,
+    frozen: bool = False,
+    interner: Optional[StepInterner] = None
+) -> ExecutionTrace:
+    """
+    Copy a trace into a slotted ``ExecutionTrace`` variant with compact steps.
+
+    The copy hashes to the same content ID as ``trace``.
+    """
+    cls = slotted_variant(ExecutionTrace, frozen)
+    return cls(id=trace.id, steps=compact_steps(trace.steps, interner), metadata=trace.metadata)
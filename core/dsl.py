@@ -3,8 +3,29 @@ Invariant specification DSL for FAK.
 """
 
 import re
-from typing import List, Optional, Dict, Any
-from dataclasses import dataclass
+import hashlib
+from typing import List, Optional, Dict, Any, Iterable, Union
+from dataclasses import dataclass, field
+from .cache import LRUCache
+from .types import InvariantSpec, ProofType
+from .temporal import FormulaParser, Token, compile_formula, format_formula, line_col, tokenize, _unquote
+
+
+_FIELD_NAMES = ('precondition', 'postcondition', 'temporal_properties')
+
+_COMMENT_RE = re.compile(r'#[^\n]*')
+_NAME_RE = re.compile(r'invariant\s+(\w+)')
+# Pattern that properly handles closing braces and field boundaries
+_FIELD_PATTERNS = {
+    field_name: re.compile(
+        rf'{field_name}:\s*(.*?)(?=\s*(?:precondition|postcondition|temporal_properties|}})\s*|$)',
+        re.DOTALL
+    )
+    for field_name in _FIELD_NAMES
+}
+
+# Parsed specs keyed by SHA-256 of the spec text
+_PARSE_CACHE = LRUCache(4096)
 
 
 @dataclass
@@ -14,6 +35,172 @@ class TemporalProperty:
     expression: str
 
 
+@dataclass
+class InvariantDecl:
+    """
+    Parsed invariant block with formula ASTs.
+
+    ``precondition`` and ``postcondition`` hold formula ASTs (see
+    ``temporal``); ``temporal_properties`` holds operator names as strings
+    and any full formulas as ASTs. ``pos`` is the source offset of the
+    ``invariant`` keyword.
+    """
+    name: str
+    precondition: Optional[Any]
+    postcondition: Optional[Any]
+    temporal_properties: List[Union[str, Any]]
+    description: str = ""
+    invariant_type: ProofType = ProofType.BEHAVIORAL_SOUNDNESS
+    pos: int = 0
+
+    def to_spec(self) -> InvariantSpec:
+        """
+        Convert to an InvariantSpec with canonical formula text.
+
+        The ASTs are handed to the formula compiler, so the proof engine
+        reuses them instead of re-parsing the text.
+        """
+        formulas = {}
+        for clause in ('precondition', 'postcondition'):
+            node = getattr(self, clause)
+            formulas[clause] = compile_formula(node).text if node is not None else None
+        return InvariantSpec(
+            name=self.name,
+            description=self.description,
+            precondition=formulas['precondition'],
+            postcondition=formulas['postcondition'],
+            temporal_properties=[
+                p if isinstance(p, str) else format_formula(p) for p in self.temporal_properties
+            ],
+            invariant_type=self.invariant_type
+        )
+
+
+class _DocumentParser(FormulaParser):
+    """
+    Recursive-descent parser for documents holding many invariant blocks.
+
+    Grammar:
+        document   := block*
+        block      := 'invariant' NAME '{' field* '}'
+        field      := ('precondition' | 'postcondition') ':' formula
+                    | 'temporal_properties' ':' '[' (property (',' property)*)? ']'
+                    | 'description' ':' STRING
+                    | 'type' ':' NAME
+        property   := phrase | formula
+        phrase     := (NAME | NUMBER)+      e.g. always, within 10 steps
+    """
+
+    def __init__(self, text: str):
+        super().__init__(tokenize(text))
+        self.text = text
+
+    def error(self, message: str, token: Token) -> ValueError:
+        line, column = line_col(self.text, token.pos)
+        found = token.text or 'end of input'
+        return ValueError(f"{message} at line {line}, column {column} (found {found!r})")
+
+    def parse_document(self) -> List[InvariantDecl]:
+        blocks = []
+        while self.peek().kind != 'eof':
+            blocks.append(self._block())
+        return blocks
+
+    def _block(self) -> InvariantDecl:
+        start = self.peek()
+        if not (start.kind == 'name' and start.text == 'invariant'):
+            raise self.error("Expected 'invariant'", start)
+        self.advance()
+        name = self.expect('name').text
+        self.expect('op', '{')
+        decl = InvariantDecl(name, None, None, [], pos=start.pos)
+        seen = set()
+        while not self.accept('op', '}'):
+            token = self.peek()
+            if token.kind != 'name' or token.text not in _DOCUMENT_FIELDS:
+                raise self.error("Expected a field name or '}'", token)
+            if token.text in seen:
+                raise self.error(f"Duplicate field {token.text!r}", token)
+            seen.add(token.text)
+            self.advance()
+            self.expect('op', ':')
+            if token.text in ('precondition', 'postcondition'):
+                setattr(decl, token.text, self._formula())
+            elif token.text == 'temporal_properties':
+                decl.temporal_properties = self._properties()
+            elif token.text == 'description':
+                decl.description = self._string()
+            else:
+                decl.invariant_type = self._invariant_type()
+        return decl
+
+    def _formula(self):
+        try:
+            return self.parse_formula()
+        except ValueError as e:
+            # ``error`` has already located the failing token
+            raise ValueError(f"Invalid formula: {e}") from None
+
+    def _properties(self) -> List[Union[str, Any]]:
+        self.expect('op', '[')
+        properties = []
+        if self.accept('op', ']'):
+            return properties
+        while True:
+            properties.append(self._property())
+            if self.accept('op', ']'):
+                return properties
+            self.expect('op', ',')
+
+    def _property(self) -> Union[str, Any]:
+        start = self.index
+        phrase = self._phrase()
+        end = self.index
+        # A single word stays an operator name even where it would parse as a formula
+        if phrase is not None and end == start + 1:
+            return phrase
+        self.index = start
+        try:
+            node = self.parse_formula()
+            if self._at_property_end():
+                return node
+        except ValueError:
+            pass
+        if phrase is not None:
+            self.index = end
+            return phrase
+        self.index = start
+        return self._formula()
+
+    def _phrase(self) -> Optional[str]:
+        """Words and numbers up to the next ',' or ']' (e.g. ``within 10 steps``), or None."""
+        start = self.index
+        while self.peek().kind in ('keyword', 'name', 'number'):
+            self.advance()
+        if self.index == start or not self._at_property_end():
+            self.index = start
+            return None
+        return ' '.join(token.text for token in self.tokens[start:self.index])
+
+    def _at_property_end(self) -> bool:
+        token = self.peek()
+        return token.kind == 'op' and token.text in (',', ']')
+
+    def _string(self) -> str:
+        token = self.expect('string')
+        return _unquote(token.text)
+
+    def _invariant_type(self) -> ProofType:
+        token = self.expect('name')
+        try:
+            return ProofType(token.text.lower())
+        except ValueError:
+            raise self.error("Unknown invariant type", token) from None
+
+
+_DOCUMENT_FIELDS = ('precondition', 'postcondition', 'temporal_properties', 'description', 'type')
+
+
 class InvariantDSL:
     """
     Minimal DSL for specifying invariants.
@@ -33,22 +220,48 @@ class InvariantDSL:
 
     @staticmethod
     def parse_invariant(spec_str: str) -> Dict[str, Any]:
-        """Parse invariant specification string into structured form."""
-        # Remove comments and normalize whitespace
-        lines = spec_str.split('\n')
-        clean_lines = []
-        for line in lines:
-            # Remove inline comments
-            if '#' in line:
-                line = line[:line.find('#')]
-            line = line.strip()
-            if line:  # Only add non-empty lines
-                clean_lines.append(line)
+        """
+        Parse invariant specification string into structured form.
         
-        spec_str_clean = '\n'.join(clean_lines)
+        Results are memoized in a bounded LRU keyed by a hash of the spec
+        text; callers receive their own copy.
+        """
+        key = hashlib.sha256(spec_str.encode('utf-8')).digest()
+        result = _PARSE_CACHE.get(key)
+        if result is None:
+            result = InvariantDSL._parse_uncached(spec_str)
+            _PARSE_CACHE.put(key, result)
+        return dict(result, temporal_properties=list(result['temporal_properties']))
+
+    @staticmethod
+    def parse_invariants(spec_strs: Iterable[str]) -> List[Dict[str, Any]]:
+        """Parse a library of invariant specifications, in order."""
+        return [InvariantDSL.parse_invariant(spec_str) for spec_str in spec_strs]
+
+    @staticmethod
+    def parse_document(text: str) -> List[InvariantDecl]:
+        """
+        Parse a document containing any number of invariant blocks.
+        
+        The document is tokenized once and parsed by recursive descent, so
+        cost is linear in its size. Formulas become typed ASTs carrying
+        source offsets; errors report line and column.
+        """
+        return _DocumentParser(text).parse_document()
+
+    @staticmethod
+    def clear_cache() -> None:
+        """Drop all memoized parse results."""
+        _PARSE_CACHE.clear()
+
+    @staticmethod
+    def _parse_uncached(spec_str: str) -> Dict[str, Any]:
+        # Remove comments and normalize whitespace
+        lines = _COMMENT_RE.sub('', spec_str).split('\n')
+        spec_str_clean = '\n'.join(line for line in map(str.strip, lines) if line)
         
         # Extract invariant name
-        invariant_match = re.search(r'invariant\s+(\w+)', spec_str_clean)
+        invariant_match = _NAME_RE.search(spec_str_clean)
         if not invariant_match:
             raise ValueError("Invalid invariant specification format: missing invariant name")
             
@@ -56,10 +269,8 @@ class InvariantDSL:
         
         # Extract fields individually to avoid regex capture issues
         fields = {}
-        for field_name in ['precondition', 'postcondition', 'temporal_properties']:
-            # Pattern that properly handles closing braces and field boundaries
-            pattern = rf'{field_name}:\s*(.*?)(?=\s*(?:precondition|postcondition|temporal_properties|}})\s*|$)'
-            match = re.search(pattern, spec_str_clean, re.DOTALL)
+        for field_name, pattern in _FIELD_PATTERNS.items():
+            match = pattern.search(spec_str_clean)
             if match:
                 value = match.group(1).strip()
                 # Remove trailing brace if present (handles closing brace in same line)
@@ -83,4 +294,4 @@ class InvariantDSL:
             'precondition': fields.get('precondition'),
             'postcondition': fields.get('postcondition'),
             'temporal_properties': fields.get('temporal_properties', [])
-        }
\ No newline at end of file
+        }
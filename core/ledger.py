@@ -0,0 +1,175 @@
+"""
+Cost-ledger analytics for FAK.
+
+``LedgerAnalytics`` reads a ledger's entries once into a float array and
+answers economic questions from precomputed aggregates instead of
+rescanning entries: exact totals (``math.fsum``), per-field group totals,
+compensated prefix sums for windowed budgets, and first-violation
+searches done with C-level ``map`` over the array. Analytics are cached
+per ledger ID.
+
+``check_economic_invariance`` applies the ECONOMIC_INVARIANCE checks:
+    ledger_finite        ``total_cost`` and every entry are finite numbers
+    ledger_total         entries sum to ``total_cost``
+    ledger_monotonic     no negative entry, so cumulative spend never decreases
+    ledger_budget        total within ``metadata["budget"]``
+    ledger_window_budget no ``metadata["window_budget"]["size"]`` consecutive
+                         entries cost more than its ``"limit"``
+    ledger_group_budget  per-group totals within ``metadata["group_budgets"]``,
+                         e.g. {"agent": {"agent_1": 10.0}}
+Budget checks only run when the ledger metadata declares them.
+"""
+
+import math
+import operator
+from array import array
+from dataclasses import dataclass
+from itertools import islice, repeat
+from typing import Any, Dict, List, Optional, Tuple
+
+from .cache import LRUCache
+
+COST_FIELD = "cost"
+
+# Relative tolerance for comparing float sums
+_TOLERANCE = 1e-9
+
+
+def _within(actual: float, limit: float) -> bool:
+    return actual <= limit + _TOLERANCE * max(1.0, abs(limit))
+
+
+class LedgerAnalytics:
+    """Precomputed aggregates over ledger entries."""
+
+    def __init__(self, entries: List[Dict[str, Any]]):
+        costs = []
+        for i, entry in enumerate(entries):
+            cost = entry.get(COST_FIELD, 0.0)
+            if isinstance(cost, bool) or not isinstance(cost, (int, float)):
+                raise ValueError(f"Ledger entry {i} has non-numeric cost: {cost!r}")
+            costs.append(cost)
+        self.entries = entries
+        self.costs = array('d', costs)
+        # NaN and infinite costs would poison every aggregate
+        self.first_nonfinite = bytes(map(math.isfinite, self.costs)).find(0)
+        self.total = math.fsum(costs) if self.first_nonfinite < 0 else math.nan
+        self._prefix: Optional[array] = None
+        self._groups: Dict[str, Dict[Any, float]] = {}
+        self._windows: Dict[int, Tuple[float, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.costs)
+
+    def prefix_sums(self) -> array:
+        """``prefix[i]`` is the cost of the first ``i`` entries (Neumaier-compensated)."""
+        if self._prefix is None:
+            prefix = array('d', [0.0])
+            total = 0.0
+            compensation = 0.0
+            for cost in self.costs:
+                t = total + cost
+                if abs(total) >= abs(cost):
+                    compensation += (total - t) + cost
+                else:
+                    compensation += (cost - t) + total
+                total = t
+                prefix.append(total + compensation)
+            self._prefix = prefix
+        return self._prefix
+
+    def window_sum(self, start: int, end: int) -> float:
+        """Cost of entries ``start`` to ``end - 1``."""
+        prefix = self.prefix_sums()
+        return prefix[end] - prefix[start]
+
+    def window_max(self, size: int) -> Tuple[float, int]:
+        """Largest cost of ``size`` consecutive entries, and where that window starts."""
+        if size < 1:
+            raise ValueError("Ledger window size must be positive")
+        result = self._windows.get(size)
+        if result is None:
+            prefix = self.prefix_sums()
+            if size >= len(self.costs):
+                result = (prefix[-1], 0)
+            else:
+                sums = list(map(operator.sub, islice(prefix, size, None), prefix))
+                best = max(sums)
+                result = (best, sums.index(best))
+            self._windows[size] = result
+        return result
+
+    def group_totals(self, field: str) -> Dict[Any, float]:
+        """Exact cost per value of ``field``; entries without it group under None."""
+        totals = self._groups.get(field)
+        if totals is None:
+            groups: Dict[Any, List[float]] = {}
+            for entry, cost in zip(self.entries, self.costs):
+                groups.setdefault(entry.get(field), []).append(cost)
+            totals = self._groups[field] = {key: math.fsum(values) for key, values in groups.items()}
+        return totals
+
+    def first_negative(self) -> int:
+        """Index of the first negative entry, or -1."""
+        return bytes(map(operator.lt, self.costs, repeat(0.0))).find(1)
+
+
+# Ledger ID -> LedgerAnalytics
+_ANALYTICS = LRUCache(64)
+
+
+def ledger_analytics(ledger: Any) -> LedgerAnalytics:
+    """Analytics for a ``CostLedger``, cached by ledger ID."""
+    analytics = _ANALYTICS.get(ledger.id)
+    if analytics is None:
+        analytics = LedgerAnalytics(ledger.entries)
+        _ANALYTICS.put(ledger.id, analytics)
+    return analytics
+
+
+@dataclass
+class LedgerViolation:
+    """A failed economic check."""
+    clause: str
+    details: Dict[str, Any]
+
+
+def check_economic_invariance(ledger: Any) -> Optional[LedgerViolation]:
+    """Run the economic checks in order and return the first failure."""
+    analytics = ledger_analytics(ledger)
+    # NaN compares false with everything, so the checks below would pass it
+    if not math.isfinite(ledger.total_cost):
+        return LedgerViolation("ledger_finite", {"field": "total_cost", "actual": repr(ledger.total_cost)})
+    if analytics.first_nonfinite >= 0:
+        return LedgerViolation("ledger_finite", {
+            "entry_index": analytics.first_nonfinite, "actual": repr(analytics.costs[analytics.first_nonfinite]),
+        })
+    if abs(analytics.total - ledger.total_cost) > _TOLERANCE * max(1.0, abs(ledger.total_cost)):
+        return LedgerViolation("ledger_total", {"expected": ledger.total_cost, "actual": analytics.total})
+
+    negative = analytics.first_negative()
+    if negative >= 0:
+        return LedgerViolation("ledger_monotonic", {"entry_index": negative, "actual": analytics.costs[negative]})
+
+    metadata = ledger.metadata
+    budget = metadata.get("budget")
+    if budget is not None and not _within(analytics.total, budget):
+        return LedgerViolation("ledger_budget", {"expected": budget, "actual": analytics.total})
+
+    window = metadata.get("window_budget")
+    if window is not None:
+        worst, start = analytics.window_max(window["size"])
+        if not _within(worst, window["limit"]):
+            return LedgerViolation("ledger_window_budget", {
+                "expected": window["limit"], "actual": worst, "entry_index": start, "size": window["size"],
+            })
+
+    for field, limits in sorted((metadata.get("group_budgets") or {}).items()):
+        totals = analytics.group_totals(field)
+        for key, limit in sorted(limits.items()):
+            actual = totals.get(key, 0.0)
+            if not _within(actual, limit):
+                return LedgerViolation("ledger_group_budget", {
+                    "field": field, "group": key, "expected": limit, "actual": actual,
+                })
+    return None
@@ -0,0 +1,239 @@
+"""
+Merkle-tree hashing for FAK.
+
+Large artifact lists (``ExecutionTrace.steps``, ``CostLedger.entries``) are
+split into fixed-size chunks. Each chunk's canonical JSON is hashed into a
+leaf and leaves are combined pairwise into a root, so:
+
+- leaves can be hashed in parallel across processes,
+- changing one item only rehashes its chunk and the path to the root,
+- a slice can be checked against the root with an inclusion proof.
+
+An inclusion proof is checked against the tree's *summary* (root, chunk
+size and item count), the value ``merkle_content_hash`` commits to. The
+chunk geometry always comes from the summary, never from the proof.
+
+Leaves and interior nodes use distinct prefixes (0x00 / 0x01) so a leaf
+can never be confused with a node. An unpaired node is promoted to the
+next level unchanged.
+"""
+
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, fields
+from typing import Any, Dict, List, Optional, Sequence
+
+from .types import ExecutionTrace, CostLedger, base_type, compute_content_hash, update_canonical_hash
+
+DEFAULT_CHUNK_SIZE = 1024
+
+_LEAF_PREFIX = b'\x00'
+_NODE_PREFIX = b'\x01'
+
+
+def hash_leaf(items: Sequence[Any]) -> bytes:
+    """Hash one chunk of items."""
+    digest = hashlib.sha256(_LEAF_PREFIX)
+    update_canonical_hash(digest, list(items))
+    return digest.digest()
+
+
+def hash_node(left: bytes, right: bytes) -> bytes:
+    """Hash two child digests into their parent."""
+    return hashlib.sha256(_NODE_PREFIX + left + right).digest()
+
+
+def _next_level(level: List[bytes]) -> List[bytes]:
+    parents = [hash_node(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+    if len(level) % 2:
+        parents.append(level[-1])
+    return parents
+
+
+def _path_indices(leaf_index: int, leaf_count: int):
+    """Yield (level, sibling index or None) from a leaf up to the root."""
+    index = leaf_index
+    size = leaf_count
+    level = 0
+    while size > 1:
+        if index % 2:
+            yield level, index - 1
+        elif index + 1 < size:
+            yield level, index + 1
+        else:
+            yield level, None
+        index //= 2
+        size = (size + 1) // 2
+        level += 1
+
+
+@dataclass
+class MerkleProof:
+    """Inclusion proof for one chunk of items."""
+    leaf_index: int
+    leaf_count: int
+    chunk_size: int
+    siblings: List[str]  # hex digests, leaf level first; promoted levels are skipped
+
+    @property
+    def start(self) -> int:
+        """Index of the first item covered by the proven chunk."""
+        return self.leaf_index * self.chunk_size
+
+
+class MerkleTree:
+    """Merkle tree over fixed-size chunks of a list."""
+
+    def __init__(self, levels: List[List[bytes]], chunk_size: int, item_count: int):
+        self.levels = levels
+        self.chunk_size = chunk_size
+        self.item_count = item_count
+
+    @classmethod
+    def build(
+        cls,
+        items: Sequence[Any],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_workers: Optional[int] = None
+    ) -> "MerkleTree":
+        """
+        Build a tree over ``items``.
+
+        With ``max_workers`` the leaves are hashed in a process pool.
+        """
+        if chunk_size < 1:
+            raise ValueError("Merkle chunk size must be positive")
+        chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+        if max_workers and len(chunks) > 1:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                leaves = list(executor.map(hash_leaf, chunks, chunksize=max(1, len(chunks) // (4 * max_workers))))
+        else:
+            leaves = [hash_leaf(chunk) for chunk in chunks]
+        levels = [leaves]
+        while len(levels[-1]) > 1:
+            levels.append(_next_level(levels[-1]))
+        return cls(levels, chunk_size, len(items))
+
+    @property
+    def leaf_count(self) -> int:
+        return len(self.levels[0])
+
+    @property
+    def summary(self) -> Dict[str, Any]:
+        """Root, chunk size and item count; what a content hash commits to."""
+        return {"merkle_root": self.root, "chunk_size": self.chunk_size, "count": self.item_count}
+
+    @property
+    def root(self) -> str:
+        """Hex root digest; the empty tree hashes to SHA-256 of nothing."""
+        if not self.levels[0]:
+            return hashlib.sha256().hexdigest()
+        return self.levels[-1][0].hex()
+
+    def leaf_for(self, item_index: int) -> int:
+        """Leaf holding the given item index."""
+        if not 0 <= item_index < self.item_count:
+            raise IndexError(f"Item index {item_index} out of range")
+        return item_index // self.chunk_size
+
+    def prove(self, item_index: int) -> MerkleProof:
+        """Inclusion proof for the chunk holding ``item_index``."""
+        leaf_index = self.leaf_for(item_index)
+        siblings = [
+            self.levels[level][sibling].hex()
+            for level, sibling in _path_indices(leaf_index, self.leaf_count)
+            if sibling is not None
+        ]
+        return MerkleProof(leaf_index, self.leaf_count, self.chunk_size, siblings)
+
+    def update_chunk(self, leaf_index: int, items: Sequence[Any]) -> None:
+        """Replace one chunk's contents, rehashing only its path to the root."""
+        if not 0 <= leaf_index < self.leaf_count:
+            raise IndexError(f"Leaf index {leaf_index} out of range")
+        self.levels[0][leaf_index] = hash_leaf(items)
+        index = leaf_index
+        for level in range(len(self.levels) - 1):
+            nodes = self.levels[level]
+            parent = index // 2
+            left = parent * 2
+            if left + 1 < len(nodes):
+                self.levels[level + 1][parent] = hash_node(nodes[left], nodes[left + 1])
+            else:
+                self.levels[level + 1][parent] = nodes[left]
+            index = parent
+
+
+def chunk_bounds(summary: Dict[str, Any], leaf_index: int) -> Optional[range]:
+    """Item indices covered by a leaf of the summarized tree, or None if out of range."""
+    try:
+        chunk_size = summary["chunk_size"]
+        count = summary["count"]
+    except (KeyError, TypeError):
+        return None
+    if type(chunk_size) is not int or type(count) is not int or chunk_size < 1 or count < 0:
+        return None
+    start = leaf_index * chunk_size
+    if not 0 <= start < count:
+        return None
+    return range(start, min(start + chunk_size, count))
+
+
+def verify_inclusion(summary: Dict[str, Any], items: Sequence[Any], proof: MerkleProof) -> bool:
+    """
+    Check that ``items`` is the chunk at ``proof.leaf_index`` of the tree
+    described by ``summary`` (see ``MerkleTree.summary``).
+
+    Every chunk but the last must hold exactly ``chunk_size`` items; a proof
+    whose chunk size or leaf count disagrees with the summary is rejected.
+    """
+    bounds = chunk_bounds(summary, proof.leaf_index)
+    if bounds is None or len(items) != len(bounds):
+        return False
+    leaf_count = -(-summary["count"] // summary["chunk_size"])
+    if proof.leaf_count != leaf_count or proof.chunk_size != summary["chunk_size"]:
+        return False
+    node = hash_leaf(items)
+    siblings = iter(proof.siblings)
+    try:
+        index = proof.leaf_index
+        for _, sibling_index in _path_indices(proof.leaf_index, leaf_count):
+            if sibling_index is not None:
+                sibling = bytes.fromhex(next(siblings))
+                node = hash_node(sibling, node) if index % 2 else hash_node(node, sibling)
+            index //= 2
+    except (StopIteration, ValueError):
+        return False
+    if next(siblings, None) is not None:
+        return False
+    return node.hex() == summary.get("merkle_root")
+
+
+def _merkle_items_field(artifact: Any) -> str:
+    kind = base_type(artifact)
+    if issubclass(kind, ExecutionTrace):
+        return 'steps'
+    if issubclass(kind, CostLedger):
+        return 'entries'
+    raise TypeError(f"Merkle hashing is not supported for {type(artifact).__name__}")
+
+
+def build_artifact_tree(
+    artifact: Any,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_workers: Optional[int] = None
+) -> MerkleTree:
+    """Merkle tree over a trace's steps or a ledger's entries."""
+    return MerkleTree.build(getattr(artifact, _merkle_items_field(artifact)), chunk_size, max_workers)
+
+
+def merkle_content_hash(artifact: Any, tree: MerkleTree) -> str:
+    """
+    Content hash of a trace or ledger in Merkle mode.
+
+    The item list is replaced by its Merkle summary (root, chunk size and
+    item count); all other fields are hashed canonically as usual.
+    """
+    items_field = _merkle_items_field(artifact)
+    content = {f.name: getattr(artifact, f.name) for f in fields(artifact)}
+    content[items_field] = tree.summary
+    return compute_content_hash(content)
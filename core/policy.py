@@ -0,0 +1,183 @@
+"""
+Policy decision engine for FAK.
+
+``PolicyIR.ast`` is an ordered rule list; the first rule whose condition
+holds decides a step:
+
+    {
+        "rules": [
+            {"when": "action == \\"delete\\"", "decision": "deny"},
+            {"when": {"field": "resource.public", "op": "==", "value": true},
+             "decision": "allow"}
+        ],
+        "default": "deny"
+    }
+
+Conditions are state formulas in the invariant DSL, or the equivalent
+nested dicts: ``{"field", "op", "value"}`` comparisons combined with
+``{"all": [...]}``, ``{"any": [...]}`` and ``{"not": ...}`` (``true`` and
+``false`` are allowed too).
+
+``CompiledPolicy`` compiles the rules once per policy ID into predicates
+over a step's *shape*: the tuple of the fields the rules read. Decisions
+are memoized per distinct shape, so replaying a long trace costs one tuple
+build and one dict lookup per step once its shapes have been seen.
+
+``PolicyCheck`` proves SEMANTIC_PRESERVATION: every step that records a
+``decision`` must record the one the policy makes.
+"""
+
+from operator import itemgetter
+from typing import Any, Callable, Dict, List, Tuple
+
+from .cache import LRUCache
+from .temporal import (
+    AlwaysMonitor, And, Compare, CompiledFormula, Const, Field, Not, Or, TEMPORAL_NODES,
+    compile_state, field_paths, parse_formula, resolve_field,
+)
+
+# Step field recording the decision enforcement actually made
+DECISION_FIELD = ("decision",)
+
+DEFAULT_DECISION = "deny"
+
+# Distinct step shapes remembered per policy
+_MAX_SHAPES = 65536
+
+_COMPARISON_OPS = {'==', '!=', '<', '<=', '>', '>='}
+
+
+def _field_path(value: Any) -> Tuple[str, ...]:
+    if isinstance(value, str) and value:
+        return tuple(value.split('.'))
+    if isinstance(value, (list, tuple)) and value and all(isinstance(part, str) for part in value):
+        return tuple(value)
+    raise ValueError(f"Invalid policy field: {value!r}")
+
+
+def condition_ast(condition: Any):
+    """Convert a rule condition (formula text or dict) to a state-formula AST."""
+    if isinstance(condition, bool):
+        return Const(condition)
+    if isinstance(condition, str):
+        node = parse_formula(condition)
+        if isinstance(node, TEMPORAL_NODES):
+            raise ValueError(f"Policy condition must be a state formula: {condition!r}")
+        return node
+    if isinstance(condition, dict):
+        if "all" in condition:
+            return And(tuple(condition_ast(c) for c in condition["all"]))
+        if "any" in condition:
+            return Or(tuple(condition_ast(c) for c in condition["any"]))
+        if "not" in condition:
+            return Not(condition_ast(condition["not"]))
+        if "field" in condition:
+            op = condition.get("op", "==")
+            if op not in _COMPARISON_OPS:
+                raise ValueError(f"Unknown policy comparison: {op!r}")
+            return Compare(op, Field(_field_path(condition["field"])), Const(condition.get("value")))
+    raise ValueError(f"Invalid policy condition: {condition!r}")
+
+
+class CompiledPolicy:
+    """Decision procedure for one policy AST."""
+
+    def __init__(self, ast: Dict[str, Any]):
+        rules = ast.get("rules", [])
+        if not isinstance(rules, list):
+            raise ValueError("Policy rules must be a list")
+        conditions = []
+        self.decisions: List[Any] = []
+        for i, rule in enumerate(rules):
+            if not isinstance(rule, dict) or "decision" not in rule:
+                raise ValueError(f"Policy rule {i} must be a dict with a decision")
+            conditions.append(condition_ast(rule.get("when", True)))
+            self.decisions.append(rule["decision"])
+        self.default = ast.get("default", DEFAULT_DECISION)
+
+        self.fields: List[Tuple[str, ...]] = []
+        for node in conditions:
+            for path in field_paths(node):
+                if path not in self.fields:
+                    self.fields.append(path)
+        # Rules read the shape tuple by slot
+        slots = {path: i for i, path in enumerate(self.fields)}
+        self._rules = [compile_state(node, lambda path: itemgetter(slots[path])) for node in conditions]
+        self._memo: Dict[tuple, Any] = {}
+
+    def decide_shape(self, shape: tuple) -> Any:
+        """Decision for a step whose policy fields have the values in ``shape``."""
+        try:
+            return self._memo[shape]
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable field values are decided without memoization
+            return self._evaluate(shape)
+        decision = self._evaluate(shape)
+        if len(self._memo) < _MAX_SHAPES:
+            self._memo[shape] = decision
+        return decision
+
+    def _evaluate(self, shape: tuple) -> Any:
+        for rule, decision in zip(self._rules, self.decisions):
+            if rule(shape):
+                return decision
+        return self.default
+
+    def shape_getter(self, resolve: Callable = resolve_field) -> Callable[[Any], tuple]:
+        """Function building a step's shape tuple, with fields read through ``resolve``."""
+        getters = [resolve(path) for path in self.fields]
+        if not getters:
+            return lambda row: ()
+        if len(getters) == 1:
+            get = getters[0]
+            return lambda row: (get(row),)
+        return lambda row: tuple([get(row) for get in getters])
+
+    def decide(self, step: Any) -> Any:
+        return self.decide_shape(self.shape_getter()(step))
+
+    @property
+    def shapes(self) -> int:
+        """Number of memoized shapes."""
+        return len(self._memo)
+
+
+# Policy ID -> CompiledPolicy
+_POLICIES = LRUCache(256)
+
+
+def compiled_policy(policy_ir: Any) -> CompiledPolicy:
+    """Compiled policy for a ``PolicyIR``, cached by policy ID."""
+    policy = _POLICIES.get(policy_ir.id)
+    if policy is None:
+        policy = CompiledPolicy(policy_ir.ast)
+        _POLICIES.put(policy_ir.id, policy)
+    return policy
+
+
+class PolicyCheck(CompiledFormula):
+    """
+    Semantic-preservation check usable wherever a compiled formula is.
+
+    Behaves like ``always (decision == <policy decision for the step>)``
+    over steps that record a ``decision``; other steps are not constrained.
+    """
+
+    def __init__(self, policy_ir: Any):
+        self.policy = compiled_policy(policy_ir)
+        self.text = f"decisions follow policy {policy_ir.id}"
+        self.ast = None
+        self.fields = [DECISION_FIELD] + [path for path in self.policy.fields if path != DECISION_FIELD]
+        self._default_factory = self.factory(resolve_field)
+
+    def factory(self, resolve):
+        recorded = resolve(DECISION_FIELD)
+        shape = self.policy.shape_getter(resolve)
+        decide = self.policy.decide_shape
+
+        def pred(row):
+            decision = recorded(row)
+            return decision is None or decision == decide(shape(row))
+        return lambda: AlwaysMonitor(pred)
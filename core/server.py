@@ -0,0 +1,382 @@
+"""
+Local verification daemon for FAK.
+
+``VerificationServer`` keeps one verifier alive between requests, so the
+formula compile cache, the invariant parse cache and the verdict cache stay
+warm. Decoded artifacts are swapped for frozen copies kept from earlier
+requests when their content is equal, so their content hashes are computed
+once. It listens on a Unix socket or a localhost TCP port and speaks
+newline-delimited JSON; each request line is answered with one response
+line carrying the same ``id``, and requests on a connection may be
+pipelined. A line longer than ``max_line_bytes`` is answered with an error
+and the connection is closed.
+
+Requests:
+    {"id": 1, "op": "verify_bundle", "bundle": <encoded ProofBundle>}
+    {"id": 2, "op": "stats"}
+    {"id": 3, "op": "ping"}
+
+Bundles use the tagged form produced by ``codec.encode_object``.
+Identical bundles verified concurrently share one check, and queued
+bundles are verified in batches (up to ``max_batch_witnesses`` witnesses
+per executor job) to amortize the hand-off to the worker thread.
+
+Start it with ``python -m fak.core serve --socket PATH`` (or ``--port N``).
+"""
+
+import asyncio
+import hashlib
+import json
+import socket
+import time
+from collections import deque
+from dataclasses import fields
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Deque, Dict, List, Optional
+
+from .cache import LRUCache
+from .codec import decode_payload, encode_object
+from .types import ProofBundle, freeze_artifact
+from .verdicts import MemoryVerdictCache, VerdictCache
+from .verifier import Verifier
+
+# Latencies kept for the percentiles reported by ``stats``
+_LATENCY_WINDOW = 1024
+
+# Frozen artifacts kept for reuse across requests
+_WARM_ARTIFACTS = 1024
+
+# The witness fields holding artifacts
+_ARTIFACT_FIELDS = ('execution_trace', 'capability_manifest', 'cost_ledger', 'policy_ir')
+
+
+def _same_content(kept: Any, artifact: Any) -> bool:
+    """Whether a kept frozen artifact has the fields of a decoded one."""
+    return isinstance(kept, type(artifact)) and all(
+        getattr(kept, f.name) == getattr(artifact, f.name) for f in fields(artifact)
+    )
+
+
+class VerificationServer:
+    """
+    Verification daemon state: warm verifier, coalescing and batching.
+
+    ``handle_request`` processes one decoded request and is independent of
+    the transport; ``start_unix`` and ``start_tcp`` expose it on a socket.
+    """
+
+    def __init__(
+        self,
+        verifier: Optional[Verifier] = None,
+        verdict_cache: Optional[VerdictCache] = None,
+        executor: Optional[Executor] = None,
+        batch_window: float = 0.002,
+        max_batch_witnesses: int = 64,
+        max_line_bytes: int = 16 << 20
+    ):
+        if verifier is None:
+            verifier = Verifier(verdict_cache=verdict_cache if verdict_cache is not None else MemoryVerdictCache())
+        self.verifier = verifier
+        self.executor = executor if executor is not None else ThreadPoolExecutor(max_workers=1)
+        self.batch_window = batch_window
+        self.max_batch_witnesses = max_batch_witnesses
+        self.max_line_bytes = max_line_bytes
+        # (type name, declared ID) -> frozen artifact with a memoized hash
+        self._artifacts = LRUCache(_WARM_ARTIFACTS)
+        self.artifact_hits = 0
+        self.artifact_misses = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._batcher: Optional[asyncio.Task] = None
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._latencies: Deque[float] = deque(maxlen=_LATENCY_WINDOW)
+        self.started_at = time.time()
+        self.requests = 0
+        self.completed = 0
+        self.coalesced = 0
+        self.batches = 0
+        self.errors = 0
+
+    # ------------------------------------------------------------------
+    # Request handling
+    # ------------------------------------------------------------------
+
+    async def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Answer one request; failures are reported in the response."""
+        response: Dict[str, Any] = {"id": request.get("id") if isinstance(request, dict) else None}
+        try:
+            if not isinstance(request, dict):
+                raise ValueError("Request must be a JSON object")
+            op = request.get("op")
+            if op == "verify_bundle":
+                response["result"] = await self.verify_bundle_payload(request.get("bundle"))
+            elif op == "stats":
+                response["result"] = self.stats()
+            elif op == "ping":
+                response["result"] = "pong"
+            else:
+                raise ValueError(f"Unknown op: {op!r}")
+            response["ok"] = True
+        except Exception as e:
+            self.errors += 1
+            response["ok"] = False
+            response["error"] = str(e)
+        return response
+
+    async def verify_bundle_payload(self, payload: Any) -> Dict[str, Any]:
+        """
+        Verify an encoded bundle.
+
+        Concurrent requests for byte-identical bundles are coalesced onto
+        the first one's result.
+        """
+        started = time.perf_counter()
+        self.requests += 1
+        key = hashlib.sha256(json.dumps(payload, sort_keys=True, separators=(',', ':')).encode()).hexdigest()
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            bundle = decode_payload(payload)
+            if not isinstance(bundle, ProofBundle):
+                raise ValueError("Payload is not a ProofBundle")
+            await self._enqueue(bundle, future)
+            result = await asyncio.shield(future)
+        except Exception as e:
+            # A cancelled caller leaves the future to the batch, so coalesced
+            # waiters still get the result; other errors are shared with them
+            if not future.done():
+                future.set_exception(e)
+                future.exception()  # mark retrieved when nobody else is waiting
+            raise
+        finally:
+            self._inflight.pop(key, None)
+        self.completed += 1
+        self._latencies.append(time.perf_counter() - started)
+        return result
+
+    async def _enqueue(self, bundle: ProofBundle, future: asyncio.Future) -> None:
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        if self._batcher is None or self._batcher.done():
+            self._batcher = asyncio.ensure_future(self._run_batches())
+        await self._queue.put((bundle, future))
+
+    async def _run_batches(self) -> None:
+        loop = asyncio.get_running_loop()
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            witnesses = len(batch[0][0].witnesses)
+            if queue.empty() and witnesses < self.max_batch_witnesses and self.batch_window > 0:
+                # Give concurrent clients a moment to join this batch
+                await asyncio.sleep(self.batch_window)
+            while witnesses < self.max_batch_witnesses and not queue.empty():
+                item = queue.get_nowait()
+                batch.append(item)
+                witnesses += len(item[0].witnesses)
+            self.batches += 1
+            bundles = [bundle for bundle, _ in batch]
+            try:
+                results = await loop.run_in_executor(self.executor, self._verify_batch, bundles)
+            except Exception as e:
+                results = [e] * len(batch)
+            for (_, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    def _warm_artifacts(self, bundle: ProofBundle) -> None:
+        """
+        Point the bundle's witnesses at frozen artifacts from earlier requests.
+
+        A kept artifact is reused only when its content equals the decoded
+        one; the declared ID just selects the candidate. Frozen artifacts
+        memoize their content hash, so it is computed once per artifact.
+        """
+        for witness in bundle.witnesses:
+            for name in _ARTIFACT_FIELDS:
+                artifact = getattr(witness, name)
+                key = (type(artifact).__name__, artifact.id)
+                kept = self._artifacts.get(key)
+                if kept is not None and _same_content(kept, artifact):
+                    self.artifact_hits += 1
+                else:
+                    self.artifact_misses += 1
+                    try:
+                        kept = freeze_artifact(artifact)
+                    except TypeError:
+                        # Slotted variants have no frozen counterpart here
+                        continue
+                    self._artifacts.put(key, kept)
+                setattr(witness, name, kept)
+
+    def _verify_batch(self, bundles: List[ProofBundle]) -> List[Any]:
+        results: List[Any] = []
+        for bundle in bundles:
+            try:
+                self._warm_artifacts(bundle)
+                results.append(self.verifier.verify_bundle(bundle))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, throughput, latency percentiles and cache counters."""
+        latencies = sorted(self._latencies)
+
+        def percentile(q: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+
+        stats = {
+            "uptime_seconds": time.time() - self.started_at,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "inflight": len(self._inflight),
+            "requests": self.requests,
+            "completed": self.completed,
+            "coalesced": self.coalesced,
+            "batches": self.batches,
+            "errors": self.errors,
+            "latency_seconds": {
+                "p50": percentile(0.5),
+                "p95": percentile(0.95),
+                "max": latencies[-1] if latencies else None,
+            },
+        }
+        stats["artifact_cache"] = {"hits": self.artifact_hits, "misses": self.artifact_misses}
+        cache = self.verifier.verdict_cache
+        if cache is not None and hasattr(cache, 'hits'):
+            stats["verdict_cache"] = {"hits": cache.hits, "misses": cache.misses}
+        return stats
+
+    # ------------------------------------------------------------------
+    # Transport
+    # ------------------------------------------------------------------
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        write_lock = asyncio.Lock()
+        tasks = set()
+
+        async def answer(line: bytes) -> None:
+            try:
+                request = json.loads(line)
+            except ValueError as e:
+                self.errors += 1
+                response = {"id": None, "ok": False, "error": f"Invalid JSON: {e}"}
+            else:
+                response = await self.handle_request(request)
+            async with write_lock:
+                writer.write(json.dumps(response).encode() + b'\n')
+                await writer.drain()
+
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # The rest of the oversized line is still unread, so the
+                    # connection cannot be resynchronized
+                    self.errors += 1
+                    response = {"id": None, "ok": False,
+                                "error": f"Request line exceeds {self.max_line_bytes} bytes"}
+                    async with write_lock:
+                        writer.write(json.dumps(response).encode() + b'\n')
+                        await writer.drain()
+                    break
+                if not line:
+                    break
+                if line.strip():
+                    task = asyncio.ensure_future(answer(line))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            writer.close()
+
+    async def start_unix(self, path: str) -> asyncio.AbstractServer:
+        return await asyncio.start_unix_server(self._handle_connection, path=path, limit=self.max_line_bytes)
+
+    async def start_tcp(self, host: str = '127.0.0.1', port: int = 0) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self._handle_connection, host=host, port=port, limit=self.max_line_bytes)
+
+    def close(self) -> None:
+        if self._batcher is not None:
+            self._batcher.cancel()
+        self.executor.shutdown(wait=False)
+
+
+def serve(socket_path: Optional[str] = None, host: str = '127.0.0.1', port: Optional[int] = None,
+          server: Optional[VerificationServer] = None) -> None:
+    """Run a verification daemon until interrupted."""
+    if (socket_path is None) == (port is None):
+        raise ValueError("Pass exactly one of socket_path or port")
+    server = server if server is not None else VerificationServer()
+
+    async def main():
+        if socket_path is not None:
+            listener = await server.start_unix(socket_path)
+        else:
+            listener = await server.start_tcp(host, port)
+        async with listener:
+            await listener.serve_forever()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+class VerificationClient:
+    """Blocking client for a running daemon; one request at a time."""
+
+    def __init__(self, socket_path: Optional[str] = None, host: str = '127.0.0.1', port: Optional[int] = None):
+        if (socket_path is None) == (port is None):
+            raise ValueError("Pass exactly one of socket_path or port")
+        if socket_path is not None:
+            self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._sock.connect(socket_path)
+        else:
+            self._sock = socket.create_connection((host, port))
+        self._file = self._sock.makefile('rwb')
+        self._next_id = 0
+
+    def request(self, op: str, **fields: Any) -> Any:
+        """Send one request and return its result; failures raise ValueError."""
+        self._next_id += 1
+        message = dict(fields, id=self._next_id, op=op)
+        self._file.write(json.dumps(message).encode() + b'\n')
+        self._file.flush()
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("Verification server closed the connection")
+        response = json.loads(line)
+        if not response.get("ok"):
+            raise ValueError(response.get("error"))
+        return response["result"]
+
+    def verify_bundle(self, bundle: ProofBundle) -> Dict[str, Any]:
+        return self.request("verify_bundle", bundle=json.loads(encode_object(bundle)))
+
+    def stats(self) -> Dict[str, Any]:
+        return self.request("stats")
+
+    def close(self) -> None:
+        self._file.close()
+        self._sock.close()
+
+    def __enter__(self) -> "VerificationClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -0,0 +1,212 @@
+"""
+Storage backends for the artifact manager.
+
+A backend maps content-addressable IDs to artifacts. ``MemoryBackend``
+keeps them in a dict; ``FilesystemBackend`` persists them so several
+processes can share one store and restart warm.
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Any, BinaryIO, Dict, Iterator, Optional, Tuple
+
+from .codec import encode_object, decode_object
+
+
+@contextmanager
+def atomic_writer(path: str) -> Iterator[BinaryIO]:
+    """
+    Open a temporary file that replaces ``path`` when the block exits.
+
+    The file is fsynced before the ``os.replace``; on error it is removed
+    and ``path`` is left untouched.
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def write_atomic(path: str, data: bytes) -> None:
+    """Write a file through a temporary file and ``os.replace``."""
+    with atomic_writer(path) as f:
+        f.write(data)
+
+
+class ArtifactBackend:
+    """Interface for artifact storage backends."""
+
+    def put(self, artifact_id: str, artifact: Any) -> None:
+        """Store an artifact under its ID. Storing an existing ID is a no-op."""
+        raise NotImplementedError
+
+    def get(self, artifact_id: str) -> Any:
+        """Load an artifact; raises KeyError if it is not stored."""
+        raise NotImplementedError
+
+    def contains(self, artifact_id: str) -> bool:
+        raise NotImplementedError
+
+
+class MemoryBackend(ArtifactBackend):
+    """In-process dict backend."""
+
+    def __init__(self, artifacts: Optional[Dict[str, Any]] = None):
+        self.artifacts = artifacts if artifacts is not None else {}
+
+    def put(self, artifact_id: str, artifact: Any) -> None:
+        self.artifacts[artifact_id] = artifact
+
+    def get(self, artifact_id: str) -> Any:
+        return self.artifacts[artifact_id]
+
+    def contains(self, artifact_id: str) -> bool:
+        return artifact_id in self.artifacts
+
+
+class FilesystemBackend(ArtifactBackend):
+    """
+    Content-addressable store on the local filesystem.
+
+    Layout under ``root``:
+        objects/ab/cd/<id>   loose objects, one file each
+        packs/pack.dat       append-only pack of concatenated objects
+        packs/pack.idx       append-only index lines "<id> <offset> <length>"
+
+    New artifacts are written as loose objects through a temporary file and
+    ``os.replace``, so readers never observe partial writes and concurrent
+    writers of the same ID are harmless. ``repack`` appends loose objects to
+    the pack and removes them; it should run in one process at a time.
+    Objects are stored in the tagged canonical JSON form from ``codec``.
+
+    Reads take no lock: the pack index is replaced, never mutated, when
+    new index lines are loaded.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self.objects_dir = os.path.join(root, 'objects')
+        self.packs_dir = os.path.join(root, 'packs')
+        self.pack_path = os.path.join(self.packs_dir, 'pack.dat')
+        self.index_path = os.path.join(self.packs_dir, 'pack.idx')
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.packs_dir, exist_ok=True)
+        # (index, bytes of pack.idx it covers); published as one pair
+        self._published: Tuple[Dict[str, Tuple[int, int]], int] = ({}, 0)
+        self._load_index()
+
+    def _object_path(self, artifact_id: str) -> str:
+        if len(artifact_id) < 5 or not artifact_id.isalnum():
+            raise ValueError(f"Invalid artifact ID: {artifact_id!r}")
+        return os.path.join(self.objects_dir, artifact_id[:2], artifact_id[2:4], artifact_id)
+
+    @property
+    def _index(self) -> Dict[str, Tuple[int, int]]:
+        return self._published[0]
+
+    def _load_index(self) -> Dict[str, Tuple[int, int]]:
+        """
+        Read index lines appended since the published index; returns the
+        newest index this call knows of.
+
+        Concurrent loads may race to publish; each builds a complete copy,
+        so readers see an older index at worst and simply reload.
+        """
+        index, size = self._published
+        try:
+            with open(self.index_path, 'rb') as f:
+                f.seek(size)
+                data = f.read()
+        except FileNotFoundError:
+            return index
+        # Only complete lines are consumed; a torn trailing line is retried later
+        end = data.rfind(b'\n') + 1
+        if not end:
+            return index
+        index = dict(index)
+        for line in data[:end].splitlines():
+            parts = line.split()
+            if len(parts) == 3:
+                index[parts[0].decode('ascii')] = (int(parts[1]), int(parts[2]))
+        if self._published[1] < size + end:
+            self._published = (index, size + end)
+        return index
+
+    def put(self, artifact_id: str, artifact: Any) -> None:
+        if self.contains(artifact_id):
+            return
+        write_atomic(self._object_path(artifact_id), encode_object(artifact))
+
+    def _read(self, artifact_id: str) -> Optional[bytes]:
+        try:
+            with open(self._object_path(artifact_id), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            pass
+        location = self._index.get(artifact_id)
+        if location is None:
+            # Another process may have repacked since we loaded the index
+            location = self._load_index().get(artifact_id)
+            if location is None:
+                return None
+        offset, length = location
+        with open(self.pack_path, 'rb') as f:
+            f.seek(offset)
+            return f.read(length)
+
+    def get(self, artifact_id: str) -> Any:
+        data = self._read(artifact_id)
+        if data is None:
+            raise KeyError(artifact_id)
+        return decode_object(data)
+
+    def contains(self, artifact_id: str) -> bool:
+        if artifact_id in self._index or os.path.exists(self._object_path(artifact_id)):
+            return True
+        return artifact_id in self._load_index()
+
+    def repack(self) -> int:
+        """Move loose objects into the pack file; returns the number packed."""
+        index = self._load_index()
+        loose = []
+        for dirpath, _, filenames in os.walk(self.objects_dir):
+            for name in filenames:
+                if not name.startswith('.tmp-'):
+                    loose.append((name, os.path.join(dirpath, name)))
+        if not loose:
+            return 0
+        entries = []
+        with open(self.pack_path, 'ab') as pack:
+            offset = pack.tell()
+            for artifact_id, path in sorted(loose):
+                if artifact_id in index:
+                    continue
+                with open(path, 'rb') as f:
+                    data = f.read()
+                pack.write(data)
+                entries.append((artifact_id, offset, len(data)))
+                offset += len(data)
+            pack.flush()
+            os.fsync(pack.fileno())
+        # The index is appended only after the pack data is durable
+        with open(self.index_path, 'ab') as index:
+            index.write(b''.join(f"{a} {o} {n}\n".encode('ascii') for a, o, n in entries))
+            index.flush()
+            os.fsync(index.fileno())
+        index = self._load_index()
+        for artifact_id, path in loose:
+            if artifact_id in index:
+                os.unlink(path)
+        return len(entries)
@@ -0,0 +1,134 @@
+"""
+Streaming execution traces for FAK.
+
+``TraceStream`` feeds steps to the proof engine one at a time from an
+iterator or a memory-mapped JSONL file, so a trace of any length is
+checked in bounded memory and without ``MAX_TRACE_STEPS``.
+
+The stream is hashed as it is read. Its content hash equals
+``compute_content_hash(ExecutionTrace(id, steps, metadata))`` for the same
+steps: ``steps`` sorts last among the trace fields, so the canonical JSON
+can be produced in order without holding the steps.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from .types import (
+    ExecutionTrace, update_canonical_hash, _CANONICAL_ENCODER, _STREAM_FLUSH_SIZE, _STREAM_MIN_ITEMS,
+)
+
+
+def iter_jsonl(path: str) -> Iterator[Any]:
+    """Yield one decoded JSON value per non-blank line of a file, via mmap."""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            start = 0
+            size = len(data)
+            while start < size:
+                end = data.find(b'\n', start)
+                if end < 0:
+                    end = size
+                line = data[start:end]
+                start = end + 1
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except ValueError as e:
+                        raise ValueError(f"Invalid JSON on trace line ending at byte {end}: {e}")
+
+
+class TraceStream:
+    """
+    Single-pass source of trace steps with incremental content hashing.
+
+    Iterating the stream yields each step once; the content hash and step
+    count are available after the stream is exhausted.
+    """
+
+    def __init__(self, steps: Iterable[Dict[str, Any]], id: str, metadata: Optional[Dict[str, Any]] = None):
+        if not id:
+            raise ValueError("TraceStream must have a valid ID")
+        self.id = id
+        self.metadata = metadata if metadata is not None else {}
+        self._source = iter(steps)
+        self._started = False
+        self._exhausted = False
+        self.step_count = 0
+        self._digest = hashlib.sha256()
+        self._digest.update(('{"id":%s,"metadata":%s,"steps":[' % (
+            _CANONICAL_ENCODER.encode(self.id), _CANONICAL_ENCODER.encode(self.metadata)
+        )).encode('ascii'))
+
+    @classmethod
+    def from_jsonl(cls, path: str, id: str, metadata: Optional[Dict[str, Any]] = None) -> "TraceStream":
+        """Stream steps from a JSONL file, one step object per line."""
+        return cls(iter_jsonl(path), id, metadata)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        if self._started:
+            raise ValueError("TraceStream can only be consumed once")
+        self._started = True
+        digest = self._digest
+        encode = _CANONICAL_ENCODER.encode
+        # Small steps are encoded whole and hashed in blocks; large ones are
+        # streamed into the digest piece by piece
+        pending = []
+        pending_size = 0
+        for step in self._source:
+            if self.step_count:
+                pending.append(',')
+            if type(step) is dict and len(step) < _STREAM_MIN_ITEMS:
+                text = encode(step)
+                pending.append(text)
+                pending_size += len(text)
+                if pending_size >= _STREAM_FLUSH_SIZE:
+                    digest.update(''.join(pending).encode('ascii'))
+                    pending = []
+                    pending_size = 0
+            else:
+                digest.update(''.join(pending).encode('ascii'))
+                pending = []
+                pending_size = 0
+                update_canonical_hash(digest, step)
+            self.step_count += 1
+            yield step
+        pending.append(']}')
+        digest.update(''.join(pending).encode('ascii'))
+        self._exhausted = True
+
+    def drain(self, steps: Optional[Iterator[Dict[str, Any]]] = None) -> None:
+        """Read (and hash) whatever is left of an iteration of the stream."""
+        for _ in steps if steps is not None else self:
+            pass
+
+    @property
+    def exhausted(self) -> bool:
+        return self._exhausted
+
+    @property
+    def content_hash(self) -> str:
+        """Content hash of the equivalent ``ExecutionTrace``."""
+        if not self._exhausted:
+            raise ValueError("TraceStream content hash is only known once the stream is exhausted")
+        return self._digest.hexdigest()
+
+    def summary_trace(self) -> ExecutionTrace:
+        """
+        Step-less stand-in for the streamed trace, for witnesses.
+
+        It keeps the stream's ID (so proof IDs match an in-memory check of
+        the same trace) and records the step count and, once known, the
+        content hash under ``metadata["stream"]``.
+        """
+        metadata = dict(self.metadata)
+        metadata["stream"] = {
+            "step_count": self.step_count,
+            "content_hash": self.content_hash if self._exhausted else None,
+        }
+        return ExecutionTrace(id=self.id, steps=[], metadata=metadata)
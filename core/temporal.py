@@ -0,0 +1,773 @@
+"""
+Temporal formula compiler for FAK.
+
+Formulas are parsed once into a small AST and compiled into predicate
+closures. Monitors built from a compiled formula check a trace in a
+single linear pass.
+
+Supported formulas:
+    always (<state>)
+    eventually (<state>)
+    within N steps (<state>)
+    within N steps (<state> => <state>)
+    <state>
+
+State formulas compare step fields with literals or other fields
+(==, !=, <, <=, >, >=) and combine them with and/or/not/=>.
+Dotted names (e.g. ``args.path``) walk nested step dicts.
+
+Keywords and the literals ``true``, ``false``, ``null`` and ``none`` are
+lowercase; other spellings (``None``, ``True``) are field names. ``step``
+and ``steps`` are keywords only after ``within N``.
+"""
+
+import re
+import operator
+import time
+from itertools import islice
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+from dataclasses import dataclass, field
+
+from .cache import LRUCache
+
+
+# ---------------------------------------------------------------------------
+# AST
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class Field:
+    """Reference to a (possibly nested) step field."""
+    path: Tuple[str, ...]
+    pos: int = field(default=0, compare=False)
+
+
+@dataclass(frozen=True)
+class Const:
+    """Literal value."""
+    value: Any
+    pos: int = field(default=0, compare=False)
+
+
+@dataclass(frozen=True)
+class Compare:
+    """Binary comparison between two operands."""
+    op: str
+    left: Any
+    right: Any
+    pos: int = field(default=0, compare=False)
+
+
+@dataclass(frozen=True)
+class Not:
+    """Logical negation."""
+    operand: Any
+    pos: int = field(default=0, compare=False)
+
+
+@dataclass(frozen=True)
+class And:
+    """Logical conjunction."""
+    operands: Tuple[Any, ...]
+    pos: int = field(default=0, compare=False)
+
+
+@dataclass(frozen=True)
+class Or:
+    """Logical disjunction."""
+    operands: Tuple[Any, ...]
+    pos: int = field(default=0, compare=False)
+
+
+@dataclass(frozen=True)
+class Implies:
+    """Logical implication."""
+    left: Any
+    right: Any
+    pos: int = field(default=0, compare=False)
+
+
+@dataclass(frozen=True)
+class Always:
+    """Body holds at every step."""
+    body: Any
+    pos: int = field(default=0, compare=False)
+
+
+@dataclass(frozen=True)
+class Eventually:
+    """Body holds at some step."""
+    body: Any
+    pos: int = field(default=0, compare=False)
+
+
+@dataclass(frozen=True)
+class Within:
+    """Body holds within a bounded window of steps."""
+    bound: int
+    body: Any
+    pos: int = field(default=0, compare=False)
+
+
+TEMPORAL_NODES = (Always, Eventually, Within)
+
+
+# ---------------------------------------------------------------------------
+# Tokenizer / parser
+# ---------------------------------------------------------------------------
+
+# Also covers the punctuation and comments of invariant documents (see dsl.py)
+_TOKEN_RE = re.compile(r"""
+    (?P<ws>\s+)
+  | (?P<comment>\#[^\n]*)
+  | (?P<number>-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)
+  | (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+  | (?P<op>=>|==|!=|<=|>=|&&|\|\||[<>!(){}\[\]:,])
+  | (?P<name>[A-Za-z_]\w*(?:\.\w+)*)
+""", re.VERBOSE)
+
+# Matched case-sensitively; 'step'/'steps' are names, checked after 'within N'
+_KEYWORDS = {
+    'always', 'eventually', 'within',
+    'and', 'or', 'not', 'true', 'false', 'null', 'none',
+}
+
+_COMPARISONS = {'==', '!=', '<', '<=', '>', '>='}
+
+_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', '\\': '\\', '"': '"', "'": "'"}
+
+
+@dataclass(frozen=True)
+class Token:
+    """Lexical token with its source offset."""
+    kind: str  # "number", "string", "op", "name", "keyword", "eof"
+    text: str
+    pos: int
+
+
+def line_col(text: str, pos: int) -> Tuple[int, int]:
+    """1-based line and column of a source offset."""
+    line = text.count('\n', 0, pos) + 1
+    return line, pos - (text.rfind('\n', 0, pos) + 1) + 1
+
+
+def tokenize(text: str) -> List[Token]:
+    """Split source text into tokens in a single pass; comments are dropped."""
+    tokens = []
+    pos = 0
+    length = len(text)
+    while pos < length:
+        match = _TOKEN_RE.match(text, pos)
+        if not match:
+            raise ValueError(f"Unexpected character {text[pos]!r} at position {pos}")
+        kind = match.lastgroup
+        value = match.group()
+        if kind != 'ws' and kind != 'comment':
+            if kind == 'name' and value in _KEYWORDS:
+                tokens.append(Token('keyword', value, pos))
+            else:
+                tokens.append(Token(kind, value, pos))
+        pos = match.end()
+    tokens.append(Token('eof', '', length))
+    return tokens
+
+
+_QUOTE_ESCAPES = {'\\': '\\\\', '"': '\\"', '\n': '\\n', '\t': '\\t', '\r': '\\r'}
+
+
+def _unquote(literal: str) -> str:
+    body = literal[1:-1]
+    if '\\' not in body:
+        return body
+    return re.sub(r'\\(.)', lambda m: _ESCAPES.get(m.group(1), m.group(1)), body)
+
+
+class FormulaParser:
+    """Recursive-descent parser over a token list."""
+
+    def __init__(self, tokens: List[Token], index: int = 0):
+        self.tokens = tokens
+        self.index = index
+
+    def error(self, message: str, token: Token) -> ValueError:
+        """The error for ``token``; subclasses may locate it differently."""
+        return ValueError(f"{message} at position {token.pos} (found {token.text or 'end of input'!r})")
+
+    def peek(self) -> Token:
+        return self.tokens[self.index]
+
+    def advance(self) -> Token:
+        token = self.tokens[self.index]
+        if token.kind != 'eof':
+            self.index += 1
+        return token
+
+    def accept(self, kind: str, text: Optional[str] = None) -> Optional[Token]:
+        token = self.peek()
+        if token.kind == kind and (text is None or token.text == text):
+            return self.advance()
+        return None
+
+    def expect(self, kind: str, text: Optional[str] = None) -> Token:
+        token = self.accept(kind, text)
+        if token is None:
+            raise self.error(f"Expected {text or kind!r}", self.peek())
+        return token
+
+    def parse_formula(self):
+        """formula := temporal | state"""
+        token = self.peek()
+        if token.kind == 'keyword' and token.text in ('always', 'eventually'):
+            self.advance()
+            body = self._parenthesized()
+            node_type = Always if token.text == 'always' else Eventually
+            return node_type(body, pos=token.pos)
+        if token.kind == 'keyword' and token.text == 'within':
+            self.advance()
+            bound_token = self.expect('number')
+            if not bound_token.text.isdigit() or int(bound_token.text) < 1:
+                raise self.error("Step bound must be a positive integer", bound_token)
+            if not self.accept('name', 'steps'):
+                self.expect('name', 'step')
+            body = self._parenthesized()
+            return Within(int(bound_token.text), body, pos=token.pos)
+        return self.parse_state()
+
+    def _parenthesized(self):
+        self.expect('op', '(')
+        body = self.parse_state()
+        self.expect('op', ')')
+        return body
+
+    def parse_state(self):
+        """state := disjunction ('=>' state)?"""
+        left = self._disjunction()
+        token = self.accept('op', '=>')
+        if token:
+            return Implies(left, self.parse_state(), pos=token.pos)
+        return left
+
+    def _disjunction(self):
+        first = self._conjunction()
+        operands = [first]
+        while self.accept('keyword', 'or') or self.accept('op', '||'):
+            operands.append(self._conjunction())
+        if len(operands) == 1:
+            return first
+        return Or(tuple(operands), pos=first.pos)
+
+    def _conjunction(self):
+        first = self._negation()
+        operands = [first]
+        while self.accept('keyword', 'and') or self.accept('op', '&&'):
+            operands.append(self._negation())
+        if len(operands) == 1:
+            return first
+        return And(tuple(operands), pos=first.pos)
+
+    def _negation(self):
+        token = self.accept('keyword', 'not') or self.accept('op', '!')
+        if token:
+            return Not(self._negation(), pos=token.pos)
+        return self._comparison()
+
+    def _comparison(self):
+        token = self.peek()
+        if token.kind == 'op' and token.text == '(':
+            return self._parenthesized()
+        left = self._operand()
+        token = self.peek()
+        if token.kind == 'op' and token.text in _COMPARISONS:
+            self.advance()
+            return Compare(token.text, left, self._operand(), pos=token.pos)
+        return left
+
+    def _operand(self):
+        token = self.advance()
+        if token.kind == 'name':
+            return Field(tuple(token.text.split('.')), pos=token.pos)
+        if token.kind == 'number':
+            text = token.text
+            if any(c in text for c in '.eE'):
+                return Const(float(text), pos=token.pos)
+            return Const(int(text), pos=token.pos)
+        if token.kind == 'string':
+            return Const(_unquote(token.text), pos=token.pos)
+        if token.kind == 'keyword' and token.text in ('true', 'false'):
+            return Const(token.text == 'true', pos=token.pos)
+        if token.kind == 'keyword' and token.text in ('null', 'none'):
+            return Const(None, pos=token.pos)
+        raise self.error("Unexpected token", token)
+
+
+def parse_formula(text: str):
+    """Parse a temporal formula string into an AST."""
+    parser = FormulaParser(tokenize(text))
+    node = parser.parse_formula()
+    parser.expect('eof')
+    return node
+
+
+def _format_const(value: Any) -> str:
+    if value is None:
+        return 'null'
+    if value is True:
+        return 'true'
+    if value is False:
+        return 'false'
+    if isinstance(value, str):
+        return '"' + ''.join(_QUOTE_ESCAPES.get(c, c) for c in value) + '"'
+    return repr(value)
+
+
+# Binding strength used to decide where parentheses are required
+_PRECEDENCE = {Implies: 1, Or: 2, And: 3, Not: 4}
+
+
+def _format_state(node, minimum: int = 0) -> str:
+    level = _PRECEDENCE.get(type(node), 5)
+    if isinstance(node, Field):
+        text = '.'.join(node.path)
+    elif isinstance(node, Const):
+        text = _format_const(node.value)
+    elif isinstance(node, Compare):
+        text = f"{_format_state(node.left, 5)} {node.op} {_format_state(node.right, 5)}"
+    elif isinstance(node, Not):
+        text = f"not {_format_state(node.operand, 4)}"
+    elif isinstance(node, And):
+        text = ' and '.join(_format_state(o, 4) for o in node.operands)
+    elif isinstance(node, Or):
+        text = ' or '.join(_format_state(o, 3) for o in node.operands)
+    elif isinstance(node, Implies):
+        text = f"{_format_state(node.left, 2)} => {_format_state(node.right, 1)}"
+    else:
+        raise ValueError(f"Temporal operator not allowed inside state formula at position {node.pos}")
+    return f"({text})" if level < minimum else text
+
+
+def format_formula(node) -> str:
+    """Render a formula AST as canonical source text that parses back to it."""
+    if isinstance(node, Always):
+        return f"always ({_format_state(node.body)})"
+    if isinstance(node, Eventually):
+        return f"eventually ({_format_state(node.body)})"
+    if isinstance(node, Within):
+        return f"within {node.bound} steps ({_format_state(node.body)})"
+    return _format_state(node)
+
+
+# ---------------------------------------------------------------------------
+# Compilation
+# ---------------------------------------------------------------------------
+
+Getter = Callable[[Any], Any]
+Resolver = Callable[[Tuple[str, ...]], Getter]
+
+
+def _missing_safe_get(row: Any, key: str) -> Any:
+    getter = getattr(row, 'get', None)
+    return getter(key) if getter is not None else None
+
+
+def resolve_field(path: Tuple[str, ...]) -> Getter:
+    """Default resolver: read a field from a step mapping."""
+    if len(path) == 1:
+        key = path[0]
+        return lambda row: row.get(key)
+
+    def get_path(row):
+        value = row
+        for key in path:
+            value = _missing_safe_get(value, key)
+            if value is None:
+                return None
+        return value
+    return get_path
+
+
+_ORDERED = {
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+}
+
+
+def _compile_operand(node, resolve: Resolver) -> Getter:
+    if isinstance(node, Const):
+        value = node.value
+        return lambda row: value
+    if isinstance(node, Field):
+        return resolve(node.path)
+    raise ValueError(f"Temporal operator not allowed inside state formula at position {node.pos}")
+
+
+def compile_state(node, resolve: Resolver = resolve_field) -> Callable[[Any], bool]:
+    """Compile a state formula into a predicate over a single step."""
+    if isinstance(node, Compare):
+        op = node.op
+        left = node.left
+        right = node.right
+        if isinstance(left, Field) and isinstance(right, Const):
+            get = resolve(left.path)
+            const = right.value
+            if op == '==':
+                return lambda row: get(row) == const
+            if op == '!=':
+                return lambda row: get(row) != const
+            compare = _ORDERED[op]
+
+            def field_const(row):
+                try:
+                    return compare(get(row), const)
+                except TypeError:
+                    return False
+            return field_const
+
+        get_left = _compile_operand(left, resolve)
+        get_right = _compile_operand(right, resolve)
+        if op == '==':
+            return lambda row: get_left(row) == get_right(row)
+        if op == '!=':
+            return lambda row: get_left(row) != get_right(row)
+        compare = _ORDERED[op]
+
+        def general(row):
+            try:
+                return compare(get_left(row), get_right(row))
+            except TypeError:
+                return False
+        return general
+
+    if isinstance(node, Field):
+        get = resolve(node.path)
+        return lambda row: bool(get(row))
+    if isinstance(node, Const):
+        value = bool(node.value)
+        return lambda row: value
+    if isinstance(node, Not):
+        inner = compile_state(node.operand, resolve)
+        return lambda row: not inner(row)
+    if isinstance(node, And):
+        parts = tuple(compile_state(o, resolve) for o in node.operands)
+        if len(parts) == 2:
+            a, b = parts
+            return lambda row: a(row) and b(row)
+        return lambda row: all(p(row) for p in parts)
+    if isinstance(node, Or):
+        parts = tuple(compile_state(o, resolve) for o in node.operands)
+        if len(parts) == 2:
+            a, b = parts
+            return lambda row: a(row) or b(row)
+        return lambda row: any(p(row) for p in parts)
+    if isinstance(node, Implies):
+        antecedent = compile_state(node.left, resolve)
+        consequent = compile_state(node.right, resolve)
+        return lambda row: (not antecedent(row)) or consequent(row)
+    raise ValueError(f"Temporal operator not allowed inside state formula at position {node.pos}")
+
+
+def field_paths(node) -> List[Tuple[str, ...]]:
+    """Return the distinct field paths referenced by a formula, in order."""
+    seen = []
+
+    def visit(n):
+        if isinstance(n, Field):
+            if n.path not in seen:
+                seen.append(n.path)
+        elif isinstance(n, Compare):
+            visit(n.left)
+            visit(n.right)
+        elif isinstance(n, Implies):
+            visit(n.left)
+            visit(n.right)
+        elif isinstance(n, (And, Or)):
+            for o in n.operands:
+                visit(o)
+        elif isinstance(n, Not):
+            visit(n.operand)
+        elif isinstance(n, (Always, Eventually, Within)):
+            visit(n.body)
+
+    visit(node)
+    return seen
+
+
+# ---------------------------------------------------------------------------
+# Monitors
+# ---------------------------------------------------------------------------
+
+@dataclass
+class Verdict:
+    """Outcome of running a monitor over a complete trace."""
+    holds: bool
+    step_index: Optional[int] = None
+
+
+class Monitor:
+    """
+    Runtime monitor for one compiled formula.
+
+    ``advance`` consumes one step and returns True once the verdict is
+    decided; ``finish`` closes the trace and yields the final verdict.
+    """
+
+    __slots__ = ('decided', 'holds', 'step_index')
+
+    # Attributes that change while scanning; see ``snapshot``
+    _state = ('decided', 'holds', 'step_index')
+
+    def __init__(self):
+        self.decided = False
+        self.holds = True
+        self.step_index = None
+
+    def snapshot(self) -> tuple:
+        """Scan state before ``finish``, for resuming on an extended trace."""
+        return tuple(getattr(self, name) for name in self._state)
+
+    def restore(self, state: tuple) -> None:
+        for name, value in zip(self._state, state):
+            setattr(self, name, value)
+
+    def _violate(self, index: Optional[int]) -> bool:
+        self.decided = True
+        self.holds = False
+        self.step_index = index
+        return True
+
+    def _satisfy(self) -> bool:
+        self.decided = True
+        self.holds = True
+        return True
+
+    def advance(self, index: int, row: Any) -> bool:
+        raise NotImplementedError
+
+    def run(self, rows: Iterable[Any], start: int = 0) -> int:
+        """Consume rows until decided; return the next unconsumed index."""
+        index = start
+        for row in rows:
+            if self.advance(index, row):
+                return index + 1
+            index += 1
+        return index
+
+    def finish(self, length: int) -> Verdict:
+        return Verdict(self.holds, self.step_index)
+
+
+class AlwaysMonitor(Monitor):
+    __slots__ = ('pred',)
+
+    def __init__(self, pred):
+        super().__init__()
+        self.pred = pred
+
+    def advance(self, index, row):
+        if self.pred(row):
+            return False
+        return self._violate(index)
+
+    def run(self, rows, start=0):
+        pred = self.pred
+        index = start
+        for row in rows:
+            if not pred(row):
+                self._violate(index)
+                return index + 1
+            index += 1
+        return index
+
+
+class EventuallyMonitor(Monitor):
+    __slots__ = ('pred',)
+
+    def __init__(self, pred):
+        super().__init__()
+        self.pred = pred
+
+    def advance(self, index, row):
+        if self.pred(row):
+            return self._satisfy()
+        return False
+
+    def run(self, rows, start=0):
+        pred = self.pred
+        index = start
+        for row in rows:
+            if pred(row):
+                self._satisfy()
+                return index + 1
+            index += 1
+        return index
+
+    def finish(self, length):
+        if not self.decided:
+            # Never satisfied: the obligation fails at the end of the trace
+            self._violate(length - 1 if length else None)
+        return Verdict(self.holds, self.step_index)
+
+
+class InitialMonitor(Monitor):
+    """State formula without a temporal operator: checked on the first step."""
+    __slots__ = ('pred',)
+
+    def __init__(self, pred):
+        super().__init__()
+        self.pred = pred
+
+    def advance(self, index, row):
+        if self.pred(row):
+            return self._satisfy()
+        return self._violate(index)
+
+    def finish(self, length):
+        if not self.decided:
+            self._violate(None)
+        return Verdict(self.holds, self.step_index)
+
+
+class WithinMonitor(Monitor):
+    """Body must hold at some step in the first ``bound`` steps."""
+    __slots__ = ('pred', 'bound')
+
+    def __init__(self, pred, bound):
+        super().__init__()
+        self.pred = pred
+        self.bound = bound
+
+    def advance(self, index, row):
+        if self.pred(row):
+            return self._satisfy()
+        if index >= self.bound - 1:
+            return self._violate(index)
+        return False
+
+    def finish(self, length):
+        if not self.decided:
+            self._violate(length - 1 if length else None)
+        return Verdict(self.holds, self.step_index)
+
+
+class ResponseMonitor(Monitor):
+    """
+    Every step satisfying the trigger must be answered within ``bound`` steps.
+
+    Only the oldest open trigger matters: an answer discharges every
+    trigger still pending, and the oldest one expires first.
+    """
+    __slots__ = ('trigger', 'response', 'bound', 'pending')
+    _state = Monitor._state + ('pending',)
+
+    def __init__(self, trigger, response, bound):
+        super().__init__()
+        self.trigger = trigger
+        self.response = response
+        self.bound = bound
+        self.pending = None
+
+    def advance(self, index, row):
+        pending = self.pending
+        if pending is not None and index - pending >= self.bound:
+            return self._violate(pending)
+        if pending is None and self.trigger(row):
+            pending = index
+        if pending is not None and self.response(row):
+            pending = None
+        self.pending = pending
+        return False
+
+    def finish(self, length):
+        if not self.decided and self.pending is not None:
+            self._violate(self.pending)
+        return Verdict(self.holds, self.step_index)
+
+
+class CompiledFormula:
+    """A parsed formula that can produce fresh monitors."""
+
+    def __init__(self, text: str, ast):
+        self.text = text
+        self.ast = ast
+        self.fields = field_paths(ast)
+        self._default_factory = self.factory(resolve_field)
+
+    def factory(self, resolve: Resolver) -> Callable[[], Monitor]:
+        """Compile predicates against ``resolve`` and return a monitor factory."""
+        node = self.ast
+        if isinstance(node, Always):
+            pred = compile_state(node.body, resolve)
+            return lambda: AlwaysMonitor(pred)
+        if isinstance(node, Eventually):
+            pred = compile_state(node.body, resolve)
+            return lambda: EventuallyMonitor(pred)
+        if isinstance(node, Within):
+            bound = node.bound
+            if isinstance(node.body, Implies):
+                trigger = compile_state(node.body.left, resolve)
+                response = compile_state(node.body.right, resolve)
+                return lambda: ResponseMonitor(trigger, response, bound)
+            pred = compile_state(node.body, resolve)
+            return lambda: WithinMonitor(pred, bound)
+        pred = compile_state(node, resolve)
+        return lambda: InitialMonitor(pred)
+
+    def monitor(self) -> Monitor:
+        return self._default_factory()
+
+    def evaluate(self, steps: List[Any]) -> Verdict:
+        """Check the formula against a complete list of steps."""
+        monitor = self.monitor()
+        monitor.run(steps)
+        return monitor.finish(len(steps))
+
+    def evaluate_until(
+        self,
+        steps: List[Any],
+        deadline: float,
+        check_every: int = 1024
+    ) -> Tuple[Optional[Verdict], int]:
+        """
+        Like ``evaluate``, but stop once ``time.time()`` passes ``deadline``.
+
+        The clock is read before every block of ``check_every`` steps.
+        Returns the verdict, or None if the deadline fired first, together
+        with the number of steps consumed.
+        """
+        monitor = self.monitor()
+        length = len(steps)
+        rows = iter(steps)
+        index = 0
+        while index < length and not monitor.decided:
+            if time.time() > deadline:
+                return None, index
+            index = monitor.run(islice(rows, check_every), index)
+        return monitor.finish(length), index
+
+
+# Compiled formulas keyed by formula text
+_COMPILED = LRUCache(4096)
+
+
+def compile_formula(formula: Any) -> CompiledFormula:
+    """
+    Compile a formula given as source text or as a parsed AST.
+
+    Results are cached per formula text; ASTs are keyed by their canonical
+    text and compiled without being re-parsed. Already-compiled formulas
+    are returned unchanged.
+    """
+    if isinstance(formula, CompiledFormula):
+        return formula
+    if isinstance(formula, str):
+        text = formula
+        ast = None
+    else:
+        text = format_formula(formula)
+        ast = formula
+    compiled = _COMPILED.get(text)
+    if compiled is None:
+        compiled = CompiledFormula(text, ast if ast is not None else parse_formula(text))
+        _COMPILED.put(text, compiled)
+    return compiled
@@ -2,8 +2,9 @@
 Core data types for FAK.
 """
 
-from typing import List, Dict, Any, Optional, Union
-from dataclasses import dataclass, asdict
+from typing import List, Dict, Any, Optional, Tuple, Union
+from collections.abc import Mapping
+from dataclasses import dataclass, field, fields, make_dataclass, FrozenInstanceError, MISSING
 from enum import Enum
 import hashlib
 import json
@@ -33,6 +34,44 @@ class ExecutionTrace:
         if len(self.steps) > MAX_TRACE_STEPS:
             raise ValueError(f"ExecutionTrace exceeds max steps: {MAX_TRACE_STEPS}")
 
+    def columnar(self) -> "ColumnarTrace":
+        """
+        Columnar view of the steps, built on first use.
+
+        The view is cached on the instance (outside the dataclass fields, so
+        hashing and equality are unaffected) and rebuilt if ``steps`` is
+        replaced or changes length.
+        """
+        from .columnar import ColumnarTrace
+        cache = _instance_cache(self)
+        view = cache.get('_columnar')
+        if view is None or view.steps is not self.steps or view.length != len(self.steps):
+            view = ColumnarTrace(self.steps)
+            cache['_columnar'] = view
+        return view
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Derived views are rebuilt on use rather than pickled
+        return {key: value for key, value in self.__dict__.items() if key not in _DERIVED_VIEWS}
+
+    def prefix_digests(self, base: Optional["PrefixDigests"] = None) -> "PrefixDigests":
+        """
+        Chained digests of every prefix of the steps (see ``checkpoint``).
+
+        Cached on the instance like ``columnar``; when steps are appended to
+        the same list only the new steps are hashed. Otherwise digests are
+        reused from ``base`` for the leading steps shared with it.
+        """
+        from .checkpoint import PrefixDigests
+        cache = _instance_cache(self)
+        digests = cache.get('_prefix_digests')
+        if digests is None or digests.steps is not self.steps or digests.length > len(self.steps):
+            digests = PrefixDigests(self.steps, base)
+            cache['_prefix_digests'] = digests
+        elif digests.length < len(self.steps):
+            digests.extend()
+        return digests
+
 
 @dataclass
 class CapabilityManifest:
@@ -110,6 +149,14 @@ class CounterExample:
     step_index: Optional[int] = None
 
 
+@dataclass
+class InvariantStatus:
+    """Outcome of checking one invariant."""
+    invariant_name: str
+    status: str  # "proved", "violated", "undecided" (deadline hit) or "error"
+    step_index: Optional[int] = None  # violating step, or steps consumed when undecided
+
+
 @dataclass
 class ProofWitness:
     """Proof witness bound to execution."""
@@ -120,6 +167,7 @@ class ProofWitness:
     policy_ir: PolicyIR
     invariants: List[InvariantSpec]
     counterexamples: List[CounterExample]
+    statuses: List[InvariantStatus] = field(default_factory=list)
 
     def __post_init__(self):
         if not self.proof_id:
@@ -145,6 +193,178 @@ class ProofBundle:
             raise ValueError(f"ProofBundle exceeds max witnesses: {MAX_BUNDLE_WITNESSES}")
 
 
+@dataclass
+class WitnessRef:
+    """Proof witness whose artifacts live in a ``PackedBundle``'s tables."""
+    proof_id: str
+    execution_trace: str  # content hash keys into the bundle's tables
+    capability_manifest: str
+    cost_ledger: str
+    policy_ir: str
+    invariants: List[InvariantSpec]
+    counterexamples: List[CounterExample]
+    statuses: List[InvariantStatus] = field(default_factory=list)
+
+
+@dataclass
+class PackedBundle:
+    """Proof bundle that stores each distinct artifact once, keyed by content hash."""
+    id: str  # same ID as the unpacked ProofBundle
+    witnesses: List[WitnessRef]
+    traces: Dict[str, ExecutionTrace]
+    manifests: Dict[str, CapabilityManifest]
+    ledgers: Dict[str, CostLedger]
+    policies: Dict[str, PolicyIR]
+    metadata: Dict[str, Any]
+
+    def __post_init__(self):
+        if not self.id:
+            raise ValueError("PackedBundle must have a valid ID")
+        MAX_BUNDLE_WITNESSES = 100
+        if len(self.witnesses) > MAX_BUNDLE_WITNESSES:
+            raise ValueError(f"PackedBundle exceeds max witnesses: {MAX_BUNDLE_WITNESSES}")
+
+
+# Instance cache entries derived from the steps, left out when pickling
+_DERIVED_VIEWS = frozenset({'_columnar', '_prefix_digests'})
+
+
+def _instance_cache(obj: Any) -> Dict[str, Any]:
+    """
+    Per-instance cache kept outside the dataclass fields.
+
+    This is the instance ``__dict__``, or for slotted variants (see
+    ``slotted_variant``) a dict in their ``_cache`` slot.
+    """
+    try:
+        return obj.__dict__
+    except AttributeError:
+        pass
+    try:
+        return obj._cache
+    except AttributeError:
+        cache: Dict[str, Any] = {}
+        object.__setattr__(obj, '_cache', cache)
+        return cache
+
+
+class FrozenList(list):
+    """List that rejects in-place mutation."""
+
+    __slots__ = ()
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError("FrozenList does not support mutation")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _immutable
+    append = extend = insert = pop = remove = clear = sort = reverse = _immutable
+
+    def __reduce__(self):
+        return (FrozenList, (list(self),))
+
+
+class FrozenDict(dict):
+    """Dict that rejects in-place mutation."""
+
+    __slots__ = ()
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError("FrozenDict does not support mutation")
+
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    pop = popitem = clear = update = setdefault = _immutable
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+
+def freeze_value(value: Any) -> Any:
+    """Recursively convert lists and dicts into their frozen counterparts."""
+    if isinstance(value, (FrozenList, FrozenDict)):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict((k, freeze_value(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return FrozenList(freeze_value(v) for v in value)
+    return value
+
+
+class _FrozenArtifact:
+    """
+    Mixin for artifact variants that are deeply immutable.
+
+    Containers are frozen after validation and field assignment raises
+    FrozenInstanceError, so the content hash can be memoized safely:
+    ``compute_content_hash`` computes it at most once per instance.
+    Use ``dataclasses.replace`` to derive a modified copy.
+    """
+
+    __slots__ = ()
+
+    def _freeze(self):
+        for f in fields(self):
+            object.__setattr__(self, f.name, freeze_value(getattr(self, f.name)))
+        self.__dict__['_frozen'] = True
+
+    def __setattr__(self, name, value):
+        if self.__dict__.get('_frozen'):
+            raise FrozenInstanceError(f"cannot assign to field {name!r}")
+        object.__setattr__(self, name, value)
+
+    def __delattr__(self, name):
+        raise FrozenInstanceError(f"cannot delete field {name!r}")
+
+
+class FrozenExecutionTrace(_FrozenArtifact, ExecutionTrace):
+    """Immutable ExecutionTrace with a memoized content hash."""
+
+    def __post_init__(self):
+        ExecutionTrace.__post_init__(self)
+        self._freeze()
+
+
+class FrozenCapabilityManifest(_FrozenArtifact, CapabilityManifest):
+    """Immutable CapabilityManifest with a memoized content hash."""
+
+    def __post_init__(self):
+        CapabilityManifest.__post_init__(self)
+        self._freeze()
+
+
+class FrozenCostLedger(_FrozenArtifact, CostLedger):
+    """Immutable CostLedger with a memoized content hash."""
+
+    def __post_init__(self):
+        CostLedger.__post_init__(self)
+        self._freeze()
+
+
+class FrozenPolicyIR(_FrozenArtifact, PolicyIR):
+    """Immutable PolicyIR with a memoized content hash."""
+
+    def __post_init__(self):
+        PolicyIR.__post_init__(self)
+        self._freeze()
+
+
+_FROZEN_VARIANTS = {
+    ExecutionTrace: FrozenExecutionTrace,
+    CapabilityManifest: FrozenCapabilityManifest,
+    CostLedger: FrozenCostLedger,
+    PolicyIR: FrozenPolicyIR,
+}
+
+
+def freeze_artifact(artifact: Any) -> Any:
+    """Return an immutable copy of an artifact (or the artifact if already frozen)."""
+    if isinstance(artifact, _FrozenArtifact):
+        return artifact
+    frozen_type = _FROZEN_VARIANTS.get(type(artifact))
+    if frozen_type is None:
+        raise TypeError(f"No frozen variant for {type(artifact).__name__}")
+    return frozen_type(**{f.name: getattr(artifact, f.name) for f in fields(artifact)})
+
+
 def _json_encoder(obj):
     """Handle non-JSON-serializable types."""
     if isinstance(obj, bytes):
@@ -154,28 +374,219 @@ def _json_encoder(obj):
     raise TypeError(f"Object of type {type(obj)} not JSON serializable")
 
 
-def _dataclass_to_dict(obj):
-    """Convert dataclass to dict for serialization."""
-    if hasattr(obj, '__dataclass_fields__'):
-        result = {}
-        for field_name, field_value in asdict(obj).items():
-            if isinstance(field_value, Enum):
-                result[field_name] = field_value.value
-            else:
-                result[field_name] = field_value
-        return result
-    return obj
+def _canonical_default(obj):
+    """JSON fallback for canonical hashing: dataclasses become field dicts."""
+    if hasattr(obj, '__dataclass_fields__') and not isinstance(obj, type):
+        return {f.name: getattr(obj, f.name) for f in fields(obj)}
+    if isinstance(obj, Mapping):
+        # Read-only mappings such as ``compact.StepRecord`` hash like dicts
+        return dict(obj.items())
+    return _json_encoder(obj)
+
+
+_CANONICAL_ENCODER = json.JSONEncoder(
+    sort_keys=True, separators=(',', ':'), default=_canonical_default
+)
+
+# Containers with at least this many items are streamed element by element;
+# smaller ones are encoded in one shot by the C encoder.
+_STREAM_MIN_ITEMS = 64
+
+# Pending text is flushed into the hash once it reaches this many characters.
+_STREAM_FLUSH_SIZE = 1 << 16
+
+
+def _canonical_key(key: Any) -> str:
+    """Convert a dict key exactly as json.dumps does."""
+    if isinstance(key, str):
+        pass
+    elif isinstance(key, float):
+        if key != key:
+            key = 'NaN'
+        elif key == float('inf'):
+            key = 'Infinity'
+        elif key == float('-inf'):
+            key = '-Infinity'
+        else:
+            key = float.__repr__(key)
+    elif key is True:
+        key = 'true'
+    elif key is False:
+        key = 'false'
+    elif key is None:
+        key = 'null'
+    elif isinstance(key, int):
+        key = int.__repr__(key)
+    else:
+        raise TypeError(f"keys must be str, int, float, bool or None, not {type(key).__name__}")
+    return json.encoder.encode_basestring_ascii(key)
+
+
+def _iter_canonical(obj: Any):
+    """
+    Yield the canonical JSON text of ``obj`` in pieces.
+
+    The concatenated pieces are identical to
+    ``json.dumps(obj, sort_keys=True, separators=(',', ':'))`` applied to the
+    ``asdict`` form of the object, but large containers are never rendered
+    as a single string and dataclasses are never deep-copied.
+    """
+    if hasattr(obj, '__dataclass_fields__') and not isinstance(obj, type):
+        items = sorted((f.name, getattr(obj, f.name)) for f in fields(obj))
+    elif isinstance(obj, dict) and len(obj) >= _STREAM_MIN_ITEMS:
+        items = sorted(obj.items())
+    elif isinstance(obj, (list, tuple)) and len(obj) >= _STREAM_MIN_ITEMS:
+        yield '['
+        first = True
+        for item in obj:
+            if not first:
+                yield ','
+            first = False
+            yield from _iter_canonical(item)
+        yield ']'
+        return
+    else:
+        yield _CANONICAL_ENCODER.encode(obj)
+        return
+
+    yield '{'
+    first = True
+    for key, value in items:
+        yield (_canonical_key(key) + ':') if first else (',' + _canonical_key(key) + ':')
+        first = False
+        yield from _iter_canonical(value)
+    yield '}'
 
 
 def compute_content_hash(obj: Any) -> str:
-    """Compute SHA256 hash of object's JSON representation."""
-    # Handle dataclasses by converting them to dicts
-    if hasattr(obj, '__dataclass_fields__'):
-        obj = _dataclass_to_dict(obj)
-    
-    # Handle lists of dataclasses
-    if isinstance(obj, list):
-        obj = [_dataclass_to_dict(item) for item in obj]
-        
-    serialized = json.dumps(obj, sort_keys=True, separators=(',', ':'), default=_json_encoder)
-    return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
\ No newline at end of file
+    """
+    Compute SHA256 hash of object's JSON representation.
+
+    Frozen artifacts (and frozen slotted variants) cache their digest on
+    first use.
+    """
+    if isinstance(obj, _FrozenArtifact) or getattr(type(obj), '_memoize_hash', False):
+        cache = _instance_cache(obj)
+        digest = cache.get('_content_hash')
+        if digest is None:
+            digest = _compute_content_hash(obj)
+            cache['_content_hash'] = digest
+        return digest
+    return _compute_content_hash(obj)
+
+
+def _compute_content_hash(obj: Any) -> str:
+    digest = hashlib.sha256()
+    update_canonical_hash(digest, obj)
+    return digest.hexdigest()
+
+
+def update_canonical_hash(digest: Any, obj: Any) -> None:
+    """Feed the canonical JSON encoding of ``obj`` into a hashlib object."""
+    # Stream the canonical encoding into the hash in bounded-size chunks
+    pending = []
+    pending_size = 0
+    for piece in _iter_canonical(obj):
+        pending.append(piece)
+        pending_size += len(piece)
+        if pending_size >= _STREAM_FLUSH_SIZE:
+            digest.update(''.join(pending).encode('ascii'))
+            pending = []
+            pending_size = 0
+    digest.update(''.join(pending).encode('ascii'))
+
+
+# ---------------------------------------------------------------------------
+# Slotted variants
+# ---------------------------------------------------------------------------
+
+# Types with generated slotted variants, in declaration order
+SLOTTABLE_TYPES = (
+    ExecutionTrace, CapabilityManifest, CostLedger, PolicyIR, InvariantSpec,
+    CounterExample, InvariantStatus, ProofWitness, ProofBundle, WitnessRef, PackedBundle,
+)
+
+# (type, frozen) -> slotted variant
+_SLOTTED: Dict[Tuple[type, bool], type] = {}
+
+
+def slotted_variant(cls: type, frozen: bool = False) -> type:
+    """
+    ``__slots__`` counterpart of a FAK dataclass (e.g. ``SlottedExecutionTrace``).
+
+    Instances carry no per-object ``__dict__``. Fields, validation and
+    methods match ``cls`` and instances hash to the same content ID. With
+    ``frozen`` (``FrozenSlotted*``) containers are deep-frozen, assignment
+    raises FrozenInstanceError and the content hash is memoized, as for
+    the ``Frozen*`` artifacts. Variants compare equal only to instances of
+    the same variant; ``base_type`` maps them back to ``cls``.
+    """
+    variant = _SLOTTED.get((cls, frozen))
+    if variant is None:
+        raise ValueError(f"No slotted variant for {cls.__name__}")
+    return variant
+
+
+def base_type(obj: Any) -> type:
+    """The FAK type an object's class is a variant of (or its own class)."""
+    return getattr(type(obj), '__fak_base__', type(obj))
+
+
+def _make_slotted_variant(cls: type, frozen: bool) -> type:
+    name = ("FrozenSlotted" if frozen else "Slotted") + cls.__name__
+    spec = []
+    for f in fields(cls):
+        if f.default is not MISSING:
+            spec.append((f.name, f.type, field(default=f.default)))
+        elif f.default_factory is not MISSING:
+            spec.append((f.name, f.type, field(default_factory=f.default_factory)))
+        else:
+            spec.append((f.name, f.type))
+    namespace = {
+        key: value for key, value in vars(cls).items()
+        if callable(value) and not key.startswith('__')
+    }
+    validate = vars(cls).get('__post_init__')
+    if frozen:
+        def __post_init__(self):
+            if validate is not None:
+                validate(self)
+            for f in fields(self):
+                object.__setattr__(self, f.name, freeze_value(getattr(self, f.name)))
+        namespace['__post_init__'] = __post_init__
+    elif validate is not None:
+        namespace['__post_init__'] = validate
+    slotted = make_dataclass(name, spec, namespace=namespace, frozen=frozen, slots=True)
+    # The subclass adds a slot for ``_instance_cache``, outside the fields
+    variant_namespace = {
+        '__slots__': ('_cache',),
+        '__module__': __name__,
+        '__qualname__': name,
+        '__doc__': f"Slotted{' frozen' if frozen else ''} variant of {cls.__name__}.",
+        '__fak_base__': cls,
+        '_memoize_hash': frozen,
+    }
+    if not frozen:
+        # Frozen dataclasses already pickle only their fields
+        def __getstate__(self):
+            state = {f.name: getattr(self, f.name) for f in fields(self)}
+            cache = {
+                key: value for key, value in getattr(self, '_cache', {}).items() if key not in _DERIVED_VIEWS
+            }
+            if cache:
+                state['_cache'] = cache
+            return None, state
+        variant_namespace['__getstate__'] = __getstate__
+    variant = type(name, (slotted,), variant_namespace)
+    slotted.__qualname__ = slotted.__name__ = f"_{name}Fields"
+    slotted.__module__ = __name__
+    return variant
+
+
+for _cls in SLOTTABLE_TYPES:
+    for _frozen in (False, True):
+        _variant = _SLOTTED[(_cls, _frozen)] = _make_slotted_variant(_cls, _frozen)
+        globals()[_variant.__name__] = _variant
+        globals()[_variant.__mro__[1].__name__] = _variant.__mro__[1]
+
+SLOTTED_TYPES = tuple(_SLOTTED.values())
@@ -0,0 +1,137 @@
+"""
+Verdict caches for the proof engine.
+
+A verdict is the list of counterexamples produced for one proof. Proof IDs
+are built from the IDs the artifacts declare, which a caller can keep while
+changing the content, so the cache key also covers the computed content
+hash of each input artifact. It adds a hash of the invariant bodies and the
+engine version, so editing a formula or upgrading the checker never serves
+a stale result.
+
+``MemoryVerdictCache`` keeps verdicts in an in-process LRU;
+``FilesystemVerdictCache`` persists them so re-audits in later runs (and
+verifier worker processes) start warm.
+"""
+
+import json
+import os
+from typing import Any, List, Optional, Sequence
+
+from .cache import LRUCache
+from .codec import from_plain
+from .storage import write_atomic
+from .temporal import format_formula
+from .types import CounterExample, compute_content_hash, _CANONICAL_ENCODER
+
+
+def _formula_text(formula: Any) -> Any:
+    if formula is None or isinstance(formula, str):
+        return formula
+    return format_formula(formula)
+
+
+def verdict_key(
+    proof_id: str,
+    content_hashes: Sequence[str],
+    invariants: Sequence[Any],
+    engine_version: str
+) -> str:
+    """
+    Cache key for the verdict of ``proof_id`` under the given invariant bodies.
+
+    ``content_hashes`` are the computed content hashes of the input
+    artifacts (trace, capabilities, cost ledger, policy IR).
+    """
+    bodies = [
+        {
+            "name": invariant.name,
+            "precondition": _formula_text(invariant.precondition),
+            "postcondition": _formula_text(invariant.postcondition),
+            "temporal_properties": [_formula_text(p) for p in invariant.temporal_properties],
+            "invariant_type": getattr(invariant.invariant_type, 'value', invariant.invariant_type),
+        }
+        for invariant in invariants
+    ]
+    return compute_content_hash({
+        "proof_id": proof_id,
+        "content_hashes": list(content_hashes),
+        "invariants": bodies,
+        "engine_version": engine_version,
+    })
+
+
+def _copy_counterexamples(counterexamples: Sequence[CounterExample]) -> List[CounterExample]:
+    return [
+        CounterExample(c.invariant_name, c.error_type, dict(c.details), c.step_index)
+        for c in counterexamples
+    ]
+
+
+class VerdictCache:
+    """Interface for verdict caches."""
+
+    # True when the cache is visible from other processes
+    shared = False
+
+    def get(self, key: str) -> Optional[List[CounterExample]]:
+        """Stored counterexamples for ``key``, or None on a miss."""
+        raise NotImplementedError
+
+    def put(self, key: str, counterexamples: List[CounterExample]) -> None:
+        raise NotImplementedError
+
+
+class MemoryVerdictCache(VerdictCache):
+    """In-process LRU of verdicts."""
+
+    def __init__(self, maxsize: int = 4096):
+        self._entries = LRUCache(maxsize)
+
+    @property
+    def hits(self) -> int:
+        return self._entries.hits
+
+    @property
+    def misses(self) -> int:
+        return self._entries.misses
+
+    def get(self, key: str) -> Optional[List[CounterExample]]:
+        stored = self._entries.get(key)
+        return None if stored is None else _copy_counterexamples(stored)
+
+    def put(self, key: str, counterexamples: List[CounterExample]) -> None:
+        self._entries.put(key, tuple(_copy_counterexamples(counterexamples)))
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class FilesystemVerdictCache(VerdictCache):
+    """
+    Verdicts stored as canonical JSON files under ``root/ab/<key>``.
+
+    Files are written atomically, so concurrent writers of the same key
+    are harmless and readers never see partial entries.
+    """
+
+    shared = True
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        if len(key) < 3 or not key.isalnum():
+            raise ValueError(f"Invalid verdict key: {key!r}")
+        return os.path.join(self.root, key[:2], key)
+
+    def get(self, key: str) -> Optional[List[CounterExample]]:
+        try:
+            with open(self._path(key), 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        return from_plain(List[CounterExample], json.loads(data))
+
+    def put(self, key: str, counterexamples: List[CounterExample]) -> None:
+        write_atomic(self._path(key), _CANONICAL_ENCODER.encode(list(counterexamples)).encode('ascii'))
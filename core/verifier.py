@@ -2,9 +2,16 @@
 Standalone verifier for FAK proof bundles.
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Union
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+import os
 from .types import ProofBundle, ProofWitness, CounterExample
 from .engine import ProofEngine
+from .merkle import MerkleProof, chunk_bounds, verify_inclusion
+from .verdicts import VerdictCache
+from .bundle import BundleView
+from .archive import BundleArchive
 
 
 class Verifier:
@@ -12,15 +19,44 @@ class Verifier:
     Standalone verifier that accepts a proof bundle and re-checks invariants.
     
     Does not depend on original runtime environment.
+    
+    With ``max_workers`` (or an existing ``executor``) witnesses are
+    re-verified in parallel worker processes. The pool started for
+    ``max_workers`` is kept for later bundles until ``close``. With an
+    ``executor``, ``max_workers`` gives the number of chunks to split a
+    bundle into (default ``os.cpu_count()``).
+    
+    A ``verdict_cache`` skips re-checking witnesses whose inputs and
+    invariants were already verified; shared (on-disk) caches are also
+    used by the worker processes.
     """
 
-    def __init__(self):
-        self.engine = ProofEngine()
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        executor: Optional[Executor] = None,
+        verdict_cache: Optional[VerdictCache] = None
+    ):
+        self.engine = ProofEngine(verdict_cache=verdict_cache)
+        self.verdict_cache = verdict_cache
+        self.max_workers = max_workers
+        self.executor = executor
+        self._pool: Optional[ProcessPoolExecutor] = None
 
-    def verify_bundle(self, bundle: ProofBundle) -> Dict[str, Any]:
+    def verify_bundle(
+        self,
+        bundle: Union[ProofBundle, BundleView, BundleArchive],
+        witnesses: Optional[List[int]] = None
+    ) -> Dict[str, Any]:
         """
         Verify a proof bundle.
         
+        ``bundle`` may also be a ``BundleView`` over a packed bundle or an
+        open ``BundleArchive``; those decode only the witnesses verified.
+        ``witnesses`` selects witnesses by index; the bundle ID is still
+        checked against every proof ID, and ``results`` follow the
+        selection order. An empty selection raises ValueError.
+        
         Returns binary verdict with diagnostics.
         """
         # Verify bundle ID integrity
@@ -31,66 +67,164 @@ class Verifier:
                 'success': False,
                 'error': 'Bundle ID integrity check failed'
             }
+
+        lazy = isinstance(bundle, (BundleView, BundleArchive))
+        count = len(bundle) if lazy else len(bundle.witnesses)
+        if witnesses is not None:
+            if not witnesses:
+                raise ValueError("Witness selection is empty")
+            for index in witnesses:
+                if not 0 <= index < count:
+                    raise ValueError(f"Witness index {index} out of range for {count} witnesses")
+        if lazy:
+            selected = bundle.select(witnesses)
+        else:
+            selected = bundle.witnesses if witnesses is None else [bundle.witnesses[i] for i in witnesses]
             
-        results = []
-        overall_success = True
-        
-        for witness in bundle.witnesses:
-            try:
-                # Re-check each invariant
-                success = self.engine.verify_invariants(
-                    witness.execution_trace,
-                    witness.capability_manifest,
-                    witness.cost_ledger,
-                    witness.policy_ir,
-                    witness.invariants
-                )
+        if (self.executor is not None or (self.max_workers or 0) > 1) and len(selected) > 1:
+            results = self._verify_parallel(selected)
+        else:
+            results = [self._verify_witness(witness) for witness in selected]
                 
-                # Verify that the computed proof ID matches what's in the witness
-                # Note: We only check the immutable inputs, not outputs like counterexamples
-                if success.proof_id != witness.proof_id:
-                    results.append({
-                        'success': False,
-                        'error': 'Proof ID mismatch',
-                        'expected': witness.proof_id,
-                        'actual': success.proof_id
-                    })
-                    overall_success = False
-                    continue
-                    
-                # Check counterexamples for failures
-                if success.counterexamples:
-                    results.append({
-                        'success': False,
-                        'invariant_count': len(witness.invariants),
-                        'counterexamples': [c.__dict__ for c in success.counterexamples]
-                    })
-                    overall_success = False
-                else:
-                    results.append({
-                        'success': True,
-                        'invariant_count': len(witness.invariants),
-                        'counterexamples': []
-                    })
-                    
-            except Exception as e:
-                results.append({
-                    'error': str(e)
-                })
-                overall_success = False
-                
-        return {
+        verdict = {
             'bundle_id': bundle.id,
-            'success': overall_success,
+            'success': all(result.get('success', False) for result in results),
             'results': results
         }
+        if witnesses is not None:
+            verdict['witnesses'] = list(witnesses)
+        return verdict
+
+    def _verify_parallel(self, witnesses: List[ProofWitness]) -> List[Dict[str, Any]]:
+        """
+        Re-verify witnesses across worker processes.
+        
+        Witnesses are sent in a few contiguous chunks rather than one task
+        each: pickle memoizes shared objects within a payload, so an artifact
+        shared by many witnesses is serialized once per chunk. Chunk results
+        come back in submission order, keeping the verdict deterministic.
+        """
+        cache = self.verdict_cache if self.verdict_cache is not None and self.verdict_cache.shared else None
+        if self.executor is not None:
+            workers = self.max_workers or os.cpu_count() or 1
+            return self._map_chunks(self.executor, witnesses, workers, cache)
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._map_chunks(self._pool, witnesses, self.max_workers, cache)
+
+    def close(self) -> None:
+        # A caller's ``executor`` is left running
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self) -> "Verifier":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    @staticmethod
+    def _map_chunks(
+        executor: Executor,
+        witnesses: List[ProofWitness],
+        workers: int,
+        verdict_cache: Optional[VerdictCache] = None
+    ) -> List[Dict[str, Any]]:
+        chunk_count = min(len(witnesses), workers)
+        size, extra = divmod(len(witnesses), chunk_count)
+        chunks = []
+        start = 0
+        for i in range(chunk_count):
+            end = start + size + (1 if i < extra else 0)
+            chunks.append(witnesses[start:end])
+            start = end
+        results = []
+        for chunk_results in executor.map(partial(_verify_witness_chunk, verdict_cache=verdict_cache), chunks):
+            results.extend(chunk_results)
+        return results
+
+    def _verify_witness(self, witness: ProofWitness) -> Dict[str, Any]:
+        """Re-check one witness and describe the outcome."""
+        try:
+            # Re-check each invariant
+            success = self.engine.verify_invariants(
+                witness.execution_trace,
+                witness.capability_manifest,
+                witness.cost_ledger,
+                witness.policy_ir,
+                witness.invariants
+            )
+            
+            # Verify that the computed proof ID matches what's in the witness
+            # Note: We only check the immutable inputs, not outputs like counterexamples
+            if success.proof_id != witness.proof_id:
+                return {
+                    'success': False,
+                    'error': 'Proof ID mismatch',
+                    'expected': witness.proof_id,
+                    'actual': success.proof_id
+                }
+                
+            # Check counterexamples for failures
+            if success.counterexamples:
+                return {
+                    'success': False,
+                    'invariant_count': len(witness.invariants),
+                    'counterexamples': [c.__dict__ for c in success.counterexamples]
+                }
+            return {
+                'success': True,
+                'invariant_count': len(witness.invariants),
+                'counterexamples': []
+            }
+                
+        except Exception as e:
+            return {
+                'error': str(e)
+            }
+        
+    def verify_counterexample_inclusion(
+        self,
+        merkle_summary: Dict[str, Any],
+        counterexample: CounterExample,
+        chunk: List[Dict[str, Any]],
+        proof: MerkleProof
+    ) -> bool:
+        """
+        Check that the steps a counterexample points to belong to a trace.
         
-    def _compute_bundle_id(self, bundle: ProofBundle) -> str:
+        Only the chunk holding ``counterexample.step_index`` is rehashed; it
+        is checked with an inclusion proof against the trace's Merkle
+        summary (``MerkleTree.summary``, as bound by ``merkle_content_hash``),
+        which also fixes the step range the chunk covers.
+        """
+        if counterexample.step_index is None:
+            return False
+        bounds = chunk_bounds(merkle_summary, proof.leaf_index)
+        if bounds is None or counterexample.step_index not in bounds:
+            return False
+        return verify_inclusion(merkle_summary, chunk, proof)
+
+    def _compute_bundle_id(self, bundle: Union[ProofBundle, BundleView, BundleArchive]) -> str:
         """Compute content-addressable bundle ID."""
         from .types import compute_content_hash
         # Create content for hashing without witness details (which include counterexamples)
+        if isinstance(bundle, (BundleView, BundleArchive)):
+            proof_ids = bundle.proof_ids
+        else:
+            proof_ids = [w.proof_id for w in bundle.witnesses]
         bundle_content = {
-            "witnesses": [w.proof_id for w in bundle.witnesses],
+            "witnesses": proof_ids,
             "metadata": bundle.metadata
         }
-        return compute_content_hash(bundle_content)
\ No newline at end of file
+        return compute_content_hash(bundle_content)
+
+
+def _verify_witness_chunk(
+    witnesses: List[ProofWitness],
+    verdict_cache: Optional[VerdictCache] = None
+) -> List[Dict[str, Any]]:
+    """Worker entry point: verify a chunk of witnesses in order."""
+    verifier = Verifier(verdict_cache=verdict_cache)
+    return [verifier._verify_witness(witness) for witness in witnesses]
@@ -0,0 +1,101 @@
+import asyncio
+import threading
+import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from fak.core.aio import AsyncArtifactManager, AsyncProofEngine, AsyncVerifier
+from fak.core.engine import ProofEngine
+from fak.core.verifier import Verifier
+from fak.core.types import ExecutionTrace, CapabilityManifest, CostLedger, PolicyIR, InvariantSpec, ProofType
+
+
+def _witness(x):
+    return ProofEngine().verify_invariants(
+        ExecutionTrace(id=f"trace_{x}", steps=[{"x": x}], metadata={}),
+        CapabilityManifest(id="cap_id", agent_id="agent_123", capabilities=[], authority_graph={}, metadata={}),
+        CostLedger(id="cost_id", entries=[], total_cost=0.0, metadata={}),
+        PolicyIR(id="policy_id", ast={}, compiled_enforcement=b"", metadata={}),
+        [InvariantSpec("positive", "", "always (x > 0)", None, [], ProofType.BEHAVIORAL_SOUNDNESS)],
+    )
+
+
+class BlockingVerifier(Verifier):
+    """Verifier whose witness checks wait for a gate to open."""
+
+    def __init__(self):
+        super().__init__()
+        self.gate = threading.Event()
+        self.started = 0
+
+    def _verify_witness(self, witness):
+        self.started += 1
+        self.gate.wait(5)
+        return super()._verify_witness(witness)
+
+
+class TestAsyncAPI(unittest.TestCase):
+
+    def test_verify_invariants(self):
+        witness = _witness(1)
+        result = asyncio.run(AsyncProofEngine().verify_invariants(
+            witness.execution_trace, witness.capability_manifest, witness.cost_ledger,
+            witness.policy_ir, witness.invariants
+        ))
+        self.assertEqual(result, witness)
+
+    def test_verify_bundle_matches_sync(self):
+        bundle = ProofEngine().generate_bundle([_witness(x) for x in (1, 2, 0, 3)])
+        expected = Verifier().verify_bundle(bundle)
+        self.assertEqual(asyncio.run(AsyncVerifier(max_concurrency=2).verify_bundle(bundle)), expected)
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            self.assertEqual(asyncio.run(AsyncVerifier(executor=executor).verify_bundle(bundle)), expected)
+
+        bundle.metadata["tampered"] = True
+        self.assertFalse(asyncio.run(AsyncVerifier().verify_bundle(bundle))['success'])
+
+    def test_reused_across_event_loops(self):
+        bundle = ProofEngine().generate_bundle([_witness(x) for x in (1, 2, 3)])
+        expected = Verifier().verify_bundle(bundle)
+        # One slot, so calls queue on the semaphore in each loop
+        verifier = AsyncVerifier(max_concurrency=1)
+        for _ in range(2):
+            self.assertEqual(asyncio.run(verifier.verify_bundle(bundle)), expected)
+
+    def test_results_stream_and_close_cancels_pending(self):
+        bundle = ProofEngine().generate_bundle([_witness(x) for x in range(1, 9)])
+        verifier = BlockingVerifier()
+
+        async def first_result():
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                results = AsyncVerifier(verifier, executor, max_concurrency=2).iter_witness_results(bundle)
+                # The loop stays responsive while witnesses are blocked
+                pending = asyncio.ensure_future(results.__anext__())
+                await asyncio.sleep(0.05)
+                self.assertFalse(pending.done())
+                verifier.gate.set()
+                first = await pending
+                await results.aclose()
+                return first
+
+        index, result = asyncio.run(first_result())
+        self.assertTrue(result['success'])
+        self.assertLess(verifier.started, len(bundle.witnesses))
+
+    def test_create_bundle(self):
+        trace = ExecutionTrace(id="t", steps=[{"x": 1}], metadata={})
+        capabilities = CapabilityManifest(id="c", agent_id="a", capabilities=[], authority_graph={}, metadata={})
+        cost_ledger = CostLedger(id="l", entries=[], total_cost=0.0, metadata={})
+        policy_ir = PolicyIR(id="p", ast={}, compiled_enforcement=b"", metadata={})
+        manager = AsyncArtifactManager()
+        bundle = asyncio.run(manager.create_bundle(trace, capabilities, cost_ledger, policy_ir))
+        self.assertEqual(len(bundle.witnesses), 1)
+        self.assertIn(bundle.witnesses[0].execution_trace.id, manager.manager.artifacts)
+
+        bundles = asyncio.run(manager.create_bundles([(trace, capabilities, cost_ledger, policy_ir, [])] * 3))
+        self.assertEqual([len(b.witnesses) for b in bundles], [3])
+
+        with self.assertRaises(ValueError):
+            AsyncArtifactManager(max_concurrency=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
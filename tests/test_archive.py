@@ -0,0 +1,110 @@
+import os
+import tempfile
+import unittest
+from fak.core.archive import BundleArchive, write_archive, _TRAILER
+from fak.core.binary import encode_section
+from fak.core.bundle import BundleView, pack_bundle
+from fak.core.engine import ProofEngine
+from fak.core.types import ExecutionTrace, CapabilityManifest, CostLedger, PolicyIR, InvariantSpec, ProofType
+from fak.core.verifier import Verifier
+
+
+def _bundle():
+    engine = ProofEngine()
+    capabilities = CapabilityManifest(id="cap", agent_id="agent", capabilities=[], authority_graph={}, metadata={})
+    ledger = CostLedger(id="ledger", entries=[{"cost": 1.0}], total_cost=1.0, metadata={})
+    policy_ir = PolicyIR(id="policy", ast={}, compiled_enforcement=b"\x01\x02", metadata={})
+    invariants = [InvariantSpec("positive", "d", "always (x > 0)", None, [], ProofType.BEHAVIORAL_SOUNDNESS)]
+    witnesses = [
+        engine.verify_invariants(
+            ExecutionTrace(id=f"trace_{i}", steps=[{"x": i - 2}] * 50, metadata={}),
+            capabilities, ledger, policy_ir, invariants
+        )
+        for i in range(8)
+    ]
+    return engine.generate_bundle(witnesses)
+
+
+class TestArchive(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.root.name, "archive", "bundle.faka")
+
+    def tearDown(self):
+        self.root.cleanup()
+
+    def test_lazy_selection(self):
+        bundle = _bundle()
+        write_archive(self.path, bundle)
+        verifier = Verifier()
+        expected = verifier.verify_bundle(bundle)
+        with BundleArchive(self.path, validate=True) as archive:
+            self.assertEqual((archive.id, len(archive)), (bundle.id, 8))
+            self.assertEqual(archive.proof_ids, [w.proof_id for w in bundle.witnesses])
+            self.assertEqual(archive._artifacts, {})
+
+            result = verifier.verify_bundle(archive, witnesses=[5, 3])
+            self.assertEqual(result['witnesses'], [5, 3])
+            self.assertEqual(result['results'], [expected['results'][5], expected['results'][3]])
+            self.assertTrue(result['success'])
+            # Two traces plus the shared manifest, ledger and policy
+            self.assertEqual(len(archive._artifacts), 5)
+
+            self.assertFalse(verifier.verify_bundle(archive, witnesses=[1])['success'])
+            self.assertEqual(verifier.verify_bundle(archive), expected)
+            self.assertEqual(archive.select(), bundle.witnesses)
+            with self.assertRaises(ValueError):
+                verifier.verify_bundle(archive, witnesses=[8])
+            with self.assertRaises(ValueError):
+                verifier.verify_bundle(archive, witnesses=[])
+
+        view = BundleView(pack_bundle(bundle))
+        self.assertEqual(verifier.verify_bundle(view, witnesses=[3])['results'], [expected['results'][3]])
+        self.assertEqual(verifier.verify_bundle(bundle, witnesses=[3])['results'], [expected['results'][3]])
+
+    def test_integrity(self):
+        bundle = _bundle()
+        bundle.metadata["tampered"] = True
+        write_archive(self.path, bundle)
+        with BundleArchive(self.path) as archive:
+            self.assertFalse(Verifier().verify_bundle(archive, witnesses=[0])['success'])
+
+        write_archive(self.path, _bundle())
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        for bad in [b"", b"FAKB" + data[4:], data[:4] + b"\x02" + data[5:], data[:-1], data[:-20] + b"\xff" * 20]:
+            with open(self.path, 'wb') as f:
+                f.write(bad)
+            with self.assertRaises(ValueError):
+                BundleArchive(self.path)
+
+    def test_swapped_witness_section(self):
+        bundle = _bundle()
+        write_archive(self.path, bundle)
+        with BundleArchive(self.path) as archive:
+            index = {
+                "id": archive.id, "metadata": archive.metadata,
+                "witnesses": [list(entry) for entry in archive._witnesses],
+                "artifacts": archive._artifact_index,
+            }
+        # Point failing witness 0's index entry at passing witness 5's section
+        index["witnesses"][0][1:] = index["witnesses"][5][1:]
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        offset, _, magic = _TRAILER.unpack_from(data, len(data) - _TRAILER.size)
+        body = encode_section(index)
+        with open(self.path, 'wb') as f:
+            f.write(data[:offset] + body + _TRAILER.pack(offset, len(body), magic))
+
+        with BundleArchive(self.path) as archive:
+            self.assertEqual(archive.proof_ids, [w.proof_id for w in bundle.witnesses])
+            with self.assertRaises(ValueError):
+                archive[0]
+            with self.assertRaises(ValueError):
+                Verifier().verify_bundle(archive)
+            self.assertEqual(archive[5].proof_id, bundle.witnesses[5].proof_id)
+
+
+if __name__ == '__main__':
+    unittest.main()
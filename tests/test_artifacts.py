@@ -1,6 +1,14 @@
+import tempfile
+import threading
 import unittest
+from unittest import mock
+from fak.core import artifacts
 from fak.core.artifacts import ArtifactManager
-from fak.core.types import ExecutionTrace, CapabilityManifest, CostLedger, PolicyIR
+from fak.core.storage import FilesystemBackend, MemoryBackend
+from fak.core.types import (
+    ExecutionTrace, CapabilityManifest, CostLedger, PolicyIR, InvariantSpec, ProofType, freeze_artifact,
+)
+from fak.core.verifier import Verifier
 
 
 class TestArtifactManager(unittest.TestCase):
@@ -79,6 +87,127 @@ class TestArtifactManager(unittest.TestCase):
         self.assertIsNotNone(bundle.id)
         self.assertTrue(len(bundle.id) > 0)
 
+    def test_create_bundle_frozen(self):
+        manager = ArtifactManager()
+        trace = freeze_artifact(ExecutionTrace(id="trace_id", steps=[{"x": 1}], metadata={}))
+        capabilities = freeze_artifact(CapabilityManifest(
+            id="cap_id", agent_id="agent_123", capabilities=["read"], authority_graph={}, metadata={}
+        ))
+        cost_ledger = freeze_artifact(CostLedger(id="cost_id", entries=[], total_cost=0.0, metadata={}))
+        policy_ir = freeze_artifact(PolicyIR(id="policy_id", ast={}, compiled_enforcement=b"", metadata={}))
+
+        bundle = manager.create_bundle(trace, capabilities, cost_ledger, policy_ir)
+
+        witness = bundle.witnesses[0]
+        self.assertEqual(trace.id, "trace_id")  # inputs are not mutated
+        self.assertEqual(witness.execution_trace.id, manager.store_artifact(trace))
+        self.assertEqual(witness.counterexamples, [])
+
+    def test_create_bundles(self):
+        manager = ArtifactManager()
+        capabilities = freeze_artifact(CapabilityManifest(
+            id="cap_id", agent_id="agent_123", capabilities=["read"], authority_graph={}, metadata={}
+        ))
+        cost_ledger = CostLedger(id="cost_id", entries=[], total_cost=0.0, metadata={})
+        policy_ir = PolicyIR(id="policy_id", ast={}, compiled_enforcement=b"", metadata={})
+        invariants = [InvariantSpec("positive", "d", "always (x > 0)", None, [], ProofType.BEHAVIORAL_SOUNDNESS)]
+        traces = [ExecutionTrace(id=f"trace_{i}", steps=[{"x": i - 2}], metadata={}) for i in range(10)]
+        items = [(traces[i % 10], capabilities, cost_ledger, policy_ir, invariants) for i in range(250)]
+
+        with mock.patch.object(artifacts, "compute_content_hash", wraps=artifacts.compute_content_hash) as hashed:
+            bundles = manager.create_bundles(items)
+        self.assertEqual(hashed.call_count, 13)  # each distinct artifact once
+        self.assertEqual([len(b.witnesses) for b in bundles], [100, 100, 50])
+        self.assertEqual(capabilities.id, "cap_id")  # frozen inputs are copied, not stamped
+
+        witnesses = [w for b in bundles for w in b.witnesses]
+        self.assertEqual([w.execution_trace for w in witnesses], [traces[i % 10] for i in range(250)])
+        self.assertEqual(len({id(w.capability_manifest) for w in witnesses}), 1)
+        self.assertEqual([bool(w.counterexamples) for w in witnesses[:10]], [True] * 3 + [False] * 7)
+        for artifact in (traces[0], cost_ledger, policy_ir, witnesses[0].capability_manifest):
+            self.assertIn(artifact.id, manager.artifacts)
+        for bundle in bundles:
+            verdict = Verifier().verify_bundle(bundle)
+            self.assertNotIn('error', verdict)
+            self.assertEqual(len(verdict['results']), len(bundle.witnesses))
+
+        self.assertEqual(len(manager.create_bundles(items[:5], bundle_size=2)), 3)
+        self.assertEqual(manager.create_bundles([]), [])
+        with self.assertRaises(ValueError):
+            manager.create_bundles(items, bundle_size=101)
+
+    def test_concurrent_stores(self):
+        class CountingBackend(MemoryBackend):
+            def __init__(self):
+                super().__init__()
+                self.puts = []
+
+            def put(self, artifact_id, artifact):
+                self.puts.append(artifact_id)
+                super().put(artifact_id, artifact)
+
+        backend = CountingBackend()
+        manager = ArtifactManager(backend=backend, stripes=4)
+        traces = [freeze_artifact(ExecutionTrace(id=f"t{i}", steps=[{"x": i}] * 50, metadata={})) for i in range(40)]
+        barrier = threading.Barrier(8)
+        stored = []
+
+        def ingest():
+            barrier.wait()
+            stored.append([manager.store_artifact(trace) for trace in traces])
+
+        threads = [threading.Thread(target=ingest) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(stored), 8)
+        self.assertTrue(all(ids == stored[0] for ids in stored))
+        self.assertEqual(sorted(backend.puts), sorted(stored[0]))  # each ID written once
+        for artifact_id, trace in zip(stored[0], traces):
+            self.assertIs(manager.retrieve_artifact(artifact_id), trace)
+
+        self.assertTrue(manager.put_if_absent("custom-id", traces[0]))
+        self.assertFalse(manager.put_if_absent("custom-id", traces[1]))
+        self.assertIs(manager.retrieve_artifact("custom-id"), traces[0])
+        with self.assertRaises(ValueError):
+            ArtifactManager(stripes=0)
+
+    def test_persistent_backend(self):
+        with tempfile.TemporaryDirectory() as root:
+            manager = ArtifactManager(backend=FilesystemBackend(root), cache_size=8)
+            trace = ExecutionTrace(id="trace_id", steps=[{"op": "call"}], metadata={})
+            artifact_id = manager.store_artifact(trace)
+
+            # A fresh manager over the same directory starts warm
+            restarted = ArtifactManager(backend=FilesystemBackend(root))
+            retrieved = restarted.retrieve_artifact(artifact_id)
+            self.assertEqual(retrieved, trace)
+            self.assertIs(restarted.retrieve_artifact(artifact_id), retrieved)
+            self.assertTrue(restarted.validate_artifact_integrity(artifact_id, retrieved))
+
+            with self.assertRaises(ValueError):
+                restarted.retrieve_artifact("0" * 64)
+
+    def test_reads_do_not_wait_on_locks(self):
+        with tempfile.TemporaryDirectory() as root:
+            manager = ArtifactManager(backend=FilesystemBackend(root), cache_size=8)
+            trace = ExecutionTrace(id="trace_id", steps=[{"op": "call"}], metadata={})
+            artifact_id = manager.store_artifact(trace)
+            manager.backend.repack()
+            results = []
+            # A busy cache is skipped rather than waited on
+            with manager._cache._lock:
+                reader = threading.Thread(target=lambda: results.append(manager.retrieve_artifact(artifact_id)))
+                reader.start()
+                reader.join(timeout=5)
+                self.assertFalse(reader.is_alive())
+            self.assertEqual(results, [trace])
+            self.assertIsNone(manager._cache.peek(artifact_id))
+            self.assertEqual(manager.retrieve_artifact(artifact_id), trace)
+            self.assertIsNotNone(manager._cache.peek(artifact_id))
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,95 @@
+import random
+import unittest
+from fak.core.authority import AuthorityIndex, strongly_connected_components
+from fak.core.engine import ProofEngine
+from fak.core.stream import TraceStream
+from fak.core.types import ExecutionTrace, CapabilityManifest, CostLedger, PolicyIR, InvariantSpec, ProofType
+
+
+def _reachable(graph, sources):
+    seen = set(sources)
+    stack = list(sources)
+    while stack:
+        for target in graph.get(stack.pop(), []):
+            if target not in seen:
+                seen.add(target)
+                stack.append(target)
+    return seen
+
+
+class TestAuthority(unittest.TestCase):
+
+    def test_components_are_reverse_topological(self):
+        successors = [[1], [2], [0, 3], [4], [3], []]
+        component, count = strongly_connected_components(successors)
+        self.assertEqual(count, 3)
+        self.assertEqual(len({component[0], component[1], component[2]}), 1)
+        self.assertEqual(component[3], component[4])
+        for node, targets in enumerate(successors):
+            for target in targets:
+                self.assertGreaterEqual(component[node], component[target])
+
+    def test_matches_graph_search(self):
+        rng = random.Random(17)
+        for _ in range(50):
+            names = [f"a{i}" for i in range(rng.randint(1, 40))]
+            graph = {
+                name: rng.sample(names, rng.randint(0, min(3, len(names))))
+                for name in names if rng.random() < 0.8
+            }
+            index = AuthorityIndex(graph)
+            granted = rng.sample(names, rng.randint(0, 3))
+            grant = index.grant(granted)
+            reachable = _reachable(graph, granted)
+            for name in names + ["unknown"]:
+                self.assertEqual(grant.allows(name), name in reachable, (graph, granted, name))
+            source, target = rng.choice(names), rng.choice(names)
+            self.assertEqual(index.reaches(source, target), target in _reachable(graph, [source]))
+
+    def test_deep_graph_without_recursion(self):
+        graph = {f"n{i}": [f"n{i + 1}"] for i in range(20000)}
+        graph["n20000"] = ["n0"]
+        index = AuthorityIndex(graph)
+        self.assertEqual(len(set(index.components.values())), 1)
+        self.assertTrue(index.grant(["n5"]).allows("n4"))
+
+    def test_non_escalation_invariant(self):
+        capabilities = CapabilityManifest(
+            id="cap_escalation",
+            agent_id="agent_123",
+            capabilities=["read"],
+            authority_graph={"read": ["list"], "admin": ["write", "read"], "list": []},
+            metadata={}
+        )
+        others = (
+            CostLedger(id="cost_id", entries=[], total_cost=0.0, metadata={}),
+            PolicyIR(id="policy_id", ast={}, compiled_enforcement=b"", metadata={}),
+        )
+        invariant = InvariantSpec("no_escalation", "", None, None, [], ProofType.AUTHORITY_NON_ESCALATION)
+        steps = [{"authority": "read"}, {"op": "noop"}, {"authority": ["list", "read"]}, {"authority": "write"}]
+
+        engine = ProofEngine()
+        for mode in ("sequential", "fused", "columnar"):
+            witness = engine.verify_invariants(
+                ExecutionTrace("trace_id", steps, {}), capabilities, *others, [invariant], mode=mode
+            )
+            self.assertEqual(len(witness.counterexamples), 1, mode)
+            counterexample = witness.counterexamples[0]
+            self.assertEqual(counterexample.step_index, 3)
+            self.assertEqual(counterexample.details["reason"], "Authority escalation")
+            self.assertEqual(counterexample.details["clause"], "authority")
+
+        streamed = engine.verify_stream(TraceStream(iter(steps), "trace_id"), capabilities, *others, [invariant])
+        self.assertEqual(streamed.counterexamples, witness.counterexamples)
+
+        allowed = engine.verify_invariants(ExecutionTrace("trace_id", steps[:3], {}), capabilities, *others, [invariant])
+        self.assertEqual(allowed.counterexamples, [])
+
+        broken = CapabilityManifest(id="cap_broken", agent_id="a", capabilities=[], authority_graph={"a": 5}, metadata={})
+        for mode in ("sequential", "fused"):
+            witness = engine.verify_invariants(ExecutionTrace("t", steps, {}), broken, *others, [invariant], mode=mode)
+            self.assertEqual(witness.counterexamples[0].error_type, "parse_error")
+
+
+if __name__ == '__main__':
+    unittest.main()
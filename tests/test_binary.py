@@ -0,0 +1,90 @@
+import math
+import os
+import random
+import tempfile
+import unittest
+from fak.core.binary import decode_bundle, decode_section, encode_bundle, encode_section, read_bundle, write_bundle
+from fak.core.codec import encode_object
+from fak.core.engine import ProofEngine
+from fak.core.types import (
+    ExecutionTrace, CapabilityManifest, CostLedger, PolicyIR, InvariantSpec, ProofType,
+    compute_content_hash, freeze_artifact,
+)
+from fak.core.verifier import Verifier
+
+
+def _bundle():
+    engine = ProofEngine()
+    witnesses = []
+    for i in range(3):
+        trace = ExecutionTrace(
+            id=f"trace_{i}",
+            steps=[{"x": j - i, "op": "call", "args": [j, str(j), None], "ratio": j / 7} for j in range(200)],
+            metadata={"run": i}
+        )
+        capabilities = freeze_artifact(CapabilityManifest(
+            id="cap", agent_id="agent", capabilities=["read"], authority_graph={"read": []}, metadata={}
+        ))
+        ledger = CostLedger(id="ledger", entries=[{"cost": 0.5, "agent": "agent"}] * 4, total_cost=2.0, metadata={})
+        policy_ir = PolicyIR(id="policy", ast={}, compiled_enforcement=bytes(range(256)), metadata={})
+        invariants = [
+            InvariantSpec("positive", "d", "always (x > 0)", None, [], ProofType.BEHAVIORAL_SOUNDNESS),
+            InvariantSpec("budget", "d", None, None, [], ProofType.ECONOMIC_INVARIANCE),
+        ]
+        witnesses.append(engine.verify_invariants(trace, capabilities, ledger, policy_ir, invariants))
+    bundle = engine.generate_bundle(witnesses)
+    bundle.metadata.update({"source": "test", "extra": {1: [1.5, -3, b"\x00"]}})
+    bundle.id = Verifier()._compute_bundle_id(bundle)
+    return bundle
+
+
+class TestBinary(unittest.TestCase):
+
+    def test_bundle_roundtrip_keeps_ids(self):
+        bundle = _bundle()
+        data = encode_bundle(bundle)
+        self.assertTrue(data.startswith(b"FAKB"))
+        self.assertLess(len(data), len(encode_object(bundle)) * 0.6)
+        # Bytes are stored raw, not hex-encoded
+        self.assertIn(bytes(range(256)), data)
+        decoded = decode_bundle(data)
+        self.assertEqual(decoded, bundle)
+        self.assertEqual(type(decoded.witnesses[0].capability_manifest), type(bundle.witnesses[0].capability_manifest))
+        self.assertEqual(Verifier()._compute_bundle_id(decoded), bundle.id)
+        for original, copy in zip(bundle.witnesses, decoded.witnesses):
+            self.assertEqual(compute_content_hash(copy), compute_content_hash(original))
+        self.assertEqual(Verifier().verify_bundle(decoded), Verifier().verify_bundle(bundle))
+
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, "bundles", "b.fakb")
+            write_bundle(path, bundle)
+            self.assertEqual(read_bundle(path), bundle)
+
+    def test_values(self):
+        rng = random.Random(20)
+        for value in [
+            None, True, False, 0, -1, 2**70, -2**70, 0.1, float('inf'), "", "é中", b"", b"\x00" * 300,
+            [1, [2, [3]]], {"a": {"a": "a"}, 2: None, None: 1.5}, ProofType.SEMANTIC_PRESERVATION,
+            [{"k": i, "v": rng.random()} for i in range(100)],
+        ]:
+            self.assertEqual(decode_section(encode_section(value)), [value])
+        [nan] = decode_section(encode_section(float('nan')))
+        self.assertTrue(math.isnan(nan))
+        # Repeated keys are written once per section
+        data = encode_section([{"a_long_key_name": i} for i in range(50)])
+        self.assertEqual(data.count(b"a_long_key_name"), 1)
+        with self.assertRaises(TypeError):
+            encode_section(object())
+
+    def test_malformed(self):
+        data = encode_bundle(_bundle())
+        for bad in [b"", b"JSON" + data[4:], data[:4] + b"\x02" + data[5:], data[:-1], data + b"\x00"]:
+            with self.assertRaises(ValueError):
+                decode_bundle(bad)
+        for body in [b"\xff", b"\x05\x05ab", b"\x09\x63\x00", b"\x05\x02\xff\xfe"]:
+            with self.assertRaises(ValueError):
+                decode_section(body)
+
+
+if __name__ == '__main__':
+    unittest.main()
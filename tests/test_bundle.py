@@ -0,0 +1,90 @@
+import unittest
+from unittest import mock
+from fak.core import artifacts
+from fak.core.artifacts import ArtifactManager
+from fak.core.binary import decode_section, encode_bundle, encode_section
+from fak.core.bundle import BundleView, pack_bundle, unpack_bundle
+from fak.core.codec import decode_object, encode_object
+from fak.core.engine import ProofEngine
+from fak.core.types import (
+    ExecutionTrace, CapabilityManifest, CostLedger, PolicyIR, InvariantSpec, ProofType, freeze_artifact,
+)
+from fak.core.verifier import Verifier
+
+
+def _bundle(count=100):
+    engine = ProofEngine()
+    capabilities = CapabilityManifest(
+        id="cap", agent_id="agent", capabilities=[f"c{i}" for i in range(50)],
+        authority_graph={f"c{i}": [f"c{i + 1}"] for i in range(49)}, metadata={}
+    )
+    ledger = CostLedger(id="ledger", entries=[{"cost": 1.0}] * 200, total_cost=200.0, metadata={})
+    policy_ir = PolicyIR(id="policy", ast={"rules": []}, compiled_enforcement=bytes(4096), metadata={})
+    invariants = [InvariantSpec("positive", "d", "always (x > 0)", None, [], ProofType.BEHAVIORAL_SOUNDNESS)]
+    witnesses = []
+    for i in range(count):
+        trace = ExecutionTrace(id=f"trace_{i % 10}", steps=[{"x": i % 10}] * 20, metadata={})
+        # Equal content under separate objects is deduplicated too
+        policy = policy_ir if i % 2 else PolicyIR(**vars(policy_ir))
+        witnesses.append(engine.verify_invariants(trace, capabilities, ledger, policy, invariants))
+    return engine.generate_bundle(witnesses)
+
+
+class TestBundle(unittest.TestCase):
+
+    def test_pack_roundtrip(self):
+        bundle = _bundle()
+        packed = pack_bundle(bundle)
+        self.assertEqual(packed.id, bundle.id)
+        self.assertEqual(
+            (len(packed.traces), len(packed.manifests), len(packed.ledgers), len(packed.policies)),
+            (10, 1, 1, 1)
+        )
+        self.assertEqual([ref.proof_id for ref in packed.witnesses], [w.proof_id for w in bundle.witnesses])
+        self.assertLess(len(encode_object(packed)) * 10, len(encode_object(bundle)))
+        self.assertLess(len(encode_section(packed)) * 10, len(encode_bundle(bundle)))
+
+        for copy in (packed, decode_object(encode_object(packed)), decode_section(encode_section(packed))[0]):
+            unpacked = unpack_bundle(copy, validate=True)
+            self.assertEqual(unpacked, bundle)
+            self.assertEqual(Verifier().verify_bundle(unpacked), Verifier().verify_bundle(bundle))
+
+    def test_lazy_resolution_through_manager(self):
+        bundle = _bundle(20)
+        manager = ArtifactManager()
+        # Keys computed while packing are reused; the manager hashes nothing
+        with mock.patch.object(artifacts, "compute_content_hash") as rehashed:
+            packed = pack_bundle(bundle, manager)
+        rehashed.assert_not_called()
+        self.assertEqual(packed.traces, {})
+        self.assertEqual(len(manager.artifacts), 13)
+
+        view = BundleView(packed, manager)
+        self.assertEqual(len(view), 20)
+        self.assertEqual(view[3], bundle.witnesses[3])
+        self.assertEqual(len(view._resolved), 4)
+        first, second = view.select([0, 1])
+        self.assertIs(first.capability_manifest, second.capability_manifest)
+        self.assertEqual(unpack_bundle(packed, manager), bundle)
+
+        with self.assertRaises(ValueError):
+            BundleView(packed)[0]
+        tampered = ArtifactManager()
+        for key, artifact in manager.artifacts.items():
+            tampered.artifacts[key] = artifact
+        key = packed.witnesses[0].cost_ledger
+        tampered.artifacts[key] = CostLedger(id="other", entries=[], total_cost=0.0, metadata={})
+        with self.assertRaises(ValueError):
+            BundleView(packed, tampered, validate=True)[0]
+
+    def test_frozen_artifacts(self):
+        bundle = _bundle(4)
+        for witness in bundle.witnesses:
+            witness.policy_ir = freeze_artifact(witness.policy_ir)
+        packed = pack_bundle(bundle)
+        self.assertEqual(len(packed.policies), 1)
+        self.assertEqual(unpack_bundle(packed), bundle)
+
+
+if __name__ == '__main__':
+    unittest.main()
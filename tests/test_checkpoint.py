@@ -0,0 +1,125 @@
+import random
+import unittest
+from unittest import mock
+from fak.core import checkpoint
+from fak.core.checkpoint import CheckpointStore, PrefixDigests
+from fak.core.engine import ProofEngine
+from fak.core.types import ExecutionTrace, CapabilityManifest, CostLedger, PolicyIR, InvariantSpec, ProofType
+
+
+class CountingStep(dict):
+    reads = 0
+
+    def get(self, key, default=None):
+        CountingStep.reads += 1
+        return super().get(key, default)
+
+
+def _others():
+    return (
+        CapabilityManifest(id="cap_id", agent_id="agent_123", capabilities=[], authority_graph={}, metadata={}),
+        CostLedger(id="cost_id", entries=[], total_cost=0.0, metadata={}),
+        PolicyIR(id="policy_id", ast={}, compiled_enforcement=b"", metadata={}),
+    )
+
+
+_FORMULAS = [
+    "always (x >= 0)",
+    "eventually (x == 7)",
+    "within 5 steps (x > 8)",
+    "within 3 steps (x == 1 => x == 2)",
+    "x < 5",
+]
+
+
+def _invariants():
+    return [
+        InvariantSpec(f"inv{i}", "", formula, None, [], ProofType.BEHAVIORAL_SOUNDNESS)
+        for i, formula in enumerate(_FORMULAS)
+    ]
+
+
+class TestCheckpoint(unittest.TestCase):
+
+    def test_prefix_digests_extend(self):
+        steps = [{"x": i} for i in range(10)]
+        full = PrefixDigests(steps)
+        partial = PrefixDigests(steps[:4])
+        self.assertEqual(partial.digests, full.digests[:5])
+        partial.steps = steps
+        partial.extend()
+        self.assertEqual(partial.digests, full.digests)
+        self.assertNotEqual(PrefixDigests([{"x": 1}])[1], full[1])
+
+    def test_trace_caches_prefix_digests(self):
+        trace = ExecutionTrace(id="t", steps=[{"x": 1}], metadata={})
+        digests = trace.prefix_digests()
+        trace.steps.append({"x": 2})
+        self.assertIs(trace.prefix_digests(), digests)
+        self.assertEqual(digests.length, 2)
+        trace.steps = [{"x": 1}]
+        self.assertIsNot(trace.prefix_digests(), digests)
+
+    def test_appended_trace_matches_full_replay(self):
+        rng = random.Random(12)
+        invariants = _invariants()
+        for _ in range(30):
+            engine = ProofEngine(checkpoints=CheckpointStore())
+            steps = []
+            for _ in range(rng.randint(1, 8)):
+                steps.extend({"x": rng.randint(0, 9)} if rng.random() < 0.9 else {} for _ in range(rng.randint(0, 6)))
+                trace = ExecutionTrace(id="trace_id", steps=list(steps), metadata={})
+                incremental = engine.verify_invariants(trace, *_others(), invariants)
+                full = ProofEngine().verify_invariants(trace, *_others(), invariants)
+                self.assertEqual(incremental.counterexamples, full.counterexamples)
+
+    def test_resume_reads_only_new_steps(self):
+        engine = ProofEngine(checkpoints=CheckpointStore())
+        invariants = [InvariantSpec("positive", "", "always (x > 0)", None, [], ProofType.BEHAVIORAL_SOUNDNESS)]
+        trace = ExecutionTrace(id="trace_id", steps=[CountingStep(x=1) for _ in range(100)], metadata={})
+        engine.verify_invariants(trace, *_others(), invariants)
+
+        trace.steps.extend(CountingStep(x=1) for _ in range(5))
+        CountingStep.reads = 0
+        witness = engine.verify_invariants(trace, *_others(), invariants)
+        self.assertEqual(CountingStep.reads, 5)
+        self.assertEqual(witness.counterexamples, [])
+
+        trace.steps.append(CountingStep(x=0))
+        witness = engine.verify_invariants(trace, *_others(), invariants)
+        self.assertEqual(witness.counterexamples[0].step_index, 105)
+
+    def test_new_trace_object_hashes_only_new_steps(self):
+        engine = ProofEngine(checkpoints=CheckpointStore())
+        invariants = [InvariantSpec("positive", "", "always (x > 0)", None, [], ProofType.BEHAVIORAL_SOUNDNESS)]
+        steps = [CountingStep(x=1) for _ in range(100)]
+        engine.verify_invariants(ExecutionTrace(id="t", steps=list(steps), metadata={}), *_others(), invariants)
+
+        extended = ExecutionTrace(id="t", steps=steps + [CountingStep(x=1) for _ in range(5)], metadata={})
+        CountingStep.reads = 0
+        with mock.patch.object(checkpoint, "update_canonical_hash", wraps=checkpoint.update_canonical_hash) as hashed:
+            witness = engine.verify_invariants(extended, *_others(), invariants)
+        self.assertEqual(hashed.call_count, 5)
+        self.assertEqual(CountingStep.reads, 5)
+        self.assertEqual(witness.counterexamples, [])
+        self.assertEqual(extended.prefix_digests().digests, PrefixDigests(extended.steps).digests)
+
+        # A replaced step object is rehashed, and the checkpoint past it is not used
+        changed = list(extended.steps)
+        changed[50] = CountingStep(x=0)
+        witness = engine.verify_invariants(ExecutionTrace(id="t", steps=changed, metadata={}), *_others(), invariants)
+        self.assertEqual(witness.counterexamples[0].step_index, 50)
+
+    def test_changed_prefix_is_not_resumed(self):
+        engine = ProofEngine(checkpoints=CheckpointStore())
+        invariants = [InvariantSpec("positive", "", "always (x > 0)", None, [], ProofType.BEHAVIORAL_SOUNDNESS)]
+        engine.verify_invariants(ExecutionTrace(id="t", steps=[{"x": 1}, {"x": 1}], metadata={}), *_others(), invariants)
+        witness = engine.verify_invariants(
+            ExecutionTrace(id="t", steps=[{"x": 0}, {"x": 1}, {"x": 1}], metadata={}), *_others(), invariants
+        )
+        self.assertEqual(witness.counterexamples[0].step_index, 0)
+        self.assertEqual(engine.checkpoints.hits, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
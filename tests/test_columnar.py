@@ -0,0 +1,75 @@
+import random
+import unittest
+from fak.core.columnar import ColumnarTrace, NumericColumn, StringColumn, ObjectColumn
+from fak.core.temporal import compile_formula
+from fak.core.types import ExecutionTrace
+
+
+FORMULAS = [
+    "always (x > 0)",
+    "always (x >= -5 and x != 3)",
+    "eventually (op == \"ret\")",
+    "eventually (x == null)",
+    "always (op != \"halt\")",
+    "always (op < \"m\" or x <= 2.5)",
+    "eventually (flag)",
+    "always (not name)",
+    "within 4 steps (op == \"call\" => op == \"ret\")",
+    "within 3 steps (x > 8)",
+    "always (x < y)",
+    "eventually (args.n == 2)",
+    "always (mixed == 1)",
+    "op == \"call\"",
+    "always (0 < x)",
+]
+
+
+def random_steps(rng, count):
+    steps = []
+    for _ in range(count):
+        step = {}
+        if rng.random() < 0.9:
+            step["x"] = rng.choice([rng.randint(-5, 10), rng.uniform(-5, 10), float("nan")])
+        if rng.random() < 0.8:
+            step["y"] = rng.randint(-5, 10)
+        if rng.random() < 0.95:
+            step["op"] = rng.choice(["call", "ret", "log", "halt"])
+        step["flag"] = rng.choice([True, False, None])
+        step["name"] = rng.choice(["", "a", None])
+        step["mixed"] = rng.choice([1, "1", None, [1]])
+        step["args"] = {"n": rng.randint(0, 3)}
+        steps.append(step)
+    return steps
+
+
+class TestColumnar(unittest.TestCase):
+
+    def test_matches_row_evaluation(self):
+        rng = random.Random(3)
+        for _ in range(25):
+            steps = random_steps(rng, rng.randint(0, 60))
+            view = ColumnarTrace(steps)
+            for text in FORMULAS:
+                formula = compile_formula(text)
+                self.assertEqual(view.evaluate(formula), formula.evaluate(steps), text)
+
+    def test_column_types(self):
+        view = ColumnarTrace([{"n": 1, "f": 1.5, "s": "a", "o": [1]}, {"n": 2, "s": "b"}])
+        self.assertIsInstance(view.column(("n",)), NumericColumn)
+        self.assertIsInstance(view.column(("f",)), NumericColumn)
+        self.assertIsInstance(view.column(("s",)), StringColumn)
+        self.assertIsInstance(view.column(("o",)), ObjectColumn)
+        self.assertEqual(view.column(("s",)).dictionary, ["a", "b"])
+
+    def test_trace_view_is_lazy(self):
+        trace = ExecutionTrace(id="t", steps=[{"x": 1}], metadata={})
+        self.assertNotIn("_columnar", trace.__dict__)
+        view = trace.columnar()
+        self.assertIs(trace.columnar(), view)
+        trace.steps.append({"x": 2})
+        self.assertIsNot(trace.columnar(), view)
+        self.assertEqual(trace.steps[1], {"x": 2})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import pickle
+import tracemalloc
+import unittest
+from dataclasses import FrozenInstanceError
+from fak.core.binary import decode_section, encode_section
+from fak.core.codec import decode_object, encode_object
+from fak.core.compact import StepInterner, StepRecord, compact_steps, compact_trace
+from fak.core.engine import ProofEngine
+from fak.core.types import (
+    ExecutionTrace, CapabilityManifest, CostLedger, PolicyIR, InvariantSpec, ProofType,
+    base_type, compute_content_hash, slotted_variant,
+)
+
+
+def _steps(count):
+    return [
+        {"action": ["read", "write", "delete"][i % 3], "x": i % 7 - 1,
+         "resource": {"public": i % 2 == 0, "owner": f"user{i % 5}"}, "decision": "allow"}
+        for i in range(count)
+    ]
+
+
+class TestCompact(unittest.TestCase):
+
+    def test_record_reads_like_dict(self):
+        step = {"a": 1, "b": {"c": "x"}, "d": [1, {"e": 2}]}
+        record, = compact_steps([step])
+        self.assertIsInstance(record, StepRecord)
+        self.assertEqual(record, step)
+        self.assertEqual(record["b"]["c"], "x")
+        self.assertEqual(record.get("missing", 5), 5)
+        self.assertIn("d", record)
+        self.assertEqual(list(record), ["a", "b", "d"])
+        self.assertEqual(dict(record.items()), step)
+        with self.assertRaises(KeyError):
+            record["missing"]
+        self.assertEqual(pickle.loads(pickle.dumps(record)), step)
+
+    def test_records_share_schemas_and_strings(self):
+        interner = StepInterner()
+        first, second = compact_steps(_steps(2), interner)
+        self.assertIs(first._schema, second._schema)
+        third, = compact_steps([{"action": "re" + "ad", "x": 0, "resource": {}, "decision": "allow"}], interner)
+        self.assertIs(third["action"], first["action"])
+
+    def test_compact_trace_hash_and_memory(self):
+        trace = ExecutionTrace(id="t", steps=_steps(5000), metadata={"source": "test"})
+        for frozen in (False, True):
+            compact = compact_trace(trace, frozen=frozen)
+            self.assertIs(base_type(compact), ExecutionTrace)
+            self.assertFalse(hasattr(compact, '__dict__'))
+            self.assertEqual(compute_content_hash(compact), compute_content_hash(trace))
+            column = compact.columnar().column(("x",))
+            self.assertEqual(list(column.values), list(trace.columnar().column(("x",)).values))
+
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            dicts = [dict(step, resource=dict(step["resource"])) for step in _steps(5000)]
+            as_dicts = tracemalloc.get_traced_memory()[0] - before
+            before = tracemalloc.get_traced_memory()[0]
+            records = compact_steps(_steps(5000))
+            as_records = tracemalloc.get_traced_memory()[0] - before
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(records, dicts)
+        self.assertLess(as_records * 2, as_dicts)
+
+    def test_slotted_variants(self):
+        cls = slotted_variant(CostLedger)
+        self.assertIs(slotted_variant(CostLedger), cls)
+        ledger = cls(id="l", entries=[{"cost": 1.0}], total_cost=1.0, metadata={})
+        plain = CostLedger(id="l", entries=[{"cost": 1.0}], total_cost=1.0, metadata={})
+        self.assertEqual(compute_content_hash(ledger), compute_content_hash(plain))
+        self.assertFalse(hasattr(ledger, '__dict__'))
+        ledger.total_cost = 2.0
+        self.assertEqual(pickle.loads(pickle.dumps(ledger)).total_cost, 2.0)
+
+        frozen = slotted_variant(PolicyIR, frozen=True)(id="p", ast={"rules": []}, compiled_enforcement=b"", metadata={})
+        with self.assertRaises(FrozenInstanceError):
+            frozen.id = "q"
+        with self.assertRaises(TypeError):
+            frozen.ast["rules"] = None
+        with self.assertRaises(ValueError):
+            slotted_variant(PolicyIR)(id="p", ast=[], compiled_enforcement=b"", metadata={})
+        with self.assertRaises(ValueError):
+            slotted_variant(dict)
+
+    def test_serialization_roundtrip(self):
+        trace = ExecutionTrace(id="t", steps=_steps(50), metadata={})
+        compact = compact_trace(trace, frozen=True)
+        for copy in (decode_object(encode_object(compact)), decode_section(encode_section(compact))[0]):
+            self.assertEqual(compute_content_hash(copy), compute_content_hash(trace))
+        self.assertEqual(encode_section(compact), encode_section(trace))
+        copy = pickle.loads(pickle.dumps(compact))
+        self.assertIs(type(copy), type(compact))
+        self.assertEqual(compute_content_hash(copy), compute_content_hash(trace))
+
+    def test_verdicts_match_plain_trace(self):
+        trace = ExecutionTrace(id="t", steps=_steps(300), metadata={})
+        capabilities = CapabilityManifest(id="c", agent_id="a", capabilities=[], authority_graph={}, metadata={})
+        ledger = CostLedger(id="l", entries=[], total_cost=0.0, metadata={})
+        policy = PolicyIR(
+            id="p", compiled_enforcement=b"", metadata={},
+            ast={"rules": [{"when": "action == \"delete\"", "decision": "deny"}], "default": "allow"}
+        )
+        invariants = [
+            InvariantSpec("positive", "d", "always (x >= 0)", None, [], ProofType.BEHAVIORAL_SOUNDNESS),
+            InvariantSpec("policy", "d", "true", None, [], ProofType.SEMANTIC_PRESERVATION),
+        ]
+        engine = ProofEngine()
+        expected = engine.verify_invariants(trace, capabilities, ledger, policy, invariants)
+        self.assertTrue(expected.counterexamples)
+        for frozen in (False, True):
+            compact = compact_trace(trace, frozen=frozen)
+            for mode in ("sequential", "fused", "columnar"):
+                witness = engine.verify_invariants(compact, capabilities, ledger, policy, invariants, mode=mode)
+                self.assertEqual(witness.proof_id, expected.proof_id)
+                self.assertEqual(witness.counterexamples, expected.counterexamples)
+                self.assertEqual(witness.statuses, expected.statuses)
+
+
+if __name__ == '__main__':
+    unittest.main()
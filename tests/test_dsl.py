@@ -1,5 +1,7 @@
 import unittest
 from fak.core.dsl import InvariantDSL
+from fak.core.temporal import Always, Within, Implies, Compare, Not, format_formula, parse_formula, compile_formula
+from fak.core.types import ProofType
 
 
 class TestInvariantDSL(unittest.TestCase):
@@ -88,6 +90,112 @@ class TestInvariantDSL(unittest.TestCase):
             # Expected to fail due to format, but we want to know the error type
             pass
 
+    def test_parse_invariant_cached(self):
+        spec_str = """
+        invariant cached {
+            precondition: always (x > 0)
+            temporal_properties: [always]
+        }
+        """
+        InvariantDSL.clear_cache()
+        first = InvariantDSL.parse_invariant(spec_str)
+        first['temporal_properties'].append('mutated')
+        first['name'] = 'mutated'
+
+        # Cached results are not affected by callers mutating their copy
+        second = InvariantDSL.parse_invariant(spec_str)
+        self.assertEqual(second['name'], 'cached')
+        self.assertEqual(second['temporal_properties'], ['always'])
+
+    def test_parse_invariants_batch(self):
+        specs = [
+            "invariant a { precondition: always (x > 0) }",
+            "invariant b { postcondition: eventually (y == 1) }",
+            "invariant a { precondition: always (x > 0) }",
+        ]
+        results = InvariantDSL.parse_invariants(specs)
+        self.assertEqual([r['name'] for r in results], ['a', 'b', 'a'])
+        self.assertEqual(results[1]['postcondition'], 'eventually (y == 1)')
+
+        with self.assertRaises(ValueError):
+            InvariantDSL.parse_invariants(["precondition: always (x > 0)"])
+
+    def test_parse_document(self):
+        document = """
+        # Library of invariants
+        invariant positive {
+            precondition: always (x > 0)   # inline comment
+            postcondition: eventually (op == "done" and not failed)
+            temporal_properties: [always, eventually, within 3 steps (ready)]
+        }
+
+        invariant calls_return {
+            description: "Every call returns"
+            type: authority_non_escalation
+            precondition: within 5 steps (op == "call" => op == "ret")
+        }
+        """
+        decls = InvariantDSL.parse_document(document)
+        self.assertEqual([d.name for d in decls], ['positive', 'calls_return'])
+
+        positive, calls_return = decls
+        self.assertIsInstance(positive.precondition, Always)
+        self.assertIsInstance(positive.precondition.body, Compare)
+        self.assertEqual(positive.temporal_properties[:2], ['always', 'eventually'])
+        self.assertIsInstance(positive.temporal_properties[2], Within)
+        self.assertEqual(document[positive.precondition.pos:].split()[0], 'always')
+
+        self.assertIsInstance(calls_return.precondition.body, Implies)
+        self.assertEqual(calls_return.description, 'Every call returns')
+        self.assertEqual(calls_return.invariant_type, ProofType.AUTHORITY_NON_ESCALATION)
+
+        spec = positive.to_spec()
+        self.assertEqual(spec.precondition, 'always (x > 0)')
+        self.assertEqual(spec.postcondition, 'eventually (op == "done" and not failed)')
+        self.assertEqual(spec.temporal_properties, ['always', 'eventually', 'within 3 steps (ready)'])
+        # The spec text compiles back to the same formula
+        self.assertEqual(compile_formula(spec.precondition).ast, positive.precondition)
+
+    def test_parse_document_errors(self):
+        with self.assertRaisesRegex(ValueError, 'line 3, column 30'):
+            InvariantDSL.parse_document("""invariant a {
+                precondition: always (x > 0)
+            }  invariant b { bogus: 1 }""")
+        with self.assertRaisesRegex(ValueError, 'line 1'):
+            InvariantDSL.parse_document("invariant a { precondition: always (x > ) }")
+
+    def test_property_phrases(self):
+        decl, = InvariantDSL.parse_document("""invariant a {
+            temporal_properties: [always, within 10 steps, eventually, not ready, within 2 step (ok)]
+        }""")
+        self.assertEqual(decl.temporal_properties[:3], ['always', 'within 10 steps', 'eventually'])
+        self.assertIsInstance(decl.temporal_properties[3], Not)
+        self.assertIsInstance(decl.temporal_properties[4], Within)
+        self.assertEqual(decl.to_spec().temporal_properties[:3], ['always', 'within 10 steps', 'eventually'])
+
+        with self.assertRaises(ValueError) as raised:
+            InvariantDSL.parse_document("invariant a { temporal_properties: [within 10 steps (x > )] }")
+        self.assertEqual(str(raised.exception).count(' at '), 1)
+        self.assertIn("line 1, column 58", str(raised.exception))
+
+    def test_format_formula_roundtrip(self):
+        for text in [
+            'always (x > 0)',
+            'eventually (a or (b or c) and not d)',
+            'within 2 steps ((a => b) => c)',
+            'always (s == "q\\"uote\\n" and t != null and f <= -1.5e-07)',
+            'not (a and b)',
+        ]:
+            node = parse_formula(text)
+            self.assertEqual(parse_formula(format_formula(node)), node)
+
+    def test_parse_document_linear(self):
+        block = "invariant i%d { precondition: always (x > %d) postcondition: eventually (y == 1) }\n"
+        document = ''.join(block % (i, i) for i in range(2000))
+        decls = InvariantDSL.parse_document(document)
+        self.assertEqual(len(decls), 2000)
+        self.assertEqual(decls[-1].name, 'i1999')
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
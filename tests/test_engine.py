@@ -1,5 +1,8 @@
+import itertools
 import unittest
+from unittest import mock
 from fak.core.engine import ProofEngine
+from fak.core.temporal import CompiledFormula
 from fak.core.types import ExecutionTrace, CapabilityManifest, CostLedger, PolicyIR, InvariantSpec, ProofType
 
 
@@ -119,6 +122,192 @@ class TestProofEngine(unittest.TestCase):
         # Should not raise exception even with timeout
         self.assertIsNotNone(witness.proof_id)
 
+    def test_verify_invariants_violation(self):
+        trace = ExecutionTrace(
+            id="trace_id",
+            steps=[{"x": 1}, {"x": 2}, {"x": 0}],
+            metadata={}
+        )
+        capabilities = CapabilityManifest(id="cap_id", agent_id="agent_123", capabilities=[], authority_graph={}, metadata={})
+        cost_ledger = CostLedger(id="cost_id", entries=[], total_cost=0.0, metadata={})
+        policy_ir = PolicyIR(id="policy_id", ast={}, compiled_enforcement=b"", metadata={})
+        holds = InvariantSpec(
+            name="eventually_zero",
+            description="",
+            precondition="eventually (x == 0)",
+            postcondition=None,
+            temporal_properties=[],
+            invariant_type=ProofType.BEHAVIORAL_SOUNDNESS
+        )
+        violated = InvariantSpec(
+            name="positive",
+            description="",
+            precondition="always (x >= 0)",
+            postcondition="always (x > 0)",
+            temporal_properties=[],
+            invariant_type=ProofType.BEHAVIORAL_SOUNDNESS
+        )
+        malformed = InvariantSpec(
+            name="malformed",
+            description="",
+            precondition="always (x >",
+            postcondition=None,
+            temporal_properties=[],
+            invariant_type=ProofType.BEHAVIORAL_SOUNDNESS
+        )
+
+        witness = self.engine.verify_invariants(
+            trace, capabilities, cost_ledger, policy_ir, [holds, violated, malformed]
+        )
+
+        self.assertEqual(len(witness.counterexamples), 2)
+        violation, parse_error = witness.counterexamples
+        self.assertEqual(violation.invariant_name, "positive")
+        self.assertEqual(violation.error_type, "violation")
+        self.assertEqual(violation.details["clause"], "postcondition")
+        self.assertEqual(violation.step_index, 2)
+        self.assertEqual(parse_error.error_type, "parse_error")
+
+    def test_modes_match_sequential(self):
+        import random
+        rng = random.Random(7)
+        steps = [
+            {"x": rng.randint(-2, 50), "op": rng.choice(["call", "ret", "log"]), "args": {"n": rng.randint(0, 9)}}
+            for _ in range(500)
+        ]
+        trace = ExecutionTrace(id="trace_id", steps=steps, metadata={})
+        capabilities = CapabilityManifest(id="cap_id", agent_id="agent_123", capabilities=[], authority_graph={}, metadata={})
+        cost_ledger = CostLedger(id="cost_id", entries=[], total_cost=0.0, metadata={})
+        policy_ir = PolicyIR(id="policy_id", ast={}, compiled_enforcement=b"", metadata={})
+        formulas = [
+            "always (x > -3)", "always (x >= 0)", "eventually (x == 49)", "eventually (op == \"halt\")",
+            "within 5 steps (op == \"call\" => op == \"ret\")", "within 3 steps (args.n == 9)",
+            "op == \"call\"", "always (x <", None,
+        ]
+        invariants = [
+            InvariantSpec(
+                name=f"inv_{i}",
+                description="",
+                precondition=rng.choice(formulas) or "always (true)",
+                postcondition=rng.choice(formulas),
+                temporal_properties=[],
+                invariant_type=ProofType.BEHAVIORAL_SOUNDNESS
+            )
+            for i in range(60)
+        ]
+
+        sequential = self.engine.verify_invariants(trace, capabilities, cost_ledger, policy_ir, invariants)
+        fused = self.engine.verify_invariants(trace, capabilities, cost_ledger, policy_ir, invariants, mode="fused")
+        columnar = self.engine.verify_invariants(trace, capabilities, cost_ledger, policy_ir, invariants, mode="columnar")
+
+        self.assertEqual(fused.proof_id, sequential.proof_id)
+        self.assertEqual(fused.counterexamples, sequential.counterexamples)
+        self.assertEqual(columnar.counterexamples, sequential.counterexamples)
+        self.assertTrue(len(fused.counterexamples) > 0)
+
+    def test_unreadable_step_modes_match(self):
+        trace = ExecutionTrace(id="trace_id", steps=[{"x": 1, "args": {"n": 0}}, {"x": 2}, "bad", {"x": 3}], metadata={})
+        capabilities = CapabilityManifest(id="cap_id", agent_id="agent_123", capabilities=[], authority_graph={}, metadata={})
+        cost_ledger = CostLedger(id="cost_id", entries=[], total_cost=0.0, metadata={})
+        policy_ir = PolicyIR(id="policy_id", ast={}, compiled_enforcement=b"", metadata={})
+        invariants = [
+            InvariantSpec("reads_x", "", "always (x > 0)", None, [], ProofType.BEHAVIORAL_SOUNDNESS),
+            InvariantSpec("reads_nothing", "", "always (true)", None, [], ProofType.BEHAVIORAL_SOUNDNESS),
+            InvariantSpec("nested", "", "always (args.n >= 0)", None, [], ProofType.BEHAVIORAL_SOUNDNESS),
+            InvariantSpec("decided_early", "", "eventually (x == 1)", None, [], ProofType.BEHAVIORAL_SOUNDNESS),
+            InvariantSpec("respond", "", "within 2 steps (x == 1 => x == 2)", None, [], ProofType.BEHAVIORAL_SOUNDNESS),
+        ]
+        sequential = self.engine.verify_invariants(trace, capabilities, cost_ledger, policy_ir, invariants)
+        self.assertEqual(
+            [(s.invariant_name, s.status) for s in sequential.statuses[:2]] + [sequential.statuses[3].status],
+            [("reads_x", "error"), ("reads_nothing", "proved"), "proved"]
+        )
+        for mode in ("fused", "columnar"):
+            witness = self.engine.verify_invariants(trace, capabilities, cost_ledger, policy_ir, invariants, mode=mode)
+            self.assertEqual(witness.counterexamples, sequential.counterexamples, mode)
+            self.assertEqual(witness.statuses, sequential.statuses, mode)
+
+    def test_verify_parsed_document(self):
+        from fak.core.dsl import InvariantDSL
+        decls = InvariantDSL.parse_document("""
+            invariant positive { precondition: always (x > 0) }
+            invariant reaches_two { postcondition: eventually (x == 2) }
+        """)
+        trace = ExecutionTrace(id="trace_id", steps=[{"x": 1}, {"x": 0}], metadata={})
+        capabilities = CapabilityManifest(id="cap_id", agent_id="agent_123", capabilities=[], authority_graph={}, metadata={})
+        cost_ledger = CostLedger(id="cost_id", entries=[], total_cost=0.0, metadata={})
+        policy_ir = PolicyIR(id="policy_id", ast={}, compiled_enforcement=b"", metadata={})
+
+        from_ast = self.engine.verify_invariants(trace, capabilities, cost_ledger, policy_ir, decls)
+        from_specs = self.engine.verify_invariants(
+            trace, capabilities, cost_ledger, policy_ir, [d.to_spec() for d in decls], mode="fused"
+        )
+
+        self.assertEqual(from_ast.proof_id, from_specs.proof_id)
+        self.assertEqual(from_ast.counterexamples, from_specs.counterexamples)
+        self.assertEqual([c.step_index for c in from_ast.counterexamples], [1, 1])
+        self.assertEqual(from_ast.counterexamples[0].details["formula"], "always (x > 0)")
+
+    def test_deadline_inside_step_loop(self):
+        trace = ExecutionTrace(id="trace_id", steps=[{"x": 1}] * 5000, metadata={})
+        capabilities = CapabilityManifest(id="cap_id", agent_id="agent_123", capabilities=[], authority_graph={}, metadata={})
+        cost_ledger = CostLedger(id="cost_id", entries=[], total_cost=0.0, metadata={})
+        policy_ir = PolicyIR(id="policy_id", ast={}, compiled_enforcement=b"", metadata={})
+        invariants = [
+            InvariantSpec("slow", "", "always (x > 0)", None, [], ProofType.BEHAVIORAL_SOUNDNESS),
+            InvariantSpec("nonnegative", "", "always (x >= 0)", None, [], ProofType.BEHAVIORAL_SOUNDNESS),
+        ]
+
+        # Each clock read advances one second: reads at steps 0 and 1024 pass,
+        # the read at step 2048 is past the 2.5 second budget
+        witnesses = {}
+        for mode in ("sequential", "fused"):
+            with mock.patch('time.time', side_effect=itertools.count()):
+                witnesses[mode] = witness = self.engine.verify_invariants(
+                    trace, capabilities, cost_ledger, policy_ir, invariants, timeout_seconds=2.5, mode=mode
+                )
+            self.assertEqual(witness.statuses[0].status, "undecided", mode)
+            self.assertEqual(witness.statuses[0].step_index, 2048, mode)
+            self.assertEqual(witness.counterexamples[0].error_type, "timeout")
+            self.assertEqual(witness.counterexamples[0].step_index, 2048)
+            # Every open invariant is reported at the step the scan had reached
+            self.assertEqual([s.step_index for s in witness.statuses], [2048, 2048], mode)
+
+        self.assertEqual(witnesses["sequential"].counterexamples, witnesses["fused"].counterexamples)
+        self.assertEqual(witnesses["sequential"].statuses, witnesses["fused"].statuses)
+
+        # Sequential mode does not scan the invariants left after the deadline
+        with mock.patch('time.time', side_effect=itertools.count()):
+            with mock.patch.object(CompiledFormula, 'evaluate_until', autospec=True,
+                                   side_effect=CompiledFormula.evaluate_until) as scan:
+                self.engine.verify_invariants(
+                    trace, capabilities, cost_ledger, policy_ir, invariants, timeout_seconds=2.5
+                )
+        self.assertEqual(scan.call_count, 1)
+
+        # Column masks have no step position to report
+        witness = self.engine.verify_invariants(
+            trace, capabilities, cost_ledger, policy_ir, invariants, timeout_seconds=-1, mode="columnar"
+        )
+        self.assertEqual([(s.status, s.step_index) for s in witness.statuses], [("undecided", None)] * 2)
+
+    def test_invariant_statuses(self):
+        trace = ExecutionTrace(id="trace_id", steps=[{"x": 1}, {"x": 0}], metadata={})
+        capabilities = CapabilityManifest(id="cap_id", agent_id="agent_123", capabilities=[], authority_graph={}, metadata={})
+        cost_ledger = CostLedger(id="cost_id", entries=[], total_cost=0.0, metadata={})
+        policy_ir = PolicyIR(id="policy_id", ast={}, compiled_enforcement=b"", metadata={})
+        invariants = [
+            InvariantSpec("holds", "", "eventually (x == 0)", None, [], ProofType.BEHAVIORAL_SOUNDNESS),
+            InvariantSpec("fails", "", "always (x > 0)", None, [], ProofType.BEHAVIORAL_SOUNDNESS),
+            InvariantSpec("broken", "", "always (x >", None, [], ProofType.BEHAVIORAL_SOUNDNESS),
+        ]
+        for mode in ("sequential", "fused", "columnar"):
+            witness = self.engine.verify_invariants(trace, capabilities, cost_ledger, policy_ir, invariants, mode=mode)
+            self.assertEqual(
+                [(s.invariant_name, s.status, s.step_index) for s in witness.statuses],
+                [("holds", "proved", None), ("fails", "violated", 1), ("broken", "error", None)]
+            )
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
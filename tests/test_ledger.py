@@ -0,0 +1,116 @@
+import math
+import random
+import unittest
+from fak.core.engine import ProofEngine
+from fak.core.ledger import LedgerAnalytics, check_economic_invariance
+from fak.core.stream import TraceStream
+from fak.core.types import ExecutionTrace, CapabilityManifest, CostLedger, PolicyIR, InvariantSpec, ProofType
+
+
+def _ledger(entries, total=None, **metadata):
+    if total is None:
+        total = math.fsum(entry["cost"] for entry in entries)
+    return CostLedger(id=f"ledger_{random.random()}", entries=entries, total_cost=total, metadata=metadata)
+
+
+class TestLedger(unittest.TestCase):
+
+    def test_aggregates_match_rescans(self):
+        rng = random.Random(18)
+        entries = [
+            {"cost": rng.choice([0.1, 0.2, 1e-3, 3.0]), "agent": rng.choice("ab"), "step": i // 3}
+            for i in range(500)
+        ]
+        analytics = LedgerAnalytics(entries)
+        costs = [entry["cost"] for entry in entries]
+        self.assertEqual(analytics.total, math.fsum(costs))
+        for start, end in [(0, 500), (10, 20), (499, 500), (7, 7)]:
+            self.assertAlmostEqual(analytics.window_sum(start, end), math.fsum(costs[start:end]), places=12)
+        best, start = analytics.window_max(25)
+        expected = max(math.fsum(costs[i:i + 25]) for i in range(476))
+        self.assertAlmostEqual(best, expected, places=12)
+        self.assertAlmostEqual(math.fsum(costs[start:start + 25]), expected, places=12)
+        for agent in "ab":
+            self.assertEqual(
+                analytics.group_totals("agent")[agent],
+                math.fsum(entry["cost"] for entry in entries if entry["agent"] == agent)
+            )
+        self.assertEqual(len(analytics.group_totals("step")), 167)
+        self.assertEqual(analytics.group_totals("model"), {None: analytics.total})
+
+    def test_checks(self):
+        entries = [{"cost": 0.1, "agent": "a"}] * 10 + [{"cost": 5.0, "agent": "b"}]
+        self.assertIsNone(check_economic_invariance(_ledger(entries)))
+        self.assertIsNone(check_economic_invariance(_ledger(entries, total=6.0)))
+
+        self.assertEqual(check_economic_invariance(_ledger(entries, total=7.0)).clause, "ledger_total")
+        negative = entries[:3] + [{"cost": -0.1}]
+        violation = check_economic_invariance(_ledger(negative))
+        self.assertEqual((violation.clause, violation.details["entry_index"]), ("ledger_monotonic", 3))
+        self.assertIsNone(check_economic_invariance(_ledger(entries, budget=6.0)))
+        self.assertEqual(check_economic_invariance(_ledger(entries, budget=5.9)).clause, "ledger_budget")
+
+        violation = check_economic_invariance(_ledger(entries, window_budget={"size": 3, "limit": 1.0}))
+        self.assertEqual(violation.clause, "ledger_window_budget")
+        self.assertEqual(violation.details["entry_index"], 8)
+        self.assertIsNone(check_economic_invariance(_ledger(entries, window_budget={"size": 3, "limit": 5.2})))
+
+        violation = check_economic_invariance(_ledger(entries, group_budgets={"agent": {"a": 2.0, "b": 4.0}}))
+        self.assertEqual((violation.clause, violation.details["group"]), ("ledger_group_budget", "b"))
+
+        with self.assertRaises(ValueError):
+            LedgerAnalytics([{"cost": "1"}])
+
+    def test_non_finite_costs(self):
+        entries = [{"cost": 0.1}] * 3
+        for total in (math.nan, math.inf):
+            violation = check_economic_invariance(_ledger(entries, total=total))
+            self.assertEqual((violation.clause, violation.details["field"]), ("ledger_finite", "total_cost"))
+        for bad in (math.nan, math.inf, -math.inf):
+            violation = check_economic_invariance(_ledger(entries + [{"cost": bad}], total=0.3))
+            self.assertEqual(violation.clause, "ledger_finite")
+            self.assertEqual(violation.details, {"entry_index": 3, "actual": repr(bad)})
+        # inf + -inf must not reach fsum
+        self.assertEqual(
+            check_economic_invariance(_ledger([{"cost": math.inf}, {"cost": -math.inf}], total=0.0)).clause,
+            "ledger_finite"
+        )
+
+    def test_engine_modes(self):
+        engine = ProofEngine()
+        trace = ExecutionTrace(id="t", steps=[{"x": 1}] * 5, metadata={})
+        capabilities = CapabilityManifest(id="c", agent_id="a", capabilities=[], authority_graph={}, metadata={})
+        policy_ir = PolicyIR(id="p", ast={}, compiled_enforcement=b"", metadata={})
+        invariants = [
+            InvariantSpec("budget", "", "always (x > 0)", None, [], ProofType.ECONOMIC_INVARIANCE),
+            InvariantSpec("failing", "", "always (x > 1)", None, [], ProofType.ECONOMIC_INVARIANCE),
+            InvariantSpec("behavior", "", "always (x > 0)", None, [], ProofType.BEHAVIORAL_SOUNDNESS),
+        ]
+        for ledger, expected in [
+            (_ledger([{"cost": 1.0}] * 3, budget=3.0), None),
+            (_ledger([{"cost": 1.0}] * 3, budget=2.0), "ledger_budget"),
+            (_ledger([{"cost": "free"}], total=0.0), "error"),
+        ]:
+            witnesses = [
+                engine.verify_invariants(trace, capabilities, ledger, policy_ir, invariants, mode=mode)
+                for mode in ("sequential", "fused", "columnar")
+            ]
+            witnesses.append(engine.verify_stream(
+                TraceStream(iter(trace.steps), "t"), capabilities, ledger, policy_ir, invariants
+            ))
+            for witness in witnesses:
+                self.assertEqual(witness.counterexamples, witnesses[0].counterexamples)
+            counterexamples = witnesses[0].counterexamples
+            # The failing trace clause is reported before any ledger check
+            self.assertEqual(counterexamples[-1].details["clause"], "precondition")
+            if expected is None:
+                self.assertEqual(len(counterexamples), 1)
+            elif expected == "error":
+                self.assertEqual(counterexamples[0].error_type, "parse_error")
+            else:
+                self.assertEqual(counterexamples[0].details["clause"], expected)
+                self.assertEqual(counterexamples[0].details["reason"], "Economic invariant violated")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+from fak.core.merkle import MerkleProof, MerkleTree, build_artifact_tree, merkle_content_hash, verify_inclusion
+from fak.core.types import ExecutionTrace, CostLedger, CounterExample
+from fak.core.verifier import Verifier
+
+
+class TestMerkle(unittest.TestCase):
+
+    def setUp(self):
+        self.steps = [{"i": i, "op": "call"} for i in range(103)]
+
+    def test_inclusion_proofs(self):
+        for chunk_size in (1, 10, 50, 200):
+            tree = MerkleTree.build(self.steps, chunk_size=chunk_size)
+            for index in (0, 37, 102):
+                proof = tree.prove(index)
+                chunk = self.steps[proof.start:proof.start + chunk_size]
+                self.assertTrue(verify_inclusion(tree.summary, chunk, proof))
+
+                tampered = [dict(step) for step in chunk]
+                tampered[0]["op"] = "ret"
+                self.assertFalse(verify_inclusion(tree.summary, tampered, proof))
+
+        tree = MerkleTree.build(self.steps, chunk_size=10)
+        proof = tree.prove(55)
+        proof.leaf_index += 1
+        self.assertFalse(verify_inclusion(tree.summary, self.steps[50:60], proof))
+
+    def test_proof_geometry_comes_from_summary(self):
+        tree = MerkleTree.build(self.steps, chunk_size=8)
+        proof = tree.prove(70)
+        chunk = self.steps[64:72]
+        self.assertTrue(verify_inclusion(tree.summary, chunk, proof))
+        # A proof cannot restate the chunk size or leaf count
+        for forged in (
+            MerkleProof(proof.leaf_index, proof.leaf_count, 9, proof.siblings),
+            MerkleProof(proof.leaf_index, proof.leaf_count + 1, 8, proof.siblings),
+        ):
+            self.assertFalse(verify_inclusion(tree.summary, chunk, forged))
+        # Short chunks are only valid at the end
+        short = MerkleTree.build(self.steps[:70], chunk_size=8)
+        self.assertFalse(verify_inclusion(short.summary, self.steps[64:70], short.prove(0)))
+        self.assertTrue(verify_inclusion(short.summary, self.steps[64:70], short.prove(65)))
+        self.assertFalse(verify_inclusion(tree.summary, chunk[:7], proof))
+        self.assertFalse(verify_inclusion(dict(tree.summary, chunk_size=9), chunk, proof))
+
+    def test_parallel_and_incremental(self):
+        tree = MerkleTree.build(self.steps, chunk_size=10)
+        parallel = MerkleTree.build(self.steps, chunk_size=10, max_workers=2)
+        self.assertEqual(parallel.root, tree.root)
+
+        steps = [dict(step) for step in self.steps]
+        steps[42]["op"] = "ret"
+        tree.update_chunk(4, steps[40:50])
+        self.assertEqual(tree.root, MerkleTree.build(steps, chunk_size=10).root)
+
+    def test_artifact_hash(self):
+        trace = ExecutionTrace(id="t", steps=self.steps, metadata={})
+        tree = build_artifact_tree(trace, chunk_size=16)
+        self.assertEqual(tree.item_count, len(self.steps))
+        self.assertEqual(merkle_content_hash(trace, tree), merkle_content_hash(trace, build_artifact_tree(trace, 16)))
+
+        ledger = CostLedger(id="l", entries=[{"cost": 1.0}] * 5, total_cost=5.0, metadata={})
+        self.assertEqual(build_artifact_tree(ledger, chunk_size=2).leaf_count, 3)
+
+    def test_verifier_counterexample_inclusion(self):
+        tree = MerkleTree.build(self.steps, chunk_size=8)
+        counterexample = CounterExample("inv", "violation", {}, step_index=70)
+        proof = tree.prove(70)
+        chunk = self.steps[proof.start:proof.start + 8]
+
+        verifier = Verifier()
+        self.assertTrue(verifier.verify_counterexample_inclusion(tree.summary, counterexample, chunk, proof))
+
+        elsewhere = CounterExample("inv", "violation", {}, step_index=3)
+        self.assertFalse(verifier.verify_counterexample_inclusion(tree.summary, elsewhere, chunk, proof))
+
+        # Restating the chunk size would shift the proven range to 72..80
+        forged = MerkleProof(proof.leaf_index, proof.leaf_count, 9, proof.siblings)
+        later = CounterExample("inv", "violation", {}, step_index=78)
+        self.assertFalse(verifier.verify_counterexample_inclusion(tree.summary, later, chunk, forged))
+        self.assertFalse(verifier.verify_counterexample_inclusion(tree.summary, counterexample, chunk, forged))
+
+
+if __name__ == '__main__':
+    unittest.main()
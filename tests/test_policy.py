@@ -0,0 +1,120 @@
+import random
+import unittest
+from fak.core.engine import ProofEngine
+from fak.core.policy import CompiledPolicy, PolicyCheck
+from fak.core.types import ExecutionTrace, CapabilityManifest, CostLedger, PolicyIR, InvariantSpec, ProofType
+
+
+POLICY = {
+    "rules": [
+        {"when": "action == \"delete\"", "decision": "deny"},
+        {"when": {"all": [
+            {"field": "action", "value": "read"},
+            {"any": [{"field": "resource.public", "value": True}, {"field": "level", "op": ">=", "value": 3}]},
+        ]}, "decision": "allow"},
+        {"when": {"not": {"field": "level", "op": "<", "value": 5}}, "decision": "allow"},
+    ],
+    "default": "review",
+}
+
+
+def _reference(step):
+    """The decision POLICY makes, written out by hand."""
+    action = step.get("action")
+    level = step.get("level")
+    public = (step.get("resource") or {}).get("public")
+    if action == "delete":
+        return "deny"
+    if action == "read" and (public is True or (isinstance(level, int) and level >= 3)):
+        return "allow"
+    if not (isinstance(level, int) and level < 5):
+        return "allow"
+    return "review"
+
+
+def _random_step(rng):
+    step = {"action": rng.choice(["read", "write", "delete", None])}
+    if rng.random() < 0.8:
+        step["level"] = rng.choice([0, 2, 3, 4, 5, 9, "high"])
+    if rng.random() < 0.5:
+        step["resource"] = {"public": rng.choice([True, False])}
+    return step
+
+
+class TestPolicy(unittest.TestCase):
+
+    def test_decisions_match_reference(self):
+        policy = CompiledPolicy(POLICY)
+        self.assertEqual(policy.fields, [("action",), ("resource", "public"), ("level",)])
+        rng = random.Random(19)
+        steps = [_random_step(rng) for _ in range(2000)]
+        for step in steps:
+            self.assertEqual(policy.decide(step), _reference(step), step)
+        # Decisions are memoized per distinct shape
+        self.assertLess(policy.shapes, 200)
+        self.assertEqual(policy.decide({"action": "read", "level": [3]}), "allow")
+
+    def test_invalid_policies(self):
+        for ast in [
+            {"rules": {}},
+            {"rules": [{"when": "true"}]},
+            {"rules": [{"when": "always (x > 0)", "decision": "allow"}]},
+            {"rules": [{"when": {"field": "x", "op": "~", "value": 1}, "decision": "allow"}]},
+            {"rules": [{"when": {"field": ""}, "decision": "allow"}]},
+            {"rules": [{"when": 3, "decision": "allow"}]},
+        ]:
+            with self.assertRaises(ValueError):
+                CompiledPolicy(ast)
+        self.assertEqual(CompiledPolicy({}).decide({"x": 1}), "deny")
+
+    def test_semantic_preservation(self):
+        engine = ProofEngine()
+        capabilities = CapabilityManifest(id="c", agent_id="a", capabilities=[], authority_graph={}, metadata={})
+        cost_ledger = CostLedger(id="l", entries=[], total_cost=0.0, metadata={})
+        policy_ir = PolicyIR(id="policy_semantic", ast=POLICY, compiled_enforcement=b"", metadata={})
+        invariants = [InvariantSpec("preserved", "", None, None, [], ProofType.SEMANTIC_PRESERVATION)]
+        rng = random.Random(7)
+        steps = [dict(_random_step(rng), step=i) for i in range(3000)]
+        for step in steps[::2]:
+            step["decision"] = _reference(step)
+
+        def check(trace):
+            witnesses = [
+                engine.verify_invariants(trace, capabilities, cost_ledger, policy_ir, invariants, mode=mode)
+                for mode in ("sequential", "fused", "columnar")
+            ]
+            for witness in witnesses:
+                self.assertEqual(witness.counterexamples, witnesses[0].counterexamples)
+            return witnesses[0].counterexamples
+
+        self.assertEqual(check(ExecutionTrace(id="t_ok", steps=steps, metadata={})), [])
+
+        steps[1500]["decision"] = "allow" if steps[1500]["decision"] != "allow" else "deny"
+        [counterexample] = check(ExecutionTrace(id="t_bad", steps=steps, metadata={}))
+        self.assertEqual(counterexample.step_index, 1500)
+        self.assertEqual(counterexample.details["clause"], "policy")
+        self.assertEqual(counterexample.details["reason"], "Policy decision mismatch")
+        self.assertEqual(counterexample.details["formula"], PolicyCheck(policy_ir).text)
+
+        broken = PolicyIR(id="policy_broken", ast={"rules": [{"when": "("}]}, compiled_enforcement=b"", metadata={})
+        # A failing policy clause is an error, after an undecided precondition too
+        invariants = invariants + [
+            InvariantSpec("guarded", "", "always (step >= 0)", None, [], ProofType.SEMANTIC_PRESERVATION)
+        ]
+        witnesses = [
+            engine.verify_invariants(
+                ExecutionTrace(id="t_ok", steps=steps, metadata={}), capabilities, cost_ledger, broken,
+                invariants, mode=mode
+            )
+            for mode in ("sequential", "fused", "columnar")
+        ]
+        for witness in witnesses:
+            self.assertEqual([c.error_type for c in witness.counterexamples], ["parse_error"] * 2)
+            self.assertNotIn("clause", witness.counterexamples[0].details)
+            self.assertEqual([s.status for s in witness.statuses], ["error", "error"])
+            self.assertEqual(witness.counterexamples, witnesses[0].counterexamples)
+            self.assertEqual(witness.statuses, witnesses[0].statuses)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,181 @@
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import unittest
+from fak.core.__main__ import main
+from fak.core.codec import encode_object
+from fak.core.engine import ProofEngine
+from fak.core.server import VerificationClient, VerificationServer
+from fak.core.verifier import Verifier
+from fak.core.types import ExecutionTrace, CapabilityManifest, CostLedger, PolicyIR, InvariantSpec, ProofType
+
+
+def _bundle(x):
+    witness = ProofEngine().verify_invariants(
+        ExecutionTrace(id=f"trace_{x}", steps=[{"x": x}], metadata={}),
+        CapabilityManifest(id="cap_id", agent_id="agent_123", capabilities=[], authority_graph={}, metadata={}),
+        CostLedger(id="cost_id", entries=[], total_cost=0.0, metadata={}),
+        PolicyIR(id="policy_id", ast={}, compiled_enforcement=b"", metadata={}),
+        [InvariantSpec("positive", "", "always (x > 0)", None, [], ProofType.BEHAVIORAL_SOUNDNESS)],
+    )
+    return ProofEngine().generate_bundle([witness])
+
+
+def _payload(bundle):
+    return json.loads(encode_object(bundle))
+
+
+class CountingVerifier(Verifier):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def verify_bundle(self, bundle):
+        self.calls += 1
+        return super().verify_bundle(bundle)
+
+
+class TestVerificationServer(unittest.TestCase):
+
+    def test_coalesces_and_batches(self):
+        verifier = CountingVerifier()
+        server = VerificationServer(verifier=verifier, batch_window=0.01)
+        bundles = [_bundle(x) for x in (1, 2, 0)]
+
+        async def run():
+            requests = [{"id": i, "op": "verify_bundle", "bundle": _payload(b)} for i, b in enumerate(bundles)]
+            # The same bundle twice more: coalesced onto the first request
+            requests += [dict(requests[0], id=10), dict(requests[0], id=11)]
+            return await asyncio.gather(*(server.handle_request(r) for r in requests))
+
+        try:
+            responses = asyncio.run(run())
+        finally:
+            server.close()
+        self.assertEqual([r["id"] for r in responses], [0, 1, 2, 10, 11])
+        for response, bundle in zip(responses, bundles + [bundles[0]] * 2):
+            self.assertTrue(response["ok"])
+            self.assertEqual(response["result"], Verifier().verify_bundle(bundle))
+        self.assertEqual(verifier.calls, 3)
+        stats = server.stats()
+        self.assertEqual((stats["requests"], stats["coalesced"], stats["batches"]), (5, 2, 1))
+        self.assertEqual(stats["queue_depth"], 0)
+        self.assertIsNotNone(stats["latency_seconds"]["p95"])
+
+    def test_errors_are_reported(self):
+        server = VerificationServer()
+
+        async def run():
+            return await asyncio.gather(
+                server.handle_request({"id": 1, "op": "nope"}),
+                server.handle_request({"id": 2, "op": "verify_bundle", "bundle": {"type": "Nope", "data": {}}}),
+                server.handle_request({"id": 3, "op": "ping"}),
+            )
+
+        try:
+            unknown, bad_bundle, ping = asyncio.run(run())
+        finally:
+            server.close()
+        self.assertFalse(unknown["ok"])
+        self.assertIn("Unknown op", unknown["error"])
+        self.assertFalse(bad_bundle["ok"])
+        self.assertEqual(ping["result"], "pong")
+        self.assertEqual(server.stats()["errors"], 2)
+
+    def test_unix_socket_round_trip(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        path = os.path.join(tmp.name, "fak.sock")
+        server = VerificationServer()
+        loop = asyncio.new_event_loop()
+        listening = threading.Event()
+
+        def run():
+            asyncio.set_event_loop(loop)
+            listener = loop.run_until_complete(server.start_unix(path))
+            listening.set()
+            loop.run_forever()
+            listener.close()
+            pending = asyncio.all_tasks(loop)
+            for task in pending:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            loop.run_until_complete(listener.wait_closed())
+            loop.close()
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        listening.wait(5)
+        try:
+            bundle = _bundle(1)
+            with VerificationClient(socket_path=path) as client:
+                self.assertEqual(client.verify_bundle(bundle), Verifier().verify_bundle(bundle))
+                self.assertEqual(client.verify_bundle(bundle)["success"], True)
+                stats = client.stats()
+                self.assertEqual(stats["completed"], 2)
+                self.assertEqual(stats["verdict_cache"], {"hits": 1, "misses": 1})
+                with self.assertRaises(ValueError):
+                    client.request("nope")
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(5)
+            server.close()
+
+    def test_warm_artifacts_and_cached_verdicts_follow_content(self):
+        server = VerificationServer(batch_window=0)
+        honest = _bundle(1)
+        # Same declared IDs and bundle ID, but the trace now violates the invariant
+        tampered = _bundle(1)
+        tampered.witnesses[0].execution_trace.steps.append({"x": 0})
+
+        async def run():
+            results = []
+            for i, bundle in enumerate((honest, honest, tampered)):
+                results.append(await server.handle_request({"id": i, "op": "verify_bundle", "bundle": _payload(bundle)}))
+            return results
+
+        try:
+            first, second, third = asyncio.run(run())
+        finally:
+            server.close()
+        self.assertTrue(first["result"]["success"])
+        self.assertTrue(second["result"]["success"])
+        self.assertFalse(third["result"]["success"])
+        stats = server.stats()
+        # The second request reuses all four artifacts; the third only the unchanged three
+        self.assertEqual(stats["artifact_cache"], {"hits": 7, "misses": 5})
+        self.assertEqual(stats["verdict_cache"], {"hits": 1, "misses": 2})
+
+    def test_oversized_line_is_rejected(self):
+        server = VerificationServer(max_line_bytes=1024)
+
+        async def run():
+            listener = await server.start_tcp()
+            port = listener.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(b'{"id": 1, "op": "ping", "pad": "' + b'x' * 4096 + b'"}\n')
+            await writer.drain()
+            response = json.loads(await reader.readline())
+            closed = await reader.read()
+            writer.close()
+            listener.close()
+            await listener.wait_closed()
+            return response, closed
+
+        try:
+            response, closed = asyncio.run(run())
+        finally:
+            server.close()
+        self.assertFalse(response["ok"])
+        self.assertIn("exceeds 1024 bytes", response["error"])
+        self.assertEqual(closed, b"")
+
+    def test_cli_requires_listen_address(self):
+        with self.assertRaises(SystemExit):
+            main(["serve"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+from fak.core.cache import LRUCache
+from fak.core.codec import decode_object, encode_object
+from fak.core.storage import FilesystemBackend
+from fak.core.types import ExecutionTrace, PolicyIR, InvariantSpec, ProofType, compute_content_hash, freeze_artifact
+
+
+class TestStorage(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_codec_roundtrip(self):
+        policy = PolicyIR(id="p", ast={"rules": [1.5]}, compiled_enforcement=b"\x00\xff", metadata={})
+        decoded = decode_object(encode_object(policy))
+        self.assertEqual(decoded, policy)
+        self.assertEqual(compute_content_hash(decoded), compute_content_hash(policy))
+
+        spec = InvariantSpec("n", "d", "always (x > 0)", None, [], ProofType.ECONOMIC_INVARIANCE)
+        self.assertEqual(decode_object(encode_object(spec)), spec)
+
+        frozen = freeze_artifact(ExecutionTrace(id="t", steps=[{"x": 1}], metadata={}))
+        self.assertEqual(type(decode_object(encode_object(frozen))), type(frozen))
+
+    def test_filesystem_layout_and_repack(self):
+        backend = FilesystemBackend(self.tmp.name)
+        trace = ExecutionTrace(id="t", steps=[{"op": "call"}], metadata={})
+        artifact_id = compute_content_hash(trace)
+
+        backend.put(artifact_id, trace)
+        loose = os.path.join(self.tmp.name, 'objects', artifact_id[:2], artifact_id[2:4], artifact_id)
+        self.assertTrue(os.path.exists(loose))
+        self.assertEqual(backend.get(artifact_id), trace)
+
+        # A second handle on the same directory sees the object
+        other = FilesystemBackend(self.tmp.name)
+        self.assertTrue(other.contains(artifact_id))
+
+        self.assertEqual(backend.repack(), 1)
+        self.assertFalse(os.path.exists(loose))
+        self.assertEqual(other.get(artifact_id), trace)
+        self.assertEqual(FilesystemBackend(self.tmp.name).get(artifact_id), trace)
+
+        with self.assertRaises(KeyError):
+            backend.get("0" * 64)
+
+    def test_lru_cache(self):
+        cache = LRUCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.put("c", 3)
+        self.assertNotIn("b", cache)
+        self.assertIn("a", cache)
+        self.assertEqual(len(cache), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import json
+import os
+import tempfile
+import tracemalloc
+import unittest
+from fak.core.engine import ProofEngine
+from fak.core.stream import TraceStream, iter_jsonl
+from fak.core.types import (
+    ExecutionTrace, CapabilityManifest, CostLedger, PolicyIR, InvariantSpec, ProofType, compute_content_hash,
+)
+
+
+def _others():
+    return (
+        CapabilityManifest(id="cap_id", agent_id="agent_123", capabilities=[], authority_graph={}, metadata={}),
+        CostLedger(id="cost_id", entries=[], total_cost=0.0, metadata={}),
+        PolicyIR(id="policy_id", ast={}, compiled_enforcement=b"", metadata={}),
+    )
+
+
+def _invariants():
+    return [
+        InvariantSpec("positive", "", "always (x >= 0)", "eventually (x == 3)", [], ProofType.BEHAVIORAL_SOUNDNESS),
+        InvariantSpec("answered", "", "within 2 steps (x == 1 => x == 2)", None, [], ProofType.BEHAVIORAL_SOUNDNESS),
+    ]
+
+
+class TestTraceStream(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_content_hash_matches_execution_trace(self):
+        steps = [{"x": i, "tags": ["a", i]} for i in range(150)]
+        steps.append({f"k{i}": i for i in range(100)})
+        metadata = {"session": "s1"}
+        stream = TraceStream(iter(steps), "trace_id", metadata)
+        with self.assertRaises(ValueError):
+            stream.content_hash
+        self.assertEqual(list(stream), steps)
+        self.assertEqual(stream.content_hash, compute_content_hash(ExecutionTrace("trace_id", steps, metadata)))
+        self.assertEqual(stream.step_count, 151)
+        with self.assertRaises(ValueError):
+            list(stream)
+
+        empty = TraceStream([], "trace_id")
+        empty.drain()
+        self.assertEqual(empty.content_hash, compute_content_hash(ExecutionTrace("trace_id", [], {})))
+
+    def test_jsonl_file(self):
+        path = os.path.join(self.tmp.name, "trace.jsonl")
+        steps = [{"x": i} for i in range(5)]
+        with open(path, "w") as f:
+            f.write("\n".join(json.dumps(step) for step in steps) + "\n\n")
+        self.assertEqual(list(iter_jsonl(path)), steps)
+
+        open(os.path.join(self.tmp.name, "empty.jsonl"), "w").close()
+        self.assertEqual(list(iter_jsonl(os.path.join(self.tmp.name, "empty.jsonl"))), [])
+
+        with open(path, "a") as f:
+            f.write("{not json}\n")
+        with self.assertRaises(ValueError):
+            list(iter_jsonl(path))
+
+    def test_verify_stream_matches_in_memory(self):
+        engine = ProofEngine()
+        for steps in ([{"x": 1}, {"x": 2}, {"x": 3}], [{"x": 1}, {"x": 0}, {"x": -1}], [{"x": 0}], []):
+            trace = ExecutionTrace("trace_id", steps, {})
+            expected = engine.verify_invariants(trace, *_others(), _invariants())
+            stream = TraceStream(iter(steps), "trace_id")
+            witness = engine.verify_stream(stream, *_others(), _invariants())
+            self.assertEqual(witness.proof_id, expected.proof_id)
+            self.assertEqual(witness.counterexamples, expected.counterexamples)
+            self.assertEqual(witness.execution_trace.steps, [])
+            self.assertEqual(witness.execution_trace.metadata["stream"], {
+                "step_count": len(steps), "content_hash": compute_content_hash(trace),
+            })
+
+    def test_long_stream_in_bounded_memory(self):
+        def steps(count):
+            for i in range(count):
+                yield {"x": i % 7, "op": "call"}
+
+        # No MAX_TRACE_STEPS limit for streams
+        witness = ProofEngine().verify_stream(TraceStream(steps(100001), "long"), *_others(), _invariants())
+        self.assertEqual(witness.counterexamples, [])
+        self.assertEqual(witness.execution_trace.metadata["stream"]["step_count"], 100001)
+
+        tracemalloc.start()
+        try:
+            ProofEngine().verify_stream(TraceStream(steps(20000), "long"), *_others(), _invariants())
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        # The same steps held in memory take several megabytes
+        self.assertLess(peak, 512 * 1024)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+from fak.core.temporal import compile_formula, parse_formula, Always, Within, Implies
+
+
+class TestTemporal(unittest.TestCase):
+
+    def test_parse_formula(self):
+        node = parse_formula("within 3 steps (op == \"call\" => ok)")
+        self.assertIsInstance(node, Within)
+        self.assertEqual(node.bound, 3)
+        self.assertIsInstance(node.body, Implies)
+
+        self.assertIsInstance(parse_formula("always (x > 0 and not y)"), Always)
+
+        with self.assertRaises(ValueError):
+            parse_formula("always (x > )")
+        with self.assertRaises(ValueError):
+            parse_formula("within 3 (x > 0)")
+
+    def test_step_and_capitalized_names_are_fields(self):
+        formula = compile_formula("always (step >= 0 and Steps != None)")
+        self.assertTrue(formula.evaluate([{"step": 0, "Steps": 1, "None": 2}]).holds)
+        self.assertEqual(formula.evaluate([{"step": 0, "Steps": 1, "None": 1}]).step_index, 0)
+        self.assertTrue(compile_formula("within 2 steps (step == 1)").evaluate([{"step": 0}, {"step": 1}]).holds)
+        self.assertTrue(compile_formula("within 1 step (True == true)").evaluate([{"True": True}]).holds)
+        self.assertEqual(compile_formula(parse_formula("always (step > 0)")).text, "always (step > 0)")
+        with self.assertRaises(ValueError):
+            parse_formula("always (eventually (x > 0))")
+
+    def test_always(self):
+        formula = compile_formula("always (x > 0)")
+        self.assertTrue(formula.evaluate([{"x": 1}, {"x": 2}]).holds)
+
+        verdict = formula.evaluate([{"x": 1}, {"x": 0}, {"x": -1}])
+        self.assertFalse(verdict.holds)
+        self.assertEqual(verdict.step_index, 1)
+
+        # Missing fields and incomparable values never satisfy an ordering
+        verdict = formula.evaluate([{"x": 1}, {"y": 1}])
+        self.assertEqual(verdict.step_index, 1)
+        self.assertEqual(formula.evaluate([{"x": "a"}]).step_index, 0)
+
+    def test_eventually(self):
+        formula = compile_formula("eventually (op == 'done')")
+        self.assertTrue(formula.evaluate([{"op": "call"}, {"op": "done"}]).holds)
+
+        verdict = formula.evaluate([{"op": "call"}, {"op": "call"}])
+        self.assertFalse(verdict.holds)
+        self.assertEqual(verdict.step_index, 1)
+
+    def test_within(self):
+        formula = compile_formula("within 2 steps (ready)")
+        self.assertTrue(formula.evaluate([{}, {"ready": True}]).holds)
+        self.assertEqual(formula.evaluate([{}, {}, {"ready": True}]).step_index, 1)
+
+    def test_within_response(self):
+        formula = compile_formula("within 2 steps (op == \"call\" => op == \"ret\")")
+        steps = [{"op": "call"}, {"op": "ret"}, {"op": "call"}, {"op": "x"}, {"op": "ret"}]
+        verdict = formula.evaluate(steps)
+        self.assertFalse(verdict.holds)
+        self.assertEqual(verdict.step_index, 2)
+
+        self.assertTrue(formula.evaluate(steps[:2]).holds)
+        # A trigger left open at the end of the trace is a violation
+        self.assertEqual(formula.evaluate(steps[:3]).step_index, 2)
+
+    def test_nested_fields(self):
+        formula = compile_formula("always (args.size <= limit)")
+        steps = [{"args": {"size": 1}, "limit": 2}, {"args": {"size": 3}, "limit": 2}]
+        self.assertEqual(formula.evaluate(steps).step_index, 1)
+
+    def test_compiled_once(self):
+        self.assertIs(compile_formula("always (z == 1)"), compile_formula("always (z == 1)"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,8 @@
 import unittest
+import pickle
+from dataclasses import FrozenInstanceError, replace
 from fak.core.types import ExecutionTrace, CapabilityManifest, CostLedger, PolicyIR, ProofWitness, ProofBundle, compute_content_hash, CounterExample
+from fak.core.types import FrozenExecutionTrace, FrozenPolicyIR, freeze_artifact, slotted_variant
 
 
 class TestTypes(unittest.TestCase):
@@ -107,6 +110,110 @@ class TestTypes(unittest.TestCase):
         hash5 = compute_content_hash(policy)
         self.assertTrue(len(hash5) > 0)
 
+    def test_frozen_artifacts(self):
+        trace = ExecutionTrace(
+            id="test_id",
+            steps=[{"op": "call", "args": [1, {"k": "v"}]}],
+            metadata={"run": 1}
+        )
+        frozen = freeze_artifact(trace)
+        self.assertIsInstance(frozen, FrozenExecutionTrace)
+        self.assertIsInstance(frozen, ExecutionTrace)
+        self.assertIs(freeze_artifact(frozen), frozen)
+
+        # Same content, same digest, memoized on first use
+        self.assertEqual(compute_content_hash(frozen), compute_content_hash(trace))
+        self.assertEqual(frozen.__dict__['_content_hash'], compute_content_hash(trace))
+
+        with self.assertRaises(FrozenInstanceError):
+            frozen.id = "other"
+        with self.assertRaises(TypeError):
+            frozen.steps.append({})
+        with self.assertRaises(TypeError):
+            frozen.steps[0]["args"][1]["k"] = "changed"
+
+        # Derived copies get their own digest
+        renamed = replace(frozen, id="other")
+        self.assertNotEqual(compute_content_hash(renamed), compute_content_hash(frozen))
+
+        restored = pickle.loads(pickle.dumps(frozen))
+        self.assertEqual(restored, frozen)
+        with self.assertRaises(FrozenInstanceError):
+            restored.id = "other"
+
+        policy = FrozenPolicyIR(id="p", ast={"rules": []}, compiled_enforcement=b"\x00", metadata={})
+        self.assertEqual(
+            compute_content_hash(policy),
+            compute_content_hash(PolicyIR(id="p", ast={"rules": []}, compiled_enforcement=b"\x00", metadata={}))
+        )
+
+    def test_pickle_drops_derived_views(self):
+        steps = [{"x": 1}, {"x": 2}]
+        for cls in (ExecutionTrace, FrozenExecutionTrace, slotted_variant(ExecutionTrace),
+                    slotted_variant(ExecutionTrace, frozen=True)):
+            trace = cls(id="t", steps=steps, metadata={})
+            size = len(pickle.dumps(trace))
+            trace.columnar()
+            trace.prefix_digests()
+            self.assertEqual(len(pickle.dumps(trace)), size, cls.__name__)
+            restored = pickle.loads(pickle.dumps(trace))
+            self.assertEqual(restored, trace)
+            self.assertEqual(list(restored.columnar().column(("x",)).values), [1, 2])
+
+    def test_content_hash_matches_canonical_json(self):
+        import hashlib
+        import json
+        import random
+        from dataclasses import asdict
+        from enum import Enum
+        from fak.core.types import InvariantSpec, ProofType, _json_encoder
+
+        def reference(obj):
+            # The canonical form: asdict + json.dumps with sorted keys
+            if hasattr(obj, '__dataclass_fields__'):
+                obj = {k: (v.value if isinstance(v, Enum) else v) for k, v in asdict(obj).items()}
+            serialized = json.dumps(obj, sort_keys=True, separators=(',', ':'), default=_json_encoder)
+            return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+
+        rng = random.Random(11)
+
+        def value(depth):
+            choice = rng.randrange(10 if depth < 3 else 6)
+            if choice == 0:
+                return rng.randint(-10**20, 10**20)
+            if choice == 1:
+                return rng.choice([0.1, -2.5e300, float('nan'), float('inf'), float('-inf'), 1e-7])
+            if choice == 2:
+                return rng.choice(["a", "\u00e9\u4e2d\"quote\"", "", "\n\t"])
+            if choice == 3:
+                return rng.choice([True, False, None])
+            if choice == 4:
+                return rng.choice([b"\x00\xff", ProofType.ECONOMIC_INVARIANCE])
+            if choice == 5:
+                return "leaf"
+            if choice in (6, 7):
+                size = rng.choice([0, 3, 70, 130])
+                return [value(depth + 1) for _ in range(size)]
+            keys = rng.choice([
+                [f"k{i}" for i in range(rng.choice([2, 80]))],
+                [rng.randint(-50, 50) for _ in range(rng.choice([2, 70]))],
+                [0.5, 1.5, float('inf')],
+            ])
+            return {k: value(depth + 1) for k in keys}
+
+        for _ in range(40):
+            obj = value(0)
+            self.assertEqual(compute_content_hash(obj), reference(obj))
+
+        trace = ExecutionTrace(
+            id="t",
+            steps=[{"i": i, "op": "call", "args": [i, str(i)]} for i in range(5000)],
+            metadata={"big": list(range(100))}
+        )
+        self.assertEqual(compute_content_hash(trace), reference(trace))
+        spec = InvariantSpec("n", "d", "always (x > 0)", None, [], ProofType.AUTHORITY_NON_ESCALATION)
+        self.assertEqual(compute_content_hash(spec), reference(spec))
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,110 @@
+import tempfile
+import unittest
+from unittest import mock
+from fak.core.engine import ProofEngine, ENGINE_VERSION
+from fak.core.types import ExecutionTrace, CapabilityManifest, CostLedger, PolicyIR, InvariantSpec, ProofType
+from fak.core.verdicts import MemoryVerdictCache, FilesystemVerdictCache, verdict_key
+from fak.core.verifier import Verifier
+
+
+def _inputs(steps):
+    return (
+        ExecutionTrace(id="trace_id", steps=steps, metadata={}),
+        CapabilityManifest(id="cap_id", agent_id="agent_123", capabilities=[], authority_graph={}, metadata={}),
+        CostLedger(id="cost_id", entries=[], total_cost=0.0, metadata={}),
+        PolicyIR(id="policy_id", ast={}, compiled_enforcement=b"", metadata={}),
+    )
+
+
+def _invariant(precondition):
+    return InvariantSpec("positive", "x stays positive", precondition, None, [], ProofType.BEHAVIORAL_SOUNDNESS)
+
+
+class TestVerdictCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_key_covers_invariant_bodies(self):
+        a = verdict_key("proof", ["a", "b"], [_invariant("always (x > 0)")], ENGINE_VERSION)
+        b = verdict_key("proof", ["a", "b"], [_invariant("always (x > 1)")], ENGINE_VERSION)
+        c = verdict_key("proof", ["a", "b"], [_invariant("always (x > 0)")], ENGINE_VERSION + "-next")
+        d = verdict_key("proof", ["a", "c"], [_invariant("always (x > 0)")], ENGINE_VERSION)
+        self.assertEqual(len({a, b, c, d}), 4)
+        self.assertEqual(a, verdict_key("proof", ["a", "b"], [_invariant("always (x > 0)")], ENGINE_VERSION))
+
+    def test_memory_cache_hit_skips_verification(self):
+        cache = MemoryVerdictCache()
+        engine = ProofEngine(verdict_cache=cache)
+        inputs = _inputs([{"x": 1}, {"x": 0}])
+        invariants = [_invariant("always (x > 0)")]
+
+        first = engine.verify_invariants(*inputs, invariants)
+        with mock.patch.object(engine, '_verify_sequential') as verify:
+            second = engine.verify_invariants(*inputs, invariants)
+            verify.assert_not_called()
+
+        self.assertEqual(first.counterexamples, second.counterexamples)
+        self.assertEqual(second.counterexamples[0].step_index, 1)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        # Cached counterexamples are copies; callers cannot corrupt the cache
+        second.counterexamples[0].details["reason"] = "edited"
+        third = engine.verify_invariants(*inputs, invariants)
+        self.assertEqual(third.counterexamples, first.counterexamples)
+
+        # Editing the formula body misses the cache even though the name is unchanged
+        edited = engine.verify_invariants(*inputs, [_invariant("always (x >= 0)")])
+        self.assertEqual(edited.counterexamples, [])
+
+    def test_timeouts_are_not_cached(self):
+        cache = MemoryVerdictCache()
+        engine = ProofEngine(verdict_cache=cache)
+        inputs = _inputs([{"x": 1}])
+        timed_out = engine.verify_invariants(*inputs, [_invariant("always (x > 0)")], timeout_seconds=-1)
+        self.assertEqual(timed_out.counterexamples[0].error_type, "timeout")
+        self.assertEqual(len(cache._entries), 0)
+
+    def test_filesystem_cache_persists_across_engines(self):
+        inputs = _inputs([{"x": 1}, {"x": 0}])
+        invariants = [_invariant("always (x > 0)")]
+        expected = ProofEngine().verify_invariants(*inputs, invariants)
+
+        ProofEngine(verdict_cache=FilesystemVerdictCache(self.tmp.name)).verify_invariants(*inputs, invariants)
+        engine = ProofEngine(verdict_cache=FilesystemVerdictCache(self.tmp.name))
+        with mock.patch.object(engine, '_verify_sequential') as verify:
+            witness = engine.verify_invariants(*inputs, invariants)
+            verify.assert_not_called()
+        self.assertEqual(witness.counterexamples, expected.counterexamples)
+
+    def test_verifier_uses_cache(self):
+        cache = MemoryVerdictCache()
+        engine = ProofEngine()
+        witness = engine.verify_invariants(*_inputs([{"x": 1}]), [_invariant("always (x > 0)")])
+        bundle = engine.generate_bundle([witness])
+
+        verifier = Verifier(verdict_cache=cache)
+        self.assertTrue(verifier.verify_bundle(bundle)['success'])
+        self.assertTrue(verifier.verify_bundle(bundle)['success'])
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_tampered_content_with_same_ids_misses(self):
+        cache = MemoryVerdictCache()
+        engine = ProofEngine()
+        invariants = [_invariant("always (x > 0)")]
+        honest = engine.generate_bundle([engine.verify_invariants(*_inputs([{"x": 1}]), invariants)])
+        verifier = Verifier(verdict_cache=cache)
+        self.assertTrue(verifier.verify_bundle(honest)['success'])
+
+        # Same declared IDs, hence the same proof and bundle IDs, but a violating step
+        witness = engine.verify_invariants(*_inputs([{"x": 1}]), invariants)
+        witness.execution_trace.steps.append({"x": 0})
+        tampered = engine.generate_bundle([witness])
+        self.assertEqual(tampered.id, honest.id)
+        self.assertFalse(verifier.verify_bundle(tampered)['success'])
+        self.assertFalse(Verifier().verify_bundle(tampered)['success'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,6 @@
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
 from fak.core.verifier import Verifier
 from fak.core.types import ProofBundle, ProofWitness, ExecutionTrace, CapabilityManifest, CostLedger, PolicyIR, InvariantSpec, ProofType
 
@@ -123,6 +125,45 @@ class TestVerifier(unittest.TestCase):
         self.assertFalse(result['success'])
         self.assertIn('Bundle ID integrity check failed', result.get('error', ''))
 
+    def test_verify_bundle_parallel(self):
+        from fak.core.engine import ProofEngine
+        engine = ProofEngine()
+        capabilities = CapabilityManifest(id="cap_id", agent_id="agent_123", capabilities=[], authority_graph={}, metadata={})
+        cost_ledger = CostLedger(id="cost_id", entries=[], total_cost=0.0, metadata={})
+        policy_ir = PolicyIR(id="policy_id", ast={}, compiled_enforcement=b"", metadata={})
+        invariant = InvariantSpec(
+            name="positive",
+            description="",
+            precondition="always (x > 0)",
+            postcondition=None,
+            temporal_properties=[],
+            invariant_type=ProofType.BEHAVIORAL_SOUNDNESS
+        )
+        witnesses = []
+        for i in range(7):
+            trace = ExecutionTrace(id=f"trace_{i}", steps=[{"x": 1}, {"x": 1 - i % 3}], metadata={})
+            witnesses.append(engine.verify_invariants(trace, capabilities, cost_ledger, policy_ir, [invariant]))
+        bundle = engine.generate_bundle(witnesses)
+
+        serial = Verifier().verify_bundle(bundle)
+        with Verifier(max_workers=3) as verifier:
+            parallel = verifier.verify_bundle(bundle)
+            pool = verifier._pool
+            # The worker pool is kept for the next bundle
+            self.assertEqual(verifier.verify_bundle(bundle), serial)
+            self.assertIs(verifier._pool, pool)
+        self.assertIsNone(verifier._pool)
+
+        self.assertEqual(parallel, serial)
+        self.assertFalse(parallel['success'])
+        self.assertEqual([r['success'] for r in parallel['results']], [True, False, False] * 2 + [True])
+
+        # A caller's executor is split into max_workers chunks
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            with mock.patch.object(executor, 'map', wraps=executor.map) as mapped:
+                self.assertEqual(Verifier(max_workers=2, executor=executor).verify_bundle(bundle), serial)
+            self.assertEqual([len(chunk) for chunk in mapped.call_args.args[1]], [4, 3])
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file